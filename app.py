@@ -11,6 +11,7 @@ from supabase import create_client, Client
 from db import db
 from models import User
 from config.config import Config
+from helpers import InMemoryUploadRequest, apply_upload_limits
 
 # system libs for WeasyPrint on macOS
 os.environ['DYLD_LIBRARY_PATH'] = '/opt/homebrew/lib:' + os.environ.get('DYLD_LIBRARY_PATH', '')
@@ -23,6 +24,10 @@ def create_app():
     app = Flask(__name__, template_folder="pages")
     app.config.from_object(Config)
 
+    # keep resume uploads in memory; the size cap must be set before CSRFProtect parses the form
+    app.request_class = InMemoryUploadRequest
+    app.before_request(apply_upload_limits)
+
     # init extensions
     csrf.init_app(app)
     db.init_app(app)
@@ -55,6 +60,12 @@ def create_app():
             return jsonify({"success": False, "error": "CSRF token missing or invalid"}), 400
         return render_template('error.html', error=e.description), 400
 
+    @app.errorhandler(413)
+    def request_too_large(e):
+        if request.is_json or request.accept_mimetypes.best == 'application/json':
+            return jsonify({"success": False, "error": e.description}), 413
+        return render_template('error.html', error=e.description, error_code=413), 413
+
     @app.errorhandler(404)
     def page_not_found(e):
         return render_template('error.html', error=str(e), error_code=404), 404
@@ -50,19 +50,91 @@ class Config:
     elif MODEL_PROVIDER == 'hf':
        EMBED_MODEL = os.environ.get('HF_EMBED_MODEL', 'BAAI/bge-large-en-v1.5')
        LLM_MODEL = os.environ.get('HF_LLM_MODEL', 'mistralai/Mistral-7B-Instruct-v0.3')
+    elif MODEL_PROVIDER == 'local':
+       EMBED_MODEL = f"hashed-ngram-{os.environ.get('LOCAL_EMBED_DIMENSIONS', '384')}"
+       LLM_MODEL = None  # embeddings only
+    elif MODEL_PROVIDER == 'replay':
+       EMBED_MODEL = os.environ.get('EMBED_MODEL', 'replay')  # set to the upstream's models when recording with 'hf'
+       LLM_MODEL = os.environ.get('LLM_MODEL', 'replay')
     else:
        EMBED_MODEL = os.environ.get('EMBED_MODEL', 'BAAI/bge-large-en-v1.5')
+    EMBED_PROVIDER = os.environ.get('EMBED_PROVIDER', '')  # embeddings from another provider (e.g. 'local'); empty = MODEL_PROVIDER
+    LOCAL_EMBED_DIMENSIONS = int(os.environ.get('LOCAL_EMBED_DIMENSIONS', '384'))  # hashed n-gram vector size for the local embedder
+    REPLAY_MODE = os.environ.get('REPLAY_MODE', 'replay')  # MODEL_PROVIDER=replay: 'record' real calls or 'replay' them
+    REPLAY_STORE_PATH = os.environ.get('REPLAY_STORE_PATH', 'replay/llm_calls.jsonl')
+    REPLAY_UPSTREAM_PROVIDER = os.environ.get('REPLAY_UPSTREAM_PROVIDER', 'openai')  # provider called while recording
+    REPLAY_LATENCY = os.environ.get('REPLAY_LATENCY', 'recorded')  # none, recorded[:factor], fixed:ms, uniform:min,max, normal:mean,std, lognormal:median,sigma
+    REPLAY_SEED = int(os.environ['REPLAY_SEED']) if os.environ.get('REPLAY_SEED') else None
+    REPLAY_ON_MISS = os.environ.get('REPLAY_ON_MISS', 'error')  # 'similar' serves a recording of the same prompt template
     #LLM API Keys
     HF_TOKEN = os.environ.get('HF_TOKEN')
     OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
+    OPENAI_MAX_CONNECTIONS = int(os.environ.get('OPENAI_MAX_CONNECTIONS', '100'))  # shared AsyncOpenAI connection pool
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get('OPENAI_MAX_KEEPALIVE_CONNECTIONS', '20'))
+    OPENAI_KEEPALIVE_EXPIRY_SECONDS = float(os.environ.get('OPENAI_KEEPALIVE_EXPIRY_SECONDS', '30'))
+    OPENAI_TIMEOUT_SECONDS = float(os.environ.get('OPENAI_TIMEOUT_SECONDS', '600'))  # per HTTP request, as in the OpenAI SDK; a request deadline shortens it
+    EMBED_BATCHING_ENABLED = os.environ.get('EMBED_BATCHING_ENABLED', 'true').lower() == 'true'  # coalesce concurrent embed() calls into one provider call
+    EMBED_BATCH_MAX_SIZE = int(os.environ.get('EMBED_BATCH_MAX_SIZE', '128'))  # texts per provider call
+    EMBED_BATCH_LINGER_MS = float(os.environ.get('EMBED_BATCH_LINGER_MS', '5'))  # wait for more requests before sending a partial batch
     
     #Redis Configuration
     REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
     #Resume Optimizer Settings
     RESUME_OPTIMIZER_ENABLED = os.environ.get('RESUME_OPTIMIZER_ENABLED', 'true').lower() == 'true'
     MAX_RESUME_SIZE_MB = int(os.environ.get('MAX_RESUME_SIZE_MB', '5'))
-    RATE_LIMIT_PER_HOUR = int(os.environ.get('RATE_LIMIT_PER_HOUR', '10'))
-    
+    RESUME_DOWNLOAD_TIMEOUT_SECONDS = float(os.environ.get('RESUME_DOWNLOAD_TIMEOUT_SECONDS', '30'))  # docx_url/pdf_url inputs
+    RESUME_DOWNLOAD_MAX_CONNECTIONS = int(os.environ.get('RESUME_DOWNLOAD_MAX_CONNECTIONS', '20'))
+    EXTRACTION_CACHE_ENABLED = os.environ.get('EXTRACTION_CACHE_ENABLED', 'true').lower() == 'true'  # text keyed by SHA-256 of file bytes
+    EXTRACTION_CACHE_LRU_SIZE = int(os.environ.get('EXTRACTION_CACHE_LRU_SIZE', '256'))  # in-process tier entries
+    EXTRACTION_CACHE_TTL = int(os.environ.get('EXTRACTION_CACHE_TTL', str(7 * 24 * 60 * 60)))
+    RULE_PARSER_ENABLED = os.environ.get('RULE_PARSER_ENABLED', 'true').lower() == 'true'
+    RULE_PARSER_CONFIDENCE_THRESHOLD = float(os.environ.get('RULE_PARSER_CONFIDENCE_THRESHOLD', '0.85'))  # skip LLM normalization at or above
+    SECTION_NORMALIZE_MIN_CHARS = int(os.environ.get('SECTION_NORMALIZE_MIN_CHARS', '6000'))  # normalize longer resumes per section in parallel; 0 disables
+    PDF_PARALLEL_MIN_PAGES = int(os.environ.get('PDF_PARALLEL_MIN_PAGES', '8'))  # 0 disables page-parallel extraction
+    PDF_EXTRACT_WORKERS = int(os.environ.get('PDF_EXTRACT_WORKERS', '0'))  # 0 = one per CPU
+    PDF_PAGE_TIMEOUT_SECONDS = float(os.environ.get('PDF_PAGE_TIMEOUT_SECONDS', '10'))
+    RATE_LIMIT_PER_HOUR = int(os.environ.get('RATE_LIMIT_PER_HOUR', '10'))  # optimizations per user (token bucket)
+    RATE_LIMIT_PROVIDER_PER_MINUTE = int(os.environ.get('RATE_LIMIT_PROVIDER_PER_MINUTE', '60'))  # optimizations per LLM provider, all users
+    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+
+    #Optimization Job Queue
+    JOB_QUEUE_BACKEND = os.environ.get('JOB_QUEUE_BACKEND', 'auto')  # 'auto', 'redis' or 'memory'
+    OPTIMIZER_WORKER_COUNT = int(os.environ.get('OPTIMIZER_WORKER_COUNT', '2'))
+    OPTIMIZER_JOB_TTL = int(os.environ.get('OPTIMIZER_JOB_TTL', str(24 * 60 * 60)))
+    OPTIMIZER_QUEUE_POLL_SECONDS = float(os.environ.get('OPTIMIZER_QUEUE_POLL_SECONDS', '2'))
+    OPTIMIZER_EVENTS_MAX_SECONDS = float(os.environ.get('OPTIMIZER_EVENTS_MAX_SECONDS', '30'))  # SSE stream lifetime before client reconnects; each stream holds a web thread
+    OPTIMIZER_EVENTS_HEARTBEAT_SECONDS = float(os.environ.get('OPTIMIZER_EVENTS_HEARTBEAT_SECONDS', '15'))
+    OPTIMIZER_CLASS_WEIGHTS = os.environ.get('OPTIMIZER_CLASS_WEIGHTS', 'premium:6,free:3,batch:1')  # weighted round-robin between priority classes
+    OPTIMIZER_CLASS_CONCURRENCY = os.environ.get('OPTIMIZER_CLASS_CONCURRENCY', '')  # e.g. 'free:2,batch:1'; unset classes may use every worker
+    OPTIMIZER_PREMIUM_RESERVED_WORKERS = int(os.environ.get('OPTIMIZER_PREMIUM_RESERVED_WORKERS', '1'))  # workers never given to free/batch jobs
+    OPTIMIZER_CANCEL_POLL_SECONDS = float(os.environ.get('OPTIMIZER_CANCEL_POLL_SECONDS', '1'))  # how often workers check for cancelled jobs
+    OPTIMIZER_JOB_LEASE_SECONDS = float(os.environ.get('OPTIMIZER_JOB_LEASE_SECONDS', '60'))  # a job whose worker stops renewing this long is requeued or failed
+
+    #Optimization Pipeline
+    EMBED_CHUNK_MAX_TOKENS = int(os.environ.get('EMBED_CHUNK_MAX_TOKENS', '0'))  # resume chunk size for embedding; 0 = embed model's input window
+    EMBED_CHUNK_OVERLAP_TOKENS = int(os.environ.get('EMBED_CHUNK_OVERLAP_TOKENS', '50'))  # shared between pieces of an item split across chunks
+    PIPELINE_SEMANTIC_ANALYSIS = os.environ.get('PIPELINE_SEMANTIC_ANALYSIS', 'false').lower() == 'true'  # embed resume chunks and add semantic_analysis to results
+    PIPELINE_DEADLINE_SECONDS = float(os.environ.get('PIPELINE_DEADLINE_SECONDS', '120'))  # time budget per optimization run
+    PIPELINE_CHECKPOINTS_ENABLED = os.environ.get('PIPELINE_CHECKPOINTS_ENABLED', 'true').lower() == 'true'
+    PIPELINE_CHECKPOINT_TTL = int(os.environ.get('PIPELINE_CHECKPOINT_TTL', '3600'))  # resume window for failed runs
+    SINGLE_FLIGHT_ENABLED = os.environ.get('SINGLE_FLIGHT_ENABLED', 'true').lower() == 'true'  # coalesce identical in-flight requests
+    SINGLE_FLIGHT_LEASE_SECONDS = float(os.environ.get('SINGLE_FLIGHT_LEASE_SECONDS', '300'))
+    SINGLE_FLIGHT_POLL_SECONDS = float(os.environ.get('SINGLE_FLIGHT_POLL_SECONDS', '0.5'))
+    SINGLE_FLIGHT_RESULT_TTL = int(os.environ.get('SINGLE_FLIGHT_RESULT_TTL', '120'))
+    RESULT_CACHE_ENABLED = os.environ.get('RESULT_CACHE_ENABLED', 'true').lower() == 'true'
+    RESULT_CACHE_TTL = int(os.environ.get('RESULT_CACHE_TTL', str(24 * 60 * 60)))
+    RESULT_CACHE_STALE_WHILE_REVALIDATE = int(os.environ.get('RESULT_CACHE_STALE_WHILE_REVALIDATE', '0'))  # seconds; 0 disables
+    NORMALIZATION_CACHE_TTL = int(os.environ.get('NORMALIZATION_CACHE_TTL', str(30 * 24 * 60 * 60)))
+    BATCH_OPTIMIZE_CONCURRENCY = int(os.environ.get('BATCH_OPTIMIZE_CONCURRENCY', '4'))  # concurrent analyze calls per batch
+    BATCH_OPTIMIZE_MAX_JDS = int(os.environ.get('BATCH_OPTIMIZE_MAX_JDS', '30'))
+    BATCH_OPTIMIZE_DEADLINE_SECONDS = float(os.environ.get('BATCH_OPTIMIZE_DEADLINE_SECONDS', '900'))  # time budget per batch job
+
+    #Recruiter Ranking
+    RANKING_MAX_FILES = int(os.environ.get('RANKING_MAX_FILES', '500'))
+    RANKING_WORKERS = int(os.environ.get('RANKING_WORKERS', '0'))  # 0 = one per CPU
+    RANKING_RESUMES_PER_TOKEN = int(os.environ.get('RANKING_RESUMES_PER_TOKEN', '25'))  # rate-limit cost of /rank: one token per this many resumes
+    RANKING_MAX_UPLOAD_MB = int(os.environ.get('RANKING_MAX_UPLOAD_MB', '100'))  # whole /rank request body
+
     @classmethod
     def validate_llm_config(cls):
         """Validate LLM configuration based on selected provider"""
@@ -72,7 +144,24 @@ class Config:
         elif cls.MODEL_PROVIDER == 'hf':
             if not cls.HF_TOKEN:
                 print("Warning: HF_TOKEN not set. Some HuggingFace models may not work.")
+        elif cls.MODEL_PROVIDER == 'local':
+            print("Warning: MODEL_PROVIDER=local has no chat model; optimization needs 'openai' or 'hf' with EMBED_PROVIDER=local.")
+        elif cls.MODEL_PROVIDER == 'replay':
+            if cls.REPLAY_MODE not in ('record', 'replay'):
+                raise ValueError(f"Unsupported REPLAY_MODE: {cls.REPLAY_MODE}")
+            if cls.REPLAY_MODE == 'record':
+                if cls.REPLAY_UPSTREAM_PROVIDER not in ('openai', 'hf', 'local'):
+                    raise ValueError(f"Unsupported REPLAY_UPSTREAM_PROVIDER: {cls.REPLAY_UPSTREAM_PROVIDER}")
+                if cls.REPLAY_UPSTREAM_PROVIDER == 'openai' and not cls.OPENAI_API_KEY:
+                    raise ValueError("OPENAI_API_KEY is required to record with REPLAY_UPSTREAM_PROVIDER=openai")
+            elif not os.path.exists(cls.REPLAY_STORE_PATH):
+                print(f"Warning: replay store {cls.REPLAY_STORE_PATH} not found; record it with REPLAY_MODE=record.")
         else:
             raise ValueError(f"Unsupported MODEL_PROVIDER: {cls.MODEL_PROVIDER}")
+
+        if cls.EMBED_PROVIDER and cls.EMBED_PROVIDER not in ('openai', 'hf', 'local'):
+            raise ValueError(f"Unsupported EMBED_PROVIDER: {cls.EMBED_PROVIDER}")
+        if cls.EMBED_PROVIDER == 'openai' and not cls.OPENAI_API_KEY:
+            raise ValueError("OPENAI_API_KEY is required when EMBED_PROVIDER=openai")
         
         return True
\ No newline at end of file
@@ -2,8 +2,10 @@
 
 from .validation import (validate_file_format,
 validate_json_with_retry,validate_json_with_retry_sync)
+from .uploads import InMemoryUploadRequest,apply_upload_limits,max_upload_bytes
 
 
 __all__ = ["validate_file_format","validate_json_with_retry","validate_json_with_retry_sync",
+"InMemoryUploadRequest","apply_upload_limits","max_upload_bytes",
 
 ]
\ No newline at end of file
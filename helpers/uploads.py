@@ -0,0 +1,55 @@
+"""
+In-memory handling of uploaded resumes.
+Uploads to the optimizer endpoints are size-capped while the body streams
+in and are kept in memory instead of werkzeug's spooled temp files, so
+ingestion never touches the filesystem.
+"""
+
+import io
+from typing import IO, Optional
+
+from flask import Request, current_app, request
+
+
+# Endpoint -> config key holding its upload cap in MB
+UPLOAD_LIMITS = {
+    'optimizer.optimize_resume': 'MAX_RESUME_SIZE_MB',
+    'optimizer.optimize_resume_batch': 'MAX_RESUME_SIZE_MB',
+    'optimizer.rank_resumes': 'RANKING_MAX_UPLOAD_MB',
+}
+
+# Allowance for the non-file form fields (job descriptions, options)
+FORM_OVERHEAD_BYTES = 1024 * 1024
+
+
+class InMemoryUploadRequest(Request):
+    """Request that buffers file uploads in memory when the body size is capped."""
+
+    def _get_file_stream(
+        self,
+        total_content_length: Optional[int],
+        content_type: Optional[str],
+        filename: Optional[str] = None,
+        content_length: Optional[int] = None
+    ) -> IO[bytes]:
+        # Without a cap, keep werkzeug's spill-to-disk behaviour
+        if self.max_content_length is None:
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+        return io.BytesIO()
+
+
+def apply_upload_limits() -> None:
+    """
+    before_request hook capping the body of upload endpoints.
+
+    Must run before anything reads request.form (CSRFProtect does), since
+    werkzeug enforces max_content_length while it parses the stream.
+    """
+    config_key = UPLOAD_LIMITS.get(request.endpoint)
+    if config_key:
+        request.max_content_length = max_upload_bytes(config_key) + FORM_OVERHEAD_BYTES
+
+
+def max_upload_bytes(config_key: str = 'MAX_RESUME_SIZE_MB') -> int:
+    """Per-file upload cap in bytes from an MB config value."""
+    return int(current_app.config.get(config_key, 5)) * 1024 * 1024
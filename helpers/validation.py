@@ -1,5 +1,10 @@
+from typing import Optional
 from pydantic import BaseModel
-from utils import extract_json_from_response
+from utils import extract_json_from_response, run_sync, Deadline, DeadlineExceeded, current_deadline
+
+# Budget a JSON repair round-trip needs to be worth attempting
+MIN_REPAIR_SECONDS = 10.0
+
 def validate_file_format(file_url: str) -> str:
     """
     Validate file format based on URL/path extension.
@@ -30,7 +35,8 @@ async def validate_json_with_retry(
     json_str: str, 
     schema_class: BaseModel, 
     chat_model=None,
-    max_retries: int = 1
+    max_retries: int = 1,
+    deadline: Optional[Deadline] = None
 ) -> BaseModel:
     """
     Validate JSON response from LLM with automatic retry and repair.
@@ -40,6 +46,8 @@ async def validate_json_with_retry(
         schema_class: Pydantic model class to validate against
         chat_model: ChatModel instance for JSON repair (optional)
         max_retries: Number of repair attempts
+        deadline: Request deadline (defaults to the current one); repair
+            attempts that cannot finish in time are skipped
         
     Returns:
         Validated Pydantic model instance
@@ -62,8 +70,15 @@ async def validate_json_with_retry(
     if not chat_model or max_retries <= 0:
         raise ValueError(f"Invalid JSON response: {original_error}\nResponse: {json_str[:200]}...")
     
+    deadline = deadline or current_deadline()
+
     # Attempt 2: Ask LLM to fix the JSON
     for attempt in range(max_retries):
+        if deadline is not None and not deadline.can_fit(MIN_REPAIR_SECONDS):
+            raise ValueError(
+                f"Invalid JSON response and no time left for repair "
+                f"({deadline.remaining():.1f}s remaining): {original_error}"
+            )
         try:
             print(f"🔄 Attempting JSON repair (attempt {attempt + 1}/{max_retries})")
             
@@ -114,6 +129,8 @@ async def validate_json_with_retry(
                     f"Original error: {original_error}\n"
                     f"Final response: {repaired_json[:200] if 'repaired_json' in locals() else json_str[:200]}..."
                 )
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             print(f"❌ Unexpected error during JSON repair: {str(e)}")
             raise ValueError(f"JSON repair failed: {str(e)}")
@@ -125,8 +142,8 @@ def validate_json_with_retry_sync(
     json_str: str, 
     schema_class: BaseModel, 
     chat_model=None,
-    max_retries: int = 1
+    max_retries: int = 1,
+    deadline: Optional[Deadline] = None
 ) -> BaseModel:
     """Synchronous wrapper for validate_json_with_retry."""
-    import asyncio
-    return asyncio.run(validate_json_with_retry(json_str, schema_class, chat_model, max_retries))
\ No newline at end of file
+    return run_sync(validate_json_with_retry(json_str, schema_class, chat_model, max_retries, deadline))
\ No newline at end of file
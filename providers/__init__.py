@@ -1,17 +1,57 @@
 """
 LLM Provider abstraction layer.
-Supports multiple AI providers (OpenAI, HuggingFace) with unified interface.
+Supports multiple AI providers (OpenAI, HuggingFace, local CPU embeddings,
+recorded replays) with unified interface.
 """
 
 from flask import current_app
 from .base import Embedder, ChatModel, LLMProvider
 from .openai_provider import OpenAIProvider
 from .hf_provider import HuggingFaceProvider
+from .local_provider import LocalProvider
+from .replay_provider import ReplayProvider
+from .registry import get_provider_registry
+from .batching import BatchingEmbedder
+
+
+SUPPORTED_PROVIDERS = ('openai', 'hf', 'local', 'replay')
+
+
+def _create_provider(provider: str, setting: str = 'MODEL_PROVIDER') -> LLMProvider:
+    if provider == 'openai':
+        return OpenAIProvider()
+    elif provider == 'hf':
+        return HuggingFaceProvider()
+    elif provider == 'local':
+        return LocalProvider()
+    elif provider == 'replay':
+        upstream = current_app.config.get('REPLAY_UPSTREAM_PROVIDER', 'openai').lower()
+        if upstream == 'replay':
+            raise ValueError("REPLAY_UPSTREAM_PROVIDER cannot be 'replay'")
+        return ReplayProvider(lambda: _create_provider(upstream, 'REPLAY_UPSTREAM_PROVIDER'))
+    else:
+        raise ValueError(f"Unsupported {setting}: {provider}. Supported: {', '.join(repr(p) for p in SUPPORTED_PROVIDERS)}")
+
+
+def _shared_models():
+    provider = current_app.config.get('MODEL_PROVIDER', 'hf').lower()
+    embed_provider = (current_app.config.get('EMBED_PROVIDER') or provider).lower()
+    embed_factory = None
+    if embed_provider != provider:
+        embed_factory = lambda: _create_provider(embed_provider, 'EMBED_PROVIDER')
+    try:
+        return get_provider_registry().get(current_app.config, lambda: _create_provider(provider), embed_factory)
+    except Exception as e:
+        print(f"❌ Failed to initialize {provider} provider: {str(e)}")
+        raise
 
 
 def get_models():
     """
     Factory function to get Embedder and ChatModel based on configuration.
+
+    The instances are created once per process (see providers.registry)
+    and shared by every caller.
     
     Returns:
         tuple: (Embedder, ChatModel) instances
@@ -19,30 +59,8 @@ def get_models():
     Raises:
         ValueError: If MODEL_PROVIDER is not supported or required config is missing
     """
-    provider = current_app.config.get('MODEL_PROVIDER', 'hf').lower()
-    
-    try:
-        if provider == 'openai':
-            provider_instance = OpenAIProvider()
-        elif provider == 'hf':
-            provider_instance = HuggingFaceProvider()
-        else:
-            raise ValueError(f"Unsupported MODEL_PROVIDER: {provider}. Supported: 'openai', 'hf'")
-        
-        # Get embedder and chat model instances
-        embedder = provider_instance.get_embedder()
-        chat_model = provider_instance.get_chat_model()
-        
-        # Log successful initialization
-        print(f"✓ Initialized {provider_instance.provider_name} provider")
-        print(f"  - LLM Model: {current_app.config.get('LLM_MODEL')}")
-        print(f"  - Embed Model: {current_app.config.get('EMBED_MODEL')}")
-        
-        return embedder, chat_model
-        
-    except Exception as e:
-        print(f"❌ Failed to initialize {provider} provider: {str(e)}")
-        raise
+    _, embedder, chat_model = _shared_models()
+    return embedder, chat_model
 
 
 def get_provider() -> LLMProvider:
@@ -50,16 +68,33 @@ def get_provider() -> LLMProvider:
     Get the configured LLM provider instance.
     
     Returns:
-        LLMProvider: Configured provider instance
+        LLMProvider: Configured provider instance (shared, like get_models())
     """
-    provider = current_app.config.get('MODEL_PROVIDER', 'hf').lower()
-    
-    if provider == 'openai':
-        return OpenAIProvider()
-    elif provider == 'hf':
-        return HuggingFaceProvider()
-    else:
-        raise ValueError(f"Unsupported MODEL_PROVIDER: {provider}")
+    provider, _, _ = _shared_models()
+    return provider
+
+
+def get_embed_model_name() -> str:
+    """
+    Name of the model behind the active embedder.
+
+    With EMBED_PROVIDER set, the embedder is not the one EMBED_MODEL
+    names, so anything keyed or sized by embedding model (cache keys,
+    model info, chunk windows) must use this instead of the config value.
+    """
+    embedder, _ = get_models()
+    return getattr(embedder, 'model_name', None) or current_app.config.get('EMBED_MODEL', 'unknown')
+
+
+def get_embedding_batcher_stats():
+    """
+    Metrics of the shared embedding batcher.
+
+    Returns:
+        dict: BatchingEmbedder.get_stats(), or None when batching is disabled
+    """
+    embedder, _ = get_models()
+    return embedder.get_stats() if isinstance(embedder, BatchingEmbedder) else None
 
 
 def test_provider_connection():
@@ -102,5 +137,7 @@ __all__ = [
     'LLMProvider',
     'get_models', 
     'get_provider',
+    'get_provider_registry',
+    'get_embedding_batcher_stats',
     'test_provider_connection'
 ]
\ No newline at end of file
@@ -5,6 +5,7 @@ Defines the interface that all providers must implement.
 
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Union, AsyncGenerator, Optional
+from utils.async_runner import run_sync
 
 class Embedder(ABC):
     """Abstract base class for text embedding providers."""
@@ -24,8 +25,7 @@ class Embedder(ABC):
     
     def embed_sync(self, texts: List[str]) -> List[List[float]]:
         """Synchronous wrapper for embed method."""
-        import asyncio
-        return asyncio.run(self.embed(texts))
+        return run_sync(self.embed(texts))
 
 
 class ChatModel(ABC):
@@ -55,8 +55,7 @@ class ChatModel(ABC):
         **generation_options
     ) -> str:
         """Synchronous wrapper for chat method."""
-        import asyncio
-        return asyncio.run(self.chat(messages, **generation_options))
+        return run_sync(self.chat(messages, **generation_options))
 
 
 class LLMProvider(ABC):
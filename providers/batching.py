@@ -0,0 +1,142 @@
+"""
+Cross-request micro-batching for embeddings.
+BatchingEmbedder wraps a provider Embedder: embed() calls arriving from
+concurrent pipelines on the same event loop are held for a few
+milliseconds (or until the batch is full), sent as one provider call, and
+the vectors are scattered back to each caller. Identical texts within a
+batch are embedded once.
+"""
+
+import asyncio
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from utils.deadline import set_current_deadline, with_deadline
+from .base import Embedder
+
+
+@dataclass
+class _PendingRequest:
+    texts: List[str]
+    future: asyncio.Future
+
+
+@dataclass
+class _LoopBatch:
+    """Requests waiting on one event loop."""
+    requests: List[_PendingRequest] = field(default_factory=list)
+    text_count: int = 0
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class BatchingEmbedder(Embedder):
+    """Coalesces concurrent embed() calls into fewer, larger provider calls."""
+
+    def __init__(self, embedder: Embedder, max_batch_size: int = 128, linger_ms: float = 5.0):
+        self.embedder = embedder
+        self.model_name = getattr(embedder, 'model_name', None)
+        self.max_batch_size = max(1, max_batch_size)
+        self.linger = max(0.0, linger_ms) / 1000
+        self._batches: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopBatch]' = weakref.WeakKeyDictionary()
+        self._sending: set = set()
+        self.stats = {
+            'requests': 0,
+            'texts': 0,
+            'batches': 0,
+            'batched_texts': 0,
+            'direct_calls': 0,
+            'flushed_full': 0,
+            'flushed_linger': 0,
+            'errors': 0,
+        }
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts as part of a shared batch.
+
+        Requests with max_batch_size texts or more skip the queue. The
+        caller's deadline bounds only its own wait; the shared provider
+        call is not cancelled when one caller gives up.
+        """
+        if not texts:
+            return []
+
+        self.stats['requests'] += 1
+        self.stats['texts'] += len(texts)
+        if len(texts) >= self.max_batch_size:
+            self.stats['direct_calls'] += 1
+            return await self.embedder.embed(texts)
+
+        loop = asyncio.get_running_loop()
+        batch = self._batches.get(loop)
+        if batch is None:
+            batch = self._batches[loop] = _LoopBatch()
+
+        if batch.text_count + len(texts) > self.max_batch_size:
+            self._flush(loop, 'full')
+            batch = self._batches[loop]
+
+        request = _PendingRequest(list(texts), loop.create_future())
+        # Callers that gave up never read the result; don't warn about it
+        request.future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        batch.requests.append(request)
+        batch.text_count += len(texts)
+
+        if batch.text_count >= self.max_batch_size:
+            self._flush(loop, 'full')
+        elif batch.timer is None:
+            batch.timer = loop.call_later(self.linger, self._flush, loop, 'linger')
+
+        return await with_deadline(asyncio.shield(request.future), "embedding batch")
+
+    def _flush(self, loop: asyncio.AbstractEventLoop, reason: str) -> None:
+        """Send the loop's pending requests as one provider call."""
+        batch = self._batches.get(loop)
+        if batch is None or not batch.requests:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        self._batches[loop] = _LoopBatch()
+        self.stats[f'flushed_{reason}'] += 1
+        task = loop.create_task(self._send(batch.requests))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _send(self, requests: List[_PendingRequest]) -> None:
+        # The provider call serves many requests; none of their deadlines applies to it
+        set_current_deadline(None)
+
+        unique: Dict[str, int] = {}
+        for request in requests:
+            for text in request.texts:
+                unique.setdefault(text, len(unique))
+        texts = list(unique)
+
+        self.stats['batches'] += 1
+        self.stats['batched_texts'] += len(texts)
+        try:
+            vectors = await self.embedder.embed(texts)
+            if len(vectors) != len(texts):
+                raise ValueError(f"Embedder returned {len(vectors)} vectors for {len(texts)} texts")
+        except Exception as e:
+            self.stats['errors'] += 1
+            for request in requests:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+
+        for request in requests:
+            if not request.future.done():
+                request.future.set_result([vectors[unique[text]] for text in request.texts])
+
+    def get_stats(self) -> Dict[str, Any]:
+        batches = self.stats['batches']
+        return {
+            'max_batch_size': self.max_batch_size,
+            'linger_ms': self.linger * 1000,
+            'provider_calls': batches + self.stats['direct_calls'],
+            'avg_batch_fill': round(self.stats['batched_texts'] / (batches * self.max_batch_size), 3) if batches else 0.0,
+            'avg_requests_per_batch': round((self.stats['requests'] - self.stats['direct_calls']) / batches, 2) if batches else 0.0,
+            **self.stats
+        }
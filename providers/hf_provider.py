@@ -9,6 +9,7 @@ from flask import current_app
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from huggingface_hub import InferenceClient
 from huggingface_hub.errors import InferenceTimeoutError, HfHubHTTPError
+from utils.deadline import DeadlineExceeded, current_deadline, with_deadline, stop_before_deadline
 from .logger import track_llm_request
 from .base import Embedder, ChatModel, LLMProvider
 
@@ -23,7 +24,7 @@ class HuggingFaceEmbedder(Embedder):
 
     @track_llm_request("embedding")   
     @retry(
-        stop=stop_after_attempt(3),
+        stop=(stop_after_attempt(3) | stop_before_deadline()),
         wait=wait_exponential(multiplier=1, min=4, max=10),
         retry=retry_if_exception_type((InferenceTimeoutError, HfHubHTTPError))
     )
@@ -32,13 +33,13 @@ class HuggingFaceEmbedder(Embedder):
         
         try:
             # Run the synchronous InferenceClient in a thread pool
-            embeddings = await asyncio.get_event_loop().run_in_executor(
+            embeddings = await with_deadline(asyncio.get_event_loop().run_in_executor(
                 None, 
                 lambda: self.client.feature_extraction(
                     text=texts[0] if len(texts) == 1 else texts,
                     model=self.model_name
                 )
-            )
+            ), "HuggingFace embedding")
             
             # Handle different response formats (list, numpy array, etc.)
             import numpy as np
@@ -67,6 +68,9 @@ class HuggingFaceEmbedder(Embedder):
 
 class HuggingFaceChatModel(ChatModel):
     """HuggingFace chat completion implementation using InferenceClient."""
+
+    # Budget needed for the text-generation fallback to be worth starting
+    MIN_FALLBACK_SECONDS = 10.0
     
     def __init__(self, model_name: str, api_token: str):
         self.model_name = model_name
@@ -76,7 +80,7 @@ class HuggingFaceChatModel(ChatModel):
 
     @track_llm_request("chat")
     @retry(
-        stop=stop_after_attempt(3),
+        stop=(stop_after_attempt(3) | stop_before_deadline()),
         wait=wait_exponential(multiplier=1, min=4, max=10),
         retry=retry_if_exception_type((InferenceTimeoutError, HfHubHTTPError))
     )
@@ -93,7 +97,7 @@ class HuggingFaceChatModel(ChatModel):
             temperature = generation_options.get("temperature", 0.7)
             
             # Run the synchronous InferenceClient in a thread pool
-            response = await asyncio.get_event_loop().run_in_executor(
+            response = await with_deadline(asyncio.get_event_loop().run_in_executor(
                 None,
                 lambda: self.client.chat.completions.create(
                     model=self.model_name,
@@ -101,7 +105,7 @@ class HuggingFaceChatModel(ChatModel):
                     max_tokens=max_tokens,
                     temperature=temperature
                 )
-            )
+            ), "HuggingFace chat")
             
             # Extract the response content
             if hasattr(response, 'choices') and len(response.choices) > 0:
@@ -111,6 +115,11 @@ class HuggingFaceChatModel(ChatModel):
                 
         except Exception as e:
             print(f"HuggingFace chat error: {str(e)}")
+            # The fallback repeats the whole generation; skip it when the
+            # request deadline cannot accommodate a second attempt
+            deadline = current_deadline()
+            if isinstance(e, DeadlineExceeded) or (deadline is not None and not deadline.can_fit(self.MIN_FALLBACK_SECONDS)):
+                raise
             # Fallback to text generation for non-chat models
             try:
                 return await self._fallback_text_generation(messages, **generation_options)
@@ -133,7 +142,7 @@ class HuggingFaceChatModel(ChatModel):
         temperature = generation_options.get("temperature", 0.7)
         
         # Run text generation in thread pool
-        response = await asyncio.get_event_loop().run_in_executor(
+        response = await with_deadline(asyncio.get_event_loop().run_in_executor(
             None,
             lambda: self.client.text_generation(
                 prompt=prompt,
@@ -142,7 +151,7 @@ class HuggingFaceChatModel(ChatModel):
                 temperature=temperature,
                 return_full_text=False
             )
-        )
+        ), "HuggingFace text generation")
         
         return response.strip()
     
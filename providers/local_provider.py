@@ -0,0 +1,147 @@
+"""
+Local CPU embedding provider.
+Embeds text with the hashing trick: words, word bigrams and character
+trigrams of each word are hashed into a fixed number of signed buckets,
+counts are log-scaled and the vectors L2-normalized, so cosine similarity
+behaves like a TF n-gram overlap score. Needs no model download or network
+access, which makes it suitable for CPU-only deployments, tests and
+benchmarks. There is no local chat model.
+"""
+
+import re
+import zlib
+import asyncio
+from collections import Counter
+from functools import lru_cache
+from typing import List, Dict, Tuple
+
+import numpy as np
+from flask import current_app
+
+from .base import Embedder, ChatModel, LLMProvider
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+# Relative weight of each feature family
+WORD_WEIGHT = 1.0
+BIGRAM_WEIGHT = 0.7
+TRIGRAM_WEIGHT = 0.3
+
+# Batches at least this large are encoded off the event loop
+THREAD_MIN_TEXTS = 8
+
+
+class LocalHashEmbedder(Embedder):
+    """Hashed n-gram embeddings computed in-process with NumPy."""
+
+    # In-process calls gain nothing from cross-request batching
+    batchable = False
+
+    def __init__(self, dimensions: int = 384):
+        self.dimensions = dimensions
+        self.model_name = f"hashed-ngram-{dimensions}"
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings on the local CPU."""
+        if len(texts) >= THREAD_MIN_TEXTS:
+            return await asyncio.to_thread(self.encode, texts)
+        return self.encode(texts)
+
+    def encode(self, texts: List[str]) -> List[List[float]]:
+        """
+        Encode a batch of texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One L2-normalized vector of length `dimensions` per text
+            (all zeros for texts without any word characters)
+        """
+        rows: List[np.ndarray] = []
+        buckets: List[np.ndarray] = []
+        weights: List[np.ndarray] = []
+        for row, text in enumerate(texts):
+            hashes, feature_weights = self._features(text)
+            rows.append(np.full(len(hashes), row, dtype=np.int64))
+            buckets.append(hashes)
+            weights.append(feature_weights)
+
+        size = len(texts) * self.dimensions
+        if not size:
+            return []
+
+        hashes = np.concatenate(buckets) if buckets else np.zeros(0, dtype=np.int64)
+        # Low bits pick the bucket, bit 31 the sign (keeps collisions unbiased)
+        signs = np.where(hashes & (1 << 31), -1.0, 1.0)
+        flat = np.concatenate(rows) * self.dimensions + hashes % self.dimensions
+        counts = np.bincount(flat, weights=np.concatenate(weights) * signs, minlength=size)
+        vectors = counts.reshape(len(texts), self.dimensions)
+
+        vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+        return vectors.tolist()
+
+    @staticmethod
+    def _features(text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Hashes and weights of a text's word, bigram and character trigram features."""
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        hashes: List[int] = []
+        feature_weights: List[float] = []
+
+        for token, count in Counter(tokens).items():
+            word_hash, trigram_hashes = _token_hashes(token)
+            hashes.append(word_hash)
+            feature_weights.append(WORD_WEIGHT * count)
+            hashes.extend(trigram_hashes)
+            feature_weights.extend([TRIGRAM_WEIGHT * count] * len(trigram_hashes))
+
+        for bigram, count in Counter(zip(tokens, tokens[1:])).items():
+            hashes.append(zlib.crc32(' '.join(bigram).encode('utf-8')))
+            feature_weights.append(BIGRAM_WEIGHT * count)
+
+        return np.asarray(hashes, dtype=np.int64), np.asarray(feature_weights, dtype=np.float64)
+
+
+@lru_cache(maxsize=65536)
+def _token_hashes(token: str) -> Tuple[int, Tuple[int, ...]]:
+    """Hash of a word and of its character trigrams (words repeat across resumes)."""
+    padded = f"<{token}>"
+    trigrams = tuple(zlib.crc32(padded[i:i + 3].encode('utf-8')) for i in range(len(padded) - 2))
+    return zlib.crc32(token.encode('utf-8')), trigrams
+
+
+class UnavailableChatModel(ChatModel):
+    """Chat model of a provider that has none; every call fails with a clear error."""
+
+    def __init__(self, provider_name: str):
+        self.provider_name = provider_name
+
+    async def chat(self, messages: List[Dict[str, str]], **generation_options) -> str:
+        raise ValueError(
+            f"MODEL_PROVIDER={self.provider_name} has no chat model; use 'openai' or 'hf' "
+            f"with EMBED_PROVIDER={self.provider_name} for local embeddings"
+        )
+
+
+class LocalProvider(LLMProvider):
+    """Local CPU provider (embeddings only)."""
+
+    def __init__(self):
+        self.dimensions = int(current_app.config.get('LOCAL_EMBED_DIMENSIONS', 384))
+        if self.dimensions <= 0:
+            raise ValueError("LOCAL_EMBED_DIMENSIONS must be positive")
+
+    def get_embedder(self) -> Embedder:
+        """Get local hashed n-gram embedder instance."""
+        return LocalHashEmbedder(self.dimensions)
+
+    def get_chat_model(self) -> ChatModel:
+        """Local provider has no chat model."""
+        return UnavailableChatModel(self.provider_name)
+
+    @property
+    def provider_name(self) -> str:
+        """Get provider name."""
+        return "local"
@@ -8,6 +8,7 @@ import json
 from typing import Dict, Any, Optional
 from functools import wraps
 from flask import current_app
+from utils.async_runner import run_sync
 
 
 class RequestLogger:
@@ -114,8 +115,7 @@ def track_llm_request(request_type: str):
         @wraps(func)
         def sync_wrapper(self, *args, **kwargs):
             """Sync version of the wrapper for sync methods."""
-            import asyncio
-            return asyncio.run(async_wrapper(self, *args, **kwargs))
+            return run_sync(async_wrapper(self, *args, **kwargs))
         
         # Return async wrapper if original function is async, sync otherwise
         import inspect
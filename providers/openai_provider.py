@@ -1,25 +1,69 @@
 """
 OpenAI provider implementation using official OpenAI SDK.
-Supports both embeddings and chat completions.
+Supports both embeddings and chat completions. Calls go through AsyncOpenAI
+clients that share one pooled, keep-alive httpx connection pool per event
+loop, so concurrent stages run their requests in parallel.
 """
 
+import asyncio
+import weakref
+import httpx
 import openai
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from flask import current_app
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+from utils.deadline import current_deadline, with_deadline, stop_before_deadline
 from .base import Embedder, ChatModel, LLMProvider
 
 
+class OpenAIClientPool:
+    """AsyncOpenAI clients over a shared httpx connection pool, one per event loop."""
+
+    def __init__(
+        self,
+        api_key: str,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 600.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.api_key = api_key
+        self.timeout = timeout
+        self.transport = transport
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        # httpx connections belong to the loop that opened them
+        self._clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, openai.AsyncOpenAI]' = weakref.WeakKeyDictionary()
+
+    def client(self) -> openai.AsyncOpenAI:
+        """The AsyncOpenAI client of the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed():
+            http_client = httpx.AsyncClient(
+                limits=self.limits,
+                timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 10.0)),
+                transport=self.transport
+            )
+            client = openai.AsyncOpenAI(api_key=self.api_key, http_client=http_client)
+            self._clients[loop] = client
+        return client
+
+
 class OpenAIEmbedder(Embedder):
     """OpenAI embeddings implementation."""
     
-    def __init__(self, model_name: str, api_key: str):
+    def __init__(self, model_name: str, clients: OpenAIClientPool):
         self.model_name = model_name
-        self.client = openai.OpenAI(api_key=api_key)
+        self.clients = clients
         
     @retry(
-        stop=stop_after_attempt(3),
+        stop=(stop_after_attempt(3) | stop_before_deadline()),
         wait=wait_exponential(multiplier=1, min=4, max=10),
         retry=retry_if_exception_type((openai.RateLimitError, openai.APITimeoutError))
     )
@@ -27,11 +71,11 @@ class OpenAIEmbedder(Embedder):
         """Generate embeddings using OpenAI Embeddings API."""
         
         try:
-            response =  self.client.embeddings.create(
+            response = await with_deadline(self.clients.client().embeddings.create(
                 model=self.model_name,
                 input=texts,
                 encoding_format="float"
-            )
+            ), "OpenAI embedding")
             
             # Extract embeddings in order
             embeddings = []
@@ -51,12 +95,12 @@ class OpenAIEmbedder(Embedder):
 class OpenAIChatModel(ChatModel):
     """OpenAI chat completion implementation."""
     
-    def __init__(self, model_name: str, api_key: str):
+    def __init__(self, model_name: str, clients: OpenAIClientPool):
         self.model_name = model_name
-        self.client = openai.OpenAI(api_key=api_key)
+        self.clients = clients
         
     @retry(
-        stop=stop_after_attempt(3),
+        stop=(stop_after_attempt(3) | stop_before_deadline()),
         wait=wait_exponential(multiplier=1, min=4, max=10),
         retry=retry_if_exception_type((openai.RateLimitError, openai.APITimeoutError))
     )
@@ -77,9 +121,17 @@ class OpenAIChatModel(ChatModel):
         
         # Override with user-provided options
         params.update(generation_options)
+
+        # Abandon the HTTP request itself once the request deadline passes
+        deadline = current_deadline()
+        if deadline is not None:
+            params.setdefault("timeout", deadline.timeout())
         
         try:
-            response =  self.client.chat.completions.create(**params)
+            response = await with_deadline(
+                self.clients.client().chat.completions.create(**params),
+                "OpenAI chat"
+            )
             
             # Extract the generated text
             if response.choices and len(response.choices) > 0:
@@ -105,14 +157,23 @@ class OpenAIProvider(LLMProvider):
         
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY is required for OpenAI provider")
+
+        # Embedder and chat model share one connection pool
+        self.clients = OpenAIClientPool(
+            self.api_key,
+            max_connections=int(current_app.config.get('OPENAI_MAX_CONNECTIONS', 100)),
+            max_keepalive_connections=int(current_app.config.get('OPENAI_MAX_KEEPALIVE_CONNECTIONS', 20)),
+            keepalive_expiry=float(current_app.config.get('OPENAI_KEEPALIVE_EXPIRY_SECONDS', 30)),
+            timeout=float(current_app.config.get('OPENAI_TIMEOUT_SECONDS', 600))
+        )
     
     def get_embedder(self) -> Embedder:
         """Get OpenAI embedder instance."""
-        return OpenAIEmbedder(self.embed_model, self.api_key)
+        return OpenAIEmbedder(self.embed_model, self.clients)
     
     def get_chat_model(self) -> ChatModel:
         """Get OpenAI chat model instance."""
-        return OpenAIChatModel(self.llm_model, self.api_key)
+        return OpenAIChatModel(self.llm_model, self.clients)
     
     @property
     def provider_name(self) -> str:
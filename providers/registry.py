@@ -0,0 +1,129 @@
+"""
+Process-wide registry of LLM provider clients.
+Each provider, with its embedder and chat model (and their SDK clients and
+connection pools), is built once per process and configuration and then
+shared by every caller of get_models(); with EMBED_BATCHING_ENABLED the
+embedder is wrapped in a BatchingEmbedder. The registry empties itself in
+forked children (gunicorn --preload) so workers never share sockets with
+the master or with each other.
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .base import Embedder, ChatModel, LLMProvider
+from .batching import BatchingEmbedder
+
+# Config values that select or configure provider clients
+PROVIDER_CONFIG_KEYS = (
+    'MODEL_PROVIDER',
+    'LLM_MODEL',
+    'EMBED_MODEL',
+    'OPENAI_LLM_MODEL',
+    'OPENAI_EMBED_MODEL',
+    'OPENAI_API_KEY',
+    'HF_TOKEN',
+    'OPENAI_MAX_CONNECTIONS',
+    'OPENAI_MAX_KEEPALIVE_CONNECTIONS',
+    'OPENAI_KEEPALIVE_EXPIRY_SECONDS',
+    'OPENAI_TIMEOUT_SECONDS',
+    'EMBED_BATCHING_ENABLED',
+    'EMBED_BATCH_MAX_SIZE',
+    'EMBED_BATCH_LINGER_MS',
+    'EMBED_PROVIDER',
+    'LOCAL_EMBED_DIMENSIONS',
+    'REPLAY_MODE',
+    'REPLAY_STORE_PATH',
+    'REPLAY_UPSTREAM_PROVIDER',
+    'REPLAY_LATENCY',
+    'REPLAY_SEED',
+    'REPLAY_ON_MISS',
+)
+
+ProviderEntry = Tuple[LLMProvider, Embedder, ChatModel]
+
+
+class ProviderRegistry:
+    """Builds each provider once per process and configuration."""
+
+    def __init__(self):
+        self._entries: Dict[Tuple[Any, ...], ProviderEntry] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def get(
+        self,
+        config: Dict[str, Any],
+        factory: Callable[[], LLMProvider],
+        embed_factory: Optional[Callable[[], LLMProvider]] = None
+    ) -> ProviderEntry:
+        """
+        The shared (provider, embedder, chat model) for a configuration.
+
+        Args:
+            config: App config (only PROVIDER_CONFIG_KEYS are considered)
+            factory: Builds the provider on first use
+            embed_factory: Builds a different provider for the embedder
+                (EMBED_PROVIDER); defaults to the main provider
+
+        Returns:
+            Tuple of (LLMProvider, Embedder, ChatModel)
+        """
+        if self._pid != os.getpid():
+            self.reset()  # forked by code that bypasses the os.fork() hooks
+
+        key = tuple(config.get(name) for name in PROVIDER_CONFIG_KEYS)
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                provider = factory()
+                embed_provider = embed_factory() if embed_factory is not None else provider
+                embedder = provider.get_embedder() if embed_provider is provider else embed_provider.get_embedder()
+                embed_model = getattr(embedder, 'model_name', None) or config.get('EMBED_MODEL')
+                # Batching only pays off for remote embedders
+                if config.get('EMBED_BATCHING_ENABLED', False) and getattr(embedder, 'batchable', True):
+                    embedder = BatchingEmbedder(
+                        embedder,
+                        max_batch_size=int(config.get('EMBED_BATCH_MAX_SIZE', 128)),
+                        linger_ms=float(config.get('EMBED_BATCH_LINGER_MS', 5))
+                    )
+                entry = (provider, embedder, provider.get_chat_model())
+                self._entries[key] = entry
+                print(f"✓ Initialized {provider.provider_name} provider")
+                print(f"  - LLM Model: {config.get('LLM_MODEL')}")
+                print(f"  - Embed Model: {embed_model} ({embed_provider.provider_name})")
+        return entry
+
+    def reset(self) -> None:
+        """Drop every client; the next get() builds fresh ones."""
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global provider registry instance
+_provider_registry: Optional[ProviderRegistry] = None
+
+def get_provider_registry() -> ProviderRegistry:
+    """Get the process-wide provider registry."""
+    global _provider_registry
+    if _provider_registry is None:
+        _provider_registry = ProviderRegistry()
+    return _provider_registry
+
+
+def _reset_after_fork() -> None:
+    if _provider_registry is not None:
+        _provider_registry.reset()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,267 @@
+"""
+Record/replay LLM provider for offline benchmarks and load tests.
+In record mode every embedding and chat call goes to a real provider and
+the request/response pair (with its observed latency) is appended to a
+JSON Lines store. In replay mode the store answers instead, after an
+optional synthetic delay, so the pipeline can be exercised repeatedly
+with no network, cost or flakiness.
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import hashlib
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from flask import current_app
+
+from utils.deadline import with_deadline
+from .base import Embedder, ChatModel, LLMProvider
+from .local_provider import LocalHashEmbedder
+
+REPLAY_MODES = ('record', 'replay')
+
+# Generation options that do not change the response
+IGNORED_OPTIONS = {'timeout'}
+
+# Characters of the system message identifying a prompt template
+TEMPLATE_PREFIX_CHARS = 500
+
+
+class ReplayMissError(LookupError):
+    """Raised in replay mode for a call that was never recorded."""
+
+
+class ReplayStore:
+    """Append-only JSON Lines file of recorded calls, indexed in memory."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._by_template: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    self._index(json.loads(line))
+
+    def _index(self, record: Dict[str, Any]) -> None:
+        if record['key'] not in self._entries and record.get('template'):
+            self._by_template.setdefault(record['template'], []).append(record['key'])
+        self._entries[record['key']] = record
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(key)
+
+    def similar(self, template: str, key: str) -> Optional[Dict[str, Any]]:
+        """A recording of the same prompt template, picked deterministically by key."""
+        keys = self._by_template.get(template)
+        if not keys:
+            return None
+        return self._entries[keys[int(key[:8], 16) % len(keys)]]
+
+    def put(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + '\n')
+            self._index(record)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def parse_latency(spec: str, seed: Optional[int] = None) -> Callable[[Optional[float]], float]:
+    """
+    Build a synthetic latency model.
+
+    Args:
+        spec: 'none', 'recorded[:FACTOR]', 'fixed:MS', 'uniform:MIN_MS,MAX_MS',
+            'normal:MEAN_MS,STD_MS' or 'lognormal:MEDIAN_MS,SIGMA'
+        seed: Random seed, for repeatable runs
+
+    Returns:
+        Function mapping a call's recorded latency (ms, may be None) to
+        the delay to apply, in seconds
+    """
+    rng = random.Random(seed)
+    name, _, args = (spec or 'none').strip().lower().partition(':')
+    try:
+        values = [float(value) for value in args.split(',')] if args else []
+        if name == 'none':
+            return lambda recorded: 0.0
+        if name == 'recorded':
+            factor = values[0] if values else 1.0
+            return lambda recorded: max(0.0, (recorded or 0.0) * factor / 1000)
+        if name == 'fixed':
+            return lambda recorded: values[0] / 1000
+        if name == 'uniform':
+            low, high = values
+            return lambda recorded: rng.uniform(low, high) / 1000
+        if name == 'normal':
+            mean, std = values
+            return lambda recorded: max(0.0, rng.gauss(mean, std)) / 1000
+        if name == 'lognormal':
+            median, sigma = values
+            return lambda recorded: median * rng.lognormvariate(0.0, sigma) / 1000
+    except (ValueError, IndexError):
+        pass
+    raise ValueError(f"Invalid REPLAY_LATENCY: {spec!r}")
+
+
+def _digest(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class ReplayEmbedder(Embedder):
+    """Embedder answering from recordings; each text is recorded separately."""
+
+    def __init__(self, store: ReplayStore, mode: str, latency: Callable, on_miss: str = 'error', upstream: Optional[Embedder] = None):
+        self.store = store
+        self.mode = mode
+        self.latency = latency
+        self.on_miss = on_miss
+        self.upstream = upstream
+        self.model_name = f"replay:{getattr(upstream, 'model_name', 'recorded')}"
+        self._fallback: Optional[LocalHashEmbedder] = None
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embeddings of texts from the store (recording any new ones in record mode)."""
+        keys = [_digest({'kind': 'embed', 'text': text}) for text in texts]
+        records = [self.store.get(key) for key in keys]
+        missing = [i for i, record in enumerate(records) if record is None]
+
+        if missing and self.mode == 'record':
+            start = time.perf_counter()
+            vectors = await self.upstream.embed([texts[i] for i in missing])
+            latency_ms = round((time.perf_counter() - start) * 1000, 2)
+            for i, vector in zip(missing, vectors):
+                records[i] = {
+                    'kind': 'embed',
+                    'key': keys[i],
+                    'model': getattr(self.upstream, 'model_name', None),
+                    'request': {'text': texts[i]},
+                    'response': vector,
+                    'latency_ms': latency_ms,
+                    'recorded_at': datetime.now().isoformat()
+                }
+                self.store.put(records[i])
+            return [record['response'] for record in records]
+
+        if missing and self.on_miss != 'similar':
+            raise ReplayMissError(
+                f"No recorded embedding for {len(missing)} of {len(texts)} texts in {self.store.path}; "
+                f"record them with REPLAY_MODE=record"
+            )
+
+        recorded = [record for record in records if record is not None]
+        await _replay_delay(self.latency, max((record.get('latency_ms') or 0.0 for record in recorded), default=None), "replayed embedding")
+
+        vectors = [record['response'] if record is not None else None for record in records]
+        if missing:
+            # Same dimensions as the recordings, so similarities stay computable
+            dimensions = len(recorded[0]['response']) if recorded else 384
+            if self._fallback is None or self._fallback.dimensions != dimensions:
+                self._fallback = LocalHashEmbedder(dimensions)
+            for i, vector in zip(missing, self._fallback.encode([texts[i] for i in missing])):
+                vectors[i] = vector
+        return vectors
+
+
+class ReplayChatModel(ChatModel):
+    """Chat model answering from recordings."""
+
+    def __init__(self, store: ReplayStore, mode: str, latency: Callable, on_miss: str = 'error', upstream: Optional[ChatModel] = None):
+        self.store = store
+        self.mode = mode
+        self.latency = latency
+        self.on_miss = on_miss
+        self.upstream = upstream
+
+    async def chat(self, messages: List[Dict[str, str]], **generation_options) -> str:
+        """Recorded response to the same messages and options."""
+        options = {name: value for name, value in generation_options.items() if name not in IGNORED_OPTIONS}
+        key = _digest({'kind': 'chat', 'messages': messages, 'options': options})
+        system = next((m.get('content', '') for m in messages if m.get('role') == 'system'), '')
+        template = _digest({'kind': 'chat', 'system': system[:TEMPLATE_PREFIX_CHARS], 'max_tokens': options.get('max_tokens')})
+
+        record = self.store.get(key)
+        if record is None and self.mode == 'record':
+            start = time.perf_counter()
+            response = await self.upstream.chat(messages, **generation_options)
+            self.store.put({
+                'kind': 'chat',
+                'key': key,
+                'template': template,
+                'model': getattr(self.upstream, 'model_name', None),
+                'request': {'messages': messages, 'options': options},
+                'response': response,
+                'latency_ms': round((time.perf_counter() - start) * 1000, 2),
+                'recorded_at': datetime.now().isoformat()
+            })
+            return response
+
+        if record is None and self.on_miss == 'similar':
+            record = self.store.similar(template, key)
+        if record is None:
+            raise ReplayMissError(
+                f"No recorded chat response for this prompt in {self.store.path}; "
+                f"record it with REPLAY_MODE=record or set REPLAY_ON_MISS=similar"
+            )
+
+        await _replay_delay(self.latency, record.get('latency_ms'), "replayed chat")
+        return record['response']
+
+
+async def _replay_delay(latency: Callable, recorded_ms: Optional[float], stage: str) -> None:
+    delay = latency(recorded_ms)
+    if delay > 0:
+        await with_deadline(asyncio.sleep(delay), stage)
+
+
+class ReplayProvider(LLMProvider):
+    """Record/replay provider (MODEL_PROVIDER=replay)."""
+
+    def __init__(self, upstream_factory: Optional[Callable[[], LLMProvider]] = None):
+        self.mode = current_app.config.get('REPLAY_MODE', 'replay').lower()
+        if self.mode not in REPLAY_MODES:
+            raise ValueError(f"Unsupported REPLAY_MODE: {self.mode}. Supported: 'record', 'replay'")
+        self.on_miss = current_app.config.get('REPLAY_ON_MISS', 'error').lower()
+        self.store = ReplayStore(current_app.config.get('REPLAY_STORE_PATH', 'replay/llm_calls.jsonl'))
+
+        seed = current_app.config.get('REPLAY_SEED')
+        self.latency = parse_latency(current_app.config.get('REPLAY_LATENCY', 'recorded'), int(seed) if seed is not None else None)
+
+        self.upstream = None
+        if self.mode == 'record':
+            if upstream_factory is None:
+                raise ValueError("REPLAY_MODE=record needs REPLAY_UPSTREAM_PROVIDER")
+            self.upstream = upstream_factory()
+        elif not len(self.store):
+            print(f"Warning: replay store {self.store.path} is empty; every call will miss.")
+
+    def get_embedder(self) -> Embedder:
+        """Get replay embedder instance."""
+        upstream = self.upstream.get_embedder() if self.upstream else None
+        return ReplayEmbedder(self.store, self.mode, self.latency, self.on_miss, upstream)
+
+    def get_chat_model(self) -> ChatModel:
+        """Get replay chat model instance."""
+        upstream = self.upstream.get_chat_model() if self.upstream else None
+        return ReplayChatModel(self.store, self.mode, self.latency, self.on_miss, upstream)
+
+    @property
+    def provider_name(self) -> str:
+        """Get provider name."""
+        return f"replay ({self.mode})"
@@ -1,20 +1,29 @@
-from flask import Blueprint, request, jsonify,current_app,send_file, make_response,Response,render_template,flash,redirect,url_for
+from flask import Blueprint, request, jsonify,current_app,send_file, make_response,Response,render_template,flash,redirect,url_for,stream_with_context
 from flask_login import login_required,current_user
-from werkzeug.exceptions import BadRequest
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge
 from math import isnan
 import asyncio
 import json
 import time
 from typing import Dict,Any,Optional,Tuple,List
 import io
+import math
 import tempfile
+import zipfile
 import os
 from schemas import (
     ResumeInput, JDInput, OptimizationOptions, OptimizationResult
 )
 from utils import _to_safe_dict, _to_safe_list 
-from services import ResumeOptimizationPipeline,create_docx_sync, create_pdf_sync,get_enhanced_cache
-from providers import  test_provider_connection
+from services import ResumeOptimizationPipeline,create_docx_sync, create_pdf_sync,get_enhanced_cache,get_job_manager
+from services.resume.jobs import JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED, FINISHED_STATUSES, JOB_KIND_BATCH
+from services.resume.singleflight import get_single_flight
+from services.resume.scheduling import priority_class_for
+from services.rate_limiter import rate_limited
+from services.resume.ranking import ResumeRanker, iter_zip_resumes, count_zip_resumes
+from services.resume.extraction import FileTooLargeError, read_capped, get_extension
+from helpers import max_upload_bytes
+from providers import  test_provider_connection, get_embedding_batcher_stats
 from models import ResumeOptimization
 from db import db
 import traceback
@@ -38,6 +47,7 @@ def optimize_page():
 # Update the optimize_resume endpoint decorator
 @optimizer_bp.route('/optimize', methods=['POST'])
 @login_required 
+@rate_limited()
 def optimize_resume():
     """
     Main resume optimization endpoint.
@@ -48,9 +58,13 @@ def optimize_resume():
         "job_description": {"text": "...", "title": "...", "company": "..."},
         "options": {"tone": "professional-concise", "locale": "en-US", ...}
     }
+
+    Jobs run in the premium class for subscribers and the free class
+    otherwise; a form field priority=batch queues bulk work behind both.
     
     Returns:
-        OptimizationResult with optimized resume and analytics
+        202 with the queued job id and polling URLs for JSON clients,
+        otherwise a redirect to the dashboard
     """
     
     try:
@@ -77,76 +91,449 @@ def optimize_resume():
                 }
                 
                 # Handle resume input
-                resume_type = request.form.get('resume_type')
-              
-                if resume_type == 'file':
-                    # Get uploaded file
-                    resume_file = request.files.get('resume_file')
-                    if not resume_file:
-                        return jsonify({'error': 'No file uploaded'}), 400
-                    
-                    # Save file temporarily and create file URL
-                    temp_path = resume_optimization_instance.save_temp_file(resume_file)
-                    
-
-                    if resume_file.content_type == 'application/pdf':
-                        resume_input = ResumeInput(pdf_url=temp_path)
-    
-                    elif resume_file.content_type == 'application/vnd.openxmlformats-officedocument.wordprocessingml.document':
-                        resume_input = ResumeInput(docx_url=temp_path)
-                    else:
-                        content = resume_file.read().decode('utf-8')
-                        resume_input = ResumeInput(text=content)
-
-                else:
-                    # Text input
-                    resume_input = ResumeInput(text=request.form.get('resume_text', ''))
+                if request.form.get('resume_type') == 'file' and not request.files.get('resume_file'):
+                    return jsonify({'error': 'No file uploaded'}), 400
+                resume_input = _resume_input_from_form()
 
         # Create schema objects
         jd_input = JDInput(**job_data)
         options = OptimizationOptions(**options_data) 
-        # Process optimization pipeline
+        # Queue the optimization pipeline; background workers run it
         try:
-            print("🔄 Running optimization pipeline...")
-            result_id = resume_optimization_instance._run_optimization_pipeline_sync(
-                resume_input, jd_input, options,  user_id
-            )
-            if not result_id:
-                flash('Optimization failed to save results', 'error')
-                return redirect(url_for('root.dashboard'))
-            # cache = get_enhanced_cache()
-            # asyncio.run(cache.cache_result(
-            #     resume_text=resume_text,
-            #     jd_text=jd_input.text,
-            #     result=result,
-            #     options=options.dict(),
-            #     model_info=_get_model_info(),
-            #     ttl=24*60*60  # 24 hours
-            # ))
-            
-            # Add processing metadata
-            
-            
-            # result['cache_hit'] = False
-            
-            
-          
-            # print(f"📊 Match score: {result.get('match_score', 'N/A')}%")
-            # print(f"🔧 Missing keywords: {len(result.get('missing_keywords', []))}")
-            
-            # SERVER-SIDE REDIRECT to results page
-            return redirect(url_for('optimizer.show_results', result_id=result_id))
-            
+            priority = priority_class_for(current_user, request.form.get('priority'))
+            job = get_job_manager().submit(user_id, resume_input, jd_input, options, priority=priority)
         except Exception as e:
-            print(f"❌ Optimization pipeline failed: {str(e)}")
+            print(f"❌ Failed to queue optimization: {str(e)}")
+            if _wants_json():
+                return jsonify({'error': f'Failed to queue optimization: {str(e)}'}), 503
             flash(f'Optimization failed: {str(e)}', 'error')
             return redirect(url_for('root.dashboard'))
+
+        if _wants_json():
+            return jsonify({
+                'job_id': job.job_id,
+                'status': job.status,
+                'priority': job.priority,
+                **_job_links(job.job_id)
+            }), 202
+
+        flash('Optimization started. Your results will appear on the dashboard shortly.', 'info')
+        return redirect(url_for('root.dashboard'))
     
+    except RequestEntityTooLarge:
+        raise
     except Exception as e:
         print(f"❌ Request processing failed: {str(e)}")
+        if _wants_json():
+            return jsonify({'error': f'Request processing failed: {str(e)}'}), 400
         flash(f'Request processing failed: {str(e)}', 'error')
         return redirect(url_for('root.dashboard'))
 
+
+def _resume_input_from_form() -> ResumeInput:
+    """Build the ResumeInput from a multipart form (uploaded file or pasted text)."""
+    resume_type = request.form.get('resume_type')
+
+    if resume_type == 'file':
+        # Get uploaded file
+        resume_file = request.files.get('resume_file')
+        if not resume_file:
+            raise BadRequest('No file uploaded')
+
+        # Read the upload into memory, enforcing the size cap as it streams in
+        try:
+            file_bytes = read_capped(resume_file.stream, max_upload_bytes())
+        except FileTooLargeError as e:
+            raise RequestEntityTooLarge(str(e))
+
+        file_type = _upload_file_type(resume_file)
+        if file_type:
+            return ResumeInput(file_bytes=file_bytes, file_type=file_type, filename=resume_file.filename)
+        return ResumeInput(text=file_bytes.decode('utf-8'))
+
+    # Text input
+    return ResumeInput(text=request.form.get('resume_text', ''))
+
+
+def _upload_file_type(resume_file) -> Optional[str]:
+    """'pdf' or 'docx' from the upload's content type (or extension), None for text."""
+    if resume_file.content_type == 'application/pdf':
+        return 'pdf'
+    if resume_file.content_type == 'application/vnd.openxmlformats-officedocument.wordprocessingml.document':
+        return 'docx'
+    extension = get_extension(resume_file.filename or '')
+    return extension.lstrip('.') if extension in ('.pdf', '.docx') else None
+
+
+def _batch_cost() -> int:
+    """Rate-limit cost of a batch request: one token per job description."""
+    try:
+        if request.content_type and request.content_type.startswith('multipart/form-data'):
+            return len(json.loads(request.form.get('job_descriptions') or '[]'))
+        return len((request.get_json(silent=True) or {}).get('job_descriptions') or [])
+    except (ValueError, TypeError):
+        return 1  # malformed requests are rejected by the route itself
+
+
+@optimizer_bp.route('/optimize/batch', methods=['POST'])
+@login_required
+@rate_limited(cost=_batch_cost)
+def optimize_resume_batch():
+    """
+    Optimize one resume against many job descriptions.
+
+    Request body (JSON):
+    {
+        "resume_input": {"text": "..."},
+        "job_descriptions": [{"text": "...", "title": "...", "company": "..."}, ...],
+        "options": {"tone": "professional-concise", ...}
+    }
+    or multipart/form-data with the same resume fields as /optimize and
+    'job_descriptions' / 'options' as JSON strings.
+
+    The batch runs as one background job in the batch priority class.
+    Its events stream reports a 'batch_item' event per job description as
+    it completes ({"index", "status", "result_id", ...}); the finished
+    job's result holds the summary and every item.
+
+    Returns:
+        202 with the queued job id and polling URLs
+    """
+    try:
+        user_id = current_user.id
+
+        if request.content_type and request.content_type.startswith('multipart/form-data'):
+            jd_data = json.loads(request.form.get('job_descriptions') or '[]')
+            options_data = json.loads(request.form.get('options') or '{}')
+            resume_input = _resume_input_from_form()
+        else:
+            payload = request.get_json(silent=True) or {}
+            jd_data = payload.get('job_descriptions') or []
+            options_data = payload.get('options') or {}
+            # Only inline text for JSON clients; file paths are server-side only
+            resume_input = ResumeInput(text=_to_safe_dict(payload.get('resume_input')).get('text'))
+
+        max_jds = current_app.config.get('BATCH_OPTIMIZE_MAX_JDS', 30)
+        if not jd_data:
+            return jsonify({'error': 'At least one job description is required'}), 400
+        if len(jd_data) > max_jds:
+            return jsonify({'error': f'At most {max_jds} job descriptions per batch'}), 400
+
+        jd_inputs = [JDInput(**jd) for jd in jd_data]
+        options = OptimizationOptions(**options_data)
+
+    except RequestEntityTooLarge:
+        raise
+    except Exception as e:
+        print(f"❌ Batch request processing failed: {str(e)}")
+        return jsonify({'error': f'Request processing failed: {str(e)}'}), 400
+
+    try:
+        job = get_job_manager().submit_batch(user_id, resume_input, jd_inputs, options)
+    except Exception as e:
+        print(f"❌ Failed to queue batch optimization: {str(e)}")
+        return jsonify({'error': f'Failed to queue batch optimization: {str(e)}'}), 503
+
+    return jsonify({
+        'job_id': job.job_id,
+        'kind': job.kind,
+        'status': job.status,
+        'priority': job.priority,
+        'total': len(jd_inputs),
+        **_job_links(job.job_id)
+    }), 202
+
+
+def _rank_cost() -> int:
+    """Rate-limit cost of a ranking request: one token per RANKING_RESUMES_PER_TOKEN resumes."""
+    count = len(request.files.getlist('resumes'))
+    archive = request.files.get('resumes_zip')
+    if archive:
+        try:
+            count += count_zip_resumes(archive.stream)
+        except (zipfile.BadZipFile, OSError):
+            pass  # the route reports the bad archive
+        finally:
+            archive.stream.seek(0)
+    per_token = max(1, int(current_app.config.get('RANKING_RESUMES_PER_TOKEN', 25)))
+    return math.ceil(count / per_token)
+
+
+@optimizer_bp.route('/rank', methods=['POST'])
+@login_required
+@rate_limited(cost=_rank_cost)
+def rank_resumes():
+    """
+    Recruiter mode: rank many resumes against one job description.
+
+    Multipart form fields:
+        job_description: JD text
+        resumes_zip: zip archive of PDF/DOCX/TXT resumes, and/or
+        resumes: one or more resume files
+        use_embeddings: 'true' to include embedding similarity (default false)
+
+    Returns:
+        JSON ranked list (deterministic scoring, no LLM rewrite)
+    """
+    try:
+        jd_text = (request.form.get('job_description') or '').strip()
+        if not jd_text:
+            return jsonify({'error': 'job_description is required'}), 400
+
+        max_files = current_app.config.get('RANKING_MAX_FILES', 500)
+        max_file_bytes = current_app.config.get('MAX_RESUME_SIZE_MB', 5) * 1024 * 1024
+
+        files = []
+        skipped = []
+        archive = request.files.get('resumes_zip')
+        if archive:
+            files.extend(iter_zip_resumes(archive.stream, max_files=max_files, max_file_bytes=max_file_bytes))
+        for resume_file in request.files.getlist('resumes'):
+            # Skip oversized files (as iter_zip_resumes does) rather than failing the batch
+            try:
+                files.append((resume_file.filename, read_capped(resume_file.stream, max_file_bytes)))
+            except FileTooLargeError:
+                print(f"⚠️  Skipping oversized resume upload: {resume_file.filename}")
+                skipped.append(resume_file.filename)
+
+        if not files:
+            if skipped:
+                return jsonify({'error': 'Every uploaded resume exceeds the size limit', 'skipped': skipped}), 413
+            return jsonify({'error': 'No resumes uploaded'}), 400
+        if len(files) > max_files:
+            return jsonify({'error': f'At most {max_files} resumes per request'}), 400
+
+        start_time = time.time()
+        ranker = ResumeRanker(
+            jd_text,
+            use_embeddings=request.form.get('use_embeddings', 'false') == 'true',
+            max_workers=current_app.config.get('RANKING_WORKERS') or None
+        )
+        ranked = ranker.rank(files)
+
+        return jsonify({
+            'total': len(files),
+            'ranked': ranked,
+            'skipped': skipped,
+            'jd_required_skills': ranker.jd_profile.required_skills,
+            'processing_time_ms': round((time.time() - start_time) * 1000, 2)
+        }), 200
+
+    except RequestEntityTooLarge:
+        raise
+    except FileTooLargeError as e:
+        return jsonify({'error': str(e)}), 413
+    except Exception as e:
+        print(f"❌ Resume ranking failed: {str(e)}")
+        return jsonify({'error': f'Ranking failed: {str(e)}'}), 400
+
+
+def _wants_json() -> bool:
+    """True when the client (fetch/XHR) asked for a JSON response."""
+    return request.accept_mimetypes.best == 'application/json'
+
+
+def _job_links(job_id: str) -> Dict[str, str]:
+    """Status, events, result and cancel URLs of a queued job."""
+    return {
+        'status_url': url_for('optimizer.job_status', job_id=job_id),
+        'events_url': url_for('optimizer.job_events', job_id=job_id),
+        'result_url': url_for('optimizer.job_result', job_id=job_id),
+        'cancel_url': url_for('optimizer.cancel_job', job_id=job_id)
+    }
+
+
+def _with_results_urls(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Add results_url to a job result, or to each item of a batch result."""
+    if data.get('result_id'):
+        data['results_url'] = url_for('optimizer.show_results', result_id=data['result_id'])
+    for item in data.get('items') or []:
+        if item.get('result_id'):
+            item['results_url'] = url_for('optimizer.show_results', result_id=item['result_id'])
+    return data
+
+
+def _get_user_job(job_id: str):
+    """Load a job owned by the current user, or None."""
+    job = get_job_manager().get_job(job_id)
+    if job is None or str(job.user_id) != str(current_user.id):
+        return None
+    return job
+
+
+@optimizer_bp.route('/jobs/<job_id>', methods=['GET'])
+@login_required
+def job_status(job_id):
+    """
+    Poll the status of a queued optimization job.
+
+    Returns:
+        Job status JSON; includes results_url once the job has completed
+        (per item for batch jobs)
+    """
+    job = _get_user_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
+
+    status_data = job.public_dict()
+    if job.status == JOB_COMPLETED and job.result:
+        if job.kind == JOB_KIND_BATCH:
+            _with_results_urls(status_data['result'])
+        else:
+            status_data['results_url'] = url_for('optimizer.show_results', result_id=job.result.get('result_id'))
+
+    return jsonify(status_data), 200
+
+
+@optimizer_bp.route('/jobs/<job_id>/result', methods=['GET'])
+@login_required
+def job_result(job_id):
+    """
+    Fetch the result of an optimization job.
+
+    Redirects to the results page once completed (batch jobs return their
+    summary instead); otherwise reports the current status (202 while
+    pending, 500 if the job failed, 409 if it was cancelled).
+    """
+    job = _get_user_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
+
+    if job.status == JOB_COMPLETED and job.result and job.kind == JOB_KIND_BATCH:
+        return jsonify({'job_id': job.job_id, 'status': job.status, **_with_results_urls(job.result)}), 200
+
+    if job.status == JOB_COMPLETED and job.result:
+        return redirect(url_for('optimizer.show_results', result_id=job.result.get('result_id')))
+
+    if job.status == JOB_FAILED:
+        return jsonify({'job_id': job.job_id, 'status': job.status, 'error': job.error}), 500
+
+    if job.status == JOB_CANCELLED:
+        return jsonify({'job_id': job.job_id, 'status': job.status, 'error': job.error}), 409
+
+    return jsonify({'job_id': job.job_id, 'status': job.status}), 202
+
+
+@optimizer_bp.route('/jobs/<job_id>/retry', methods=['POST'])
+@login_required
+@rate_limited()
+def retry_job(job_id):
+    """
+    Retry a failed or cancelled optimization job.
+
+    The new job resumes from the failed job's stage checkpoints, so stages
+    that already completed (extraction, normalization, analysis) are not
+    paid for again while the checkpoints are still valid.
+    """
+    job = _get_user_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
+    if job.status not in (JOB_FAILED, JOB_CANCELLED):
+        return jsonify({'error': f'Only failed or cancelled jobs can be retried (status: {job.status})'}), 409
+
+    try:
+        retry = get_job_manager().retry(job)
+    except Exception as e:
+        print(f"❌ Failed to retry job {job_id}: {str(e)}")
+        return jsonify({'error': f'Failed to queue retry: {str(e)}'}), 503
+
+    return jsonify({
+        'job_id': retry.job_id,
+        'status': retry.status,
+        'retry_of': job.job_id,
+        **_job_links(retry.job_id)
+    }), 202
+
+
+@optimizer_bp.route('/jobs/<job_id>/cancel', methods=['POST'])
+@login_required
+def cancel_job(job_id):
+    """
+    Cancel a queued or running optimization job.
+
+    Clients call this when the user leaves the page (navigator.sendBeacon),
+    so outstanding LLM work stops instead of finishing for nobody.
+    Cancelling a finished job is a no-op.
+    """
+    job = _get_user_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
+
+    try:
+        job = get_job_manager().cancel(job)
+    except Exception as e:
+        print(f"❌ Failed to cancel job {job_id}: {str(e)}")
+        return jsonify({'error': f'Failed to cancel job: {str(e)}'}), 503
+
+    return jsonify({'job_id': job.job_id, 'status': job.status}), 202
+
+
+@optimizer_bp.route('/jobs/<job_id>/events', methods=['GET'])
+@login_required
+def job_events(job_id):
+    """
+    Server-Sent Events stream of a job's progress.
+
+    Emits 'stage' events (extract, normalize, analyze, persist), 'batch_item'
+    events (one per job description of a batch job) and 'status' events
+    (queued, running, completed, failed, cancelled). The stream ends after the
+    final status or OPTIMIZER_EVENTS_MAX_SECONDS (kept short, since the
+    stream holds a web worker thread); EventSource reconnects with
+    Last-Event-ID and missed events are replayed.
+    """
+    job = _get_user_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
+
+    manager = get_job_manager()
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    max_seconds = float(current_app.config.get('OPTIMIZER_EVENTS_MAX_SECONDS', 30))
+    heartbeat_seconds = float(current_app.config.get('OPTIMIZER_EVENTS_HEARTBEAT_SECONDS', 15))
+
+    def sse(event_id, event):
+        if event.get('type') == 'status' and event.get('status') == JOB_COMPLETED and event.get('result'):
+            if job.kind == JOB_KIND_BATCH:
+                _with_results_urls(event['result'])
+            else:
+                event['results_url'] = url_for('optimizer.show_results', result_id=event['result'].get('result_id'))
+        elif event.get('type') == 'batch_item':
+            _with_results_urls(event)
+        return f"id: {event_id}\nevent: {event.get('type', 'message')}\ndata: {json.dumps(event, default=str)}\n\n"
+
+    def generate():
+        cursor = last_event_id
+        deadline = time.time() + max_seconds
+        yield "retry: 3000\n\n"
+
+        # Events may have expired (or been published elsewhere) for a finished job
+        if job.is_finished and not manager.read_events(job_id, None, 0.01):
+            yield sse('final', {'type': 'status', 'status': job.status, 'result': job.result, 'error': job.error})
+            return
+
+        while time.time() < deadline:
+            try:
+                events = manager.read_events(job_id, cursor, min(heartbeat_seconds, max(0.1, deadline - time.time())))
+            except Exception as e:
+                print(f"❌ Progress stream read failed for {job_id}: {str(e)}")
+                return
+
+            if not events:
+                yield ": keep-alive\n\n"
+                continue
+
+            for event_id, event in events:
+                cursor = event_id
+                yield sse(event_id, event)
+                if event.get('type') == 'status' and event.get('status') in FINISHED_STATUSES:
+                    return
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 @optimizer_bp.route('/status', methods=['GET']) 
 def optimization_status():
     """
@@ -164,7 +551,11 @@ def optimization_status():
             'timestamp': time.time(),
             'provider_status': provider_test,
             'rate_limit_per_hour': current_app.config.get('RATE_LIMIT_PER_HOUR', 10),
-            'max_file_size_mb': current_app.config.get('MAX_RESUME_SIZE_MB', 5)
+            'rate_limit_provider_per_minute': current_app.config.get('RATE_LIMIT_PROVIDER_PER_MINUTE', 60),
+            'max_file_size_mb': current_app.config.get('MAX_RESUME_SIZE_MB', 5),
+            'job_queue': get_job_manager().get_stats(),
+            'single_flight': get_single_flight().get_stats(),
+            'embedding_batcher': get_embedding_batcher_stats() if provider_test['status'] == 'success' else None
         }
         
         return jsonify(status_data), 200
@@ -1,14 +1,30 @@
+import base64
 from typing import List, Dict, Optional,  Any
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, model_validator, field_validator, field_serializer
 
 
 
 class ResumeInput(BaseModel):
-    """Input for resume optimization - text, DOCX, or PDF file."""
+    """Input for resume optimization - text, DOCX, or PDF file (URL/path or uploaded bytes)."""
     
     text: Optional[str] = Field(None, description="Raw resume text")
     docx_url: Optional[str] = Field(None, description="URL or path to DOCX file")
     pdf_url: Optional[str] = Field(None, description="URL or path to PDF file")
+    file_bytes: Optional[bytes] = Field(None, repr=False, description="Uploaded PDF/DOCX content (base64 in JSON)")
+    file_type: Optional[str] = Field(None, description="'pdf' or 'docx' for file_bytes")
+    filename: Optional[str] = Field(None, description="Original upload file name")
+
+    @field_validator('file_bytes', mode='before')
+    @classmethod
+    def decode_file_bytes(cls, value):
+        """Accept base64 strings (queued job payloads) as well as raw bytes."""
+        if isinstance(value, str):
+            return base64.b64decode(value)
+        return value
+
+    @field_serializer('file_bytes', when_used='json-unless-none')
+    def encode_file_bytes(self, value: bytes) -> str:
+        return base64.b64encode(value).decode('ascii')
 
     @model_validator(mode='after')
     def validate_input(self):
@@ -16,12 +32,14 @@ class ResumeInput(BaseModel):
         text = self.text
         docx_url = self.docx_url
         pdf_url = self.pdf_url
-        provided = [inp for inp in [text, docx_url, pdf_url] if inp is not None]
+        provided = [inp for inp in [text, docx_url, pdf_url, self.file_bytes] if inp is not None]
         
         if len(provided) == 0:
-                raise ValueError("One of 'text', 'docx_url', or 'pdf_url' must be provided")
+                raise ValueError("One of 'text', 'docx_url', 'pdf_url' or 'file_bytes' must be provided")
         elif len(provided) > 1:
                 raise ValueError("Only one input method should be provided")
+        if self.file_bytes is not None and self.file_type not in ('pdf', 'docx'):
+                raise ValueError("file_type must be 'pdf' or 'docx' when file_bytes is provided")
             
         return self
     
@@ -34,6 +52,8 @@ class ResumeInput(BaseModel):
             return "docx"
         elif self.pdf_url:
             return "pdf"
+        elif self.file_bytes is not None:
+            return self.file_type
         return "unknown"
     
     class Config:
@@ -0,0 +1,113 @@
+"""
+Compare the streaming OOXML DOCX extractor against mammoth.
+
+Usage:
+    python scripts/benchmark_docx_extraction.py --corpus DIR [--repeat N]
+                                                [--min-parity R]
+
+Extracts every .docx under DIR with mammoth.extract_raw_text and with
+extract_docx_ooxml, reports the per-file median time of each and the
+speed-up, and checks output parity as the difflib ratio of the two word
+sequences (bullet and table-cell markers ignored). Fails if any file's
+parity is below --min-parity or the OOXML extractor is not faster overall.
+"""
+
+import io
+import os
+import sys
+import time
+import difflib
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import mammoth
+
+from services.resume.extraction import LIST_BULLET, TABLE_CELL_SEPARATOR, extract_docx_ooxml
+
+MARKERS = {LIST_BULLET.strip(), TABLE_CELL_SEPARATOR.strip()}
+
+
+def extract_mammoth(data: bytes) -> str:
+    return mammoth.extract_raw_text(io.BytesIO(data)).value
+
+
+def median_ms(extract, data: bytes, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract(data)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def parity(expected: str, actual: str) -> float:
+    """Similarity of the two word sequences (1.0 = same words in the same order)."""
+    expected_words = [word for word in expected.split() if word not in MARKERS]
+    actual_words = [word for word in actual.split() if word not in MARKERS]
+    if not expected_words and not actual_words:
+        return 1.0
+    return difflib.SequenceMatcher(None, expected_words, actual_words, autojunk=False).ratio()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DOCX text extraction")
+    parser.add_argument('--corpus', required=True, help="Directory of .docx resumes (searched recursively)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-parity', type=float, default=0.98)
+    args = parser.parse_args()
+
+    paths = sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(args.corpus)
+        for name in names
+        if name.lower().endswith('.docx') and not name.startswith('~$')
+    )
+    if not paths:
+        print(f"❌ No .docx files found in {args.corpus}")
+        sys.exit(1)
+
+    total_mammoth = total_ooxml = 0.0
+    failed = False
+    for path in paths:
+        with open(path, 'rb') as f:
+            data = f.read()
+        name = os.path.relpath(path, args.corpus)
+
+        try:
+            expected = extract_mammoth(data)
+        except Exception as e:
+            print(f"⚠️  {name}: mammoth failed ({e}), skipped")
+            continue
+        try:
+            actual = extract_docx_ooxml(data)
+        except Exception as e:
+            actual = ''
+            print(f"⚠️  {name}: OOXML extractor failed ({e}); production falls back to mammoth")
+
+        mammoth_ms = median_ms(extract_mammoth, data, args.repeat)
+        ooxml_ms = median_ms(extract_docx_ooxml, data, args.repeat) if actual else mammoth_ms
+        total_mammoth += mammoth_ms
+        total_ooxml += ooxml_ms
+
+        score = parity(expected, actual) if actual else 1.0
+        ok = score >= args.min_parity
+        failed |= not ok
+        print(
+            f"{'✅' if ok else '❌'} {name:<40} mammoth {mammoth_ms:8.2f} ms  ooxml {ooxml_ms:8.2f} ms  "
+            f"x{mammoth_ms / max(ooxml_ms, 1e-6):5.1f}  parity {score:.3f}"
+        )
+
+    speedup = total_mammoth / max(total_ooxml, 1e-6)
+    faster = speedup > 1.0
+    failed |= not faster
+    print(
+        f"{'✅' if faster else '❌'} total  mammoth {total_mammoth:.1f} ms  ooxml {total_ooxml:.1f} ms  "
+        f"speed-up x{speedup:.1f} over {len(paths)} files"
+    )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
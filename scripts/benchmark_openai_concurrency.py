@@ -0,0 +1,98 @@
+"""
+Check that concurrent OpenAI provider calls run in parallel.
+
+Usage:
+    python scripts/benchmark_openai_concurrency.py [--calls N] [--latency-ms MS]
+                                                   [--max-connections N]
+
+Serves the OpenAI API from an httpx.MockTransport that answers every
+request after --latency-ms, then times one embed() and one chat() call
+against N of each issued concurrently through the shared client pool.
+Fails if N parallel calls take more than 2x a single call.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+import httpx
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from providers.openai_provider import OpenAIClientPool, OpenAIEmbedder, OpenAIChatModel
+
+MAX_SLOWDOWN = 2.0
+
+
+def mock_transport(latency: float) -> httpx.MockTransport:
+    """OpenAI-shaped responses after a fixed delay."""
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        if request.url.path.endswith('/embeddings'):
+            return httpx.Response(200, json={
+                'object': 'list',
+                'data': [{'object': 'embedding', 'index': 0, 'embedding': [0.1, 0.2, 0.3]}],
+                'model': 'text-embedding-3-small',
+                'usage': {'prompt_tokens': 2, 'total_tokens': 2}
+            })
+        return httpx.Response(200, json={
+            'id': 'chatcmpl-bench',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': 'gpt-4o-mini',
+            'choices': [{'index': 0, 'finish_reason': 'stop', 'message': {'role': 'assistant', 'content': 'ok'}}],
+            'usage': {'prompt_tokens': 2, 'completion_tokens': 1, 'total_tokens': 3}
+        })
+    return httpx.MockTransport(handler)
+
+
+async def timed(make_call, calls: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*[make_call() for _ in range(calls)])
+    return time.perf_counter() - start
+
+
+async def run(args) -> bool:
+    clients = OpenAIClientPool(
+        'sk-benchmark',
+        max_connections=args.max_connections,
+        max_keepalive_connections=args.max_connections,
+        transport=mock_transport(args.latency_ms / 1000)
+    )
+    embedder = OpenAIEmbedder('text-embedding-3-small', clients)
+    chat_model = OpenAIChatModel('gpt-4o-mini', clients)
+    calls = {
+        'embed': lambda: embedder.embed(['benchmark text']),
+        'chat': lambda: chat_model.chat([{'role': 'user', 'content': 'ping'}], max_tokens=5),
+    }
+
+    passed = True
+    for name, make_call in calls.items():
+        await timed(make_call, 1)  # warm up (client creation)
+        single = await timed(make_call, 1)
+        parallel = await timed(make_call, args.calls)
+        ok = parallel <= single * MAX_SLOWDOWN
+        passed &= ok
+        print(
+            f"{'✅' if ok else '❌'} {name:<5} 1 call {single * 1000:7.1f} ms  "
+            f"{args.calls} parallel calls {parallel * 1000:7.1f} ms  (x{parallel / single:.2f})"
+        )
+
+    await clients.client().close()
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OpenAI provider concurrency")
+    parser.add_argument('--calls', type=int, default=50)
+    parser.add_argument('--latency-ms', type=float, default=200)
+    parser.add_argument('--max-connections', type=int, default=100)
+    args = parser.parse_args()
+
+    sys.exit(0 if asyncio.run(run(args)) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Measure the per-request overhead of the optimization rate limiter.
+
+Usage:
+    python scripts/benchmark_rate_limiter.py [--requests N] [--users N]
+                                             [--redis-url URL]
+
+Runs RateLimiter.acquire() (one per-user and one per-provider bucket, as on
+the optimize endpoints) against the in-process backend and, when
+--redis-url is given, against Redis. Fails if p99 is 1 ms or more.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.rate_limiter import RateLimiter
+
+TARGET_MS = 1.0
+
+
+def run(limiter: RateLimiter, requests: int, users: int) -> dict:
+    """Time `requests` acquire() calls spread over `users` users."""
+    timings = []
+    allowed = 0
+    for _ in range(requests):
+        user_id = random.randrange(users)
+        start = time.perf_counter()
+        result = limiter.acquire(user_id, 'openai')
+        timings.append((time.perf_counter() - start) * 1000)
+        allowed += result.allowed
+
+    timings.sort()
+    return {
+        'p50': timings[len(timings) // 2],
+        'p99': timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+        'max': timings[-1],
+        'allowed': allowed
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the optimization rate limiter")
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--redis-url', help="Also benchmark the Redis backend")
+    args = parser.parse_args()
+
+    backends = [('memory', RateLimiter(client=None, user_per_hour=10, provider_per_minute=10 ** 6))]
+    if args.redis_url:
+        import redis
+        client = redis.Redis.from_url(args.redis_url, decode_responses=True)
+        client.ping()
+        backends.append(('redis', RateLimiter(client=client, user_per_hour=10, provider_per_minute=10 ** 6)))
+
+    failed = False
+    for name, limiter in backends:
+        run(limiter, min(1000, args.requests), args.users)  # warm up (script load, connections)
+        stats = run(limiter, args.requests, args.users)
+        ok = stats['p99'] < TARGET_MS
+        failed |= not ok
+        print(
+            f"{'✅' if ok else '❌'} {name:<6} p50 {stats['p50']:.3f} ms  p99 {stats['p99']:.3f} ms  "
+            f"max {stats['max']:.3f} ms  ({stats['allowed']}/{args.requests} allowed)"
+        )
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Load-test the optimization pipeline against recorded LLM calls.
+
+Usage:
+    python scripts/load_test_replay.py RESUME_FILE JD_FILE [--requests N]
+                                       [--concurrency N] [--latency SPEC]
+                                       [--store PATH] [--record]
+                                       [--user-id ID] [--seed N]
+
+With --record, one pipeline run is made against REPLAY_UPSTREAM_PROVIDER
+(default openai) and every embedding/chat call is saved to the store.
+Otherwise the pipeline runs N times, --concurrency at a time, with
+MODEL_PROVIDER=replay serving the recordings after --latency (see
+REPLAY_LATENCY). Each run appends a distinct marker line to the resume so
+result caching and request coalescing do not short-circuit it. Prompts
+that then differ from the recording are answered from a recording of the
+same prompt template. Reports throughput, latency percentiles, mean stage
+timings and embedding batch fill.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the pipeline with replayed LLM calls")
+    parser.add_argument('resume_file', help="Resume as .txt, .pdf or .docx")
+    parser.add_argument('jd_file', help="Text file containing the job description")
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--latency', default='recorded', help="REPLAY_LATENCY spec, e.g. 'lognormal:1500,0.4'")
+    parser.add_argument('--store', default='replay/llm_calls.jsonl')
+    parser.add_argument('--record', action='store_true', help="Record one real run instead of load testing")
+    parser.add_argument('--user-id', type=int, default=1, help="Existing user that owns the saved results")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    # Config is read from the environment at import time
+    os.environ['MODEL_PROVIDER'] = 'replay'
+    os.environ['REPLAY_MODE'] = 'record' if args.record else 'replay'
+    os.environ['REPLAY_STORE_PATH'] = args.store
+    os.environ['REPLAY_LATENCY'] = args.latency
+    os.environ['REPLAY_SEED'] = str(args.seed)
+    os.environ['REPLAY_ON_MISS'] = 'error' if args.record else 'similar'
+
+    from app import app
+    from schemas import ResumeInput, JDInput, OptimizationOptions
+    from services import ResumeOptimizationPipeline
+    from services.resume.extraction import extract_text_from_file_bytes
+    from providers import get_embedding_batcher_stats
+    from utils import run_sync
+
+    app.config.update(RESULT_CACHE_ENABLED=False, SINGLE_FLIGHT_ENABLED=False, PIPELINE_CHECKPOINTS_ENABLED=False)
+
+    with open(args.resume_file, 'rb') as f:
+        resume_text = extract_text_from_file_bytes(args.resume_file, f.read())
+    with open(args.jd_file, 'r', encoding='utf-8') as f:
+        jd_input = JDInput(text=f.read())
+
+    requests = 1 if args.record else args.requests
+    pipeline = ResumeOptimizationPipeline()
+
+    async def one_run(index: int, semaphore: asyncio.Semaphore):
+        text = resume_text if args.record else f"{resume_text}\nLoad test run {index}"
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result = await pipeline._run_optimization_pipeline(
+                    ResumeInput(text=text), jd_input, OptimizationOptions(), user_id=args.user_id
+                )
+                return time.perf_counter() - start, result.get('stage_timings_ms', {}), None
+            except Exception as e:
+                return time.perf_counter() - start, {}, f"{type(e).__name__}: {e}"
+
+    async def run_all():
+        semaphore = asyncio.Semaphore(max(1, args.concurrency))
+        return await asyncio.gather(*[one_run(i, semaphore) for i in range(requests)])
+
+    with app.app_context():
+        start = time.perf_counter()
+        results = run_sync(run_all())
+        elapsed = time.perf_counter() - start
+        batcher = get_embedding_batcher_stats()
+
+    latencies = [seconds for seconds, _, error in results if error is None]
+    errors = [error for _, _, error in results if error is not None]
+    for error in sorted(set(errors))[:5]:
+        print(f"❌ {errors.count(error)}x {error}")
+
+    if args.record:
+        ok = not errors
+        print(f"{'✅' if ok else '❌'} Recorded one run in {elapsed:.1f}s to {args.store}")
+        sys.exit(0 if ok else 1)
+
+    if not latencies:
+        print("❌ Every run failed")
+        sys.exit(1)
+
+    print(
+        f"{'✅' if not errors else '❌'} {len(latencies)}/{requests} runs in {elapsed:.1f}s "
+        f"({len(latencies) / elapsed:.2f} runs/s, concurrency {args.concurrency}, latency '{args.latency}')"
+    )
+    print(
+        f"   p50 {percentile(latencies, 0.5) * 1000:.0f} ms  p95 {percentile(latencies, 0.95) * 1000:.0f} ms  "
+        f"max {max(latencies) * 1000:.0f} ms"
+    )
+
+    stages = {}
+    for _, timings, error in results:
+        for stage, ms in timings.items():
+            stages.setdefault(stage, []).append(ms)
+    if stages:
+        print("   mean stage ms: " + ', '.join(f"{stage} {statistics.mean(values):.0f}" for stage, values in stages.items()))
+    if batcher:
+        print(f"   embedding batches: {batcher['batches']}  avg fill {batcher['avg_batch_fill']:.2f}")
+
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Rank a directory or zip of resumes against one job description.
+
+Usage:
+    python scripts/rank_resumes.py JD_FILE RESUMES_PATH [--top N] [--workers N]
+                                   [--embeddings] [--json OUTPUT]
+
+Scoring is deterministic (keywords, skill coverage, TransparentScoring);
+--embeddings adds embedding similarity using the configured provider.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.resume.ranking import ResumeRanker, iter_resume_source
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank resumes against a job description")
+    parser.add_argument('jd_file', help="Text file containing the job description")
+    parser.add_argument('resumes', help="Directory or zip archive of PDF/DOCX/TXT resumes")
+    parser.add_argument('--top', type=int, default=20, help="Number of results to print")
+    parser.add_argument('--workers', type=int, default=None, help="Extraction processes (default: CPU count)")
+    parser.add_argument('--embeddings', action='store_true', help="Include embedding similarity")
+    parser.add_argument('--json', dest='json_output', help="Write the full ranking to this JSON file")
+    args = parser.parse_args()
+
+    with open(args.jd_file, 'r', encoding='utf-8') as f:
+        jd_text = f.read()
+
+    start_time = time.time()
+    files = list(iter_resume_source(args.resumes))
+    ranker = ResumeRanker(jd_text, use_embeddings=args.embeddings, max_workers=args.workers)
+
+    if args.embeddings:
+        from app import app
+        with app.app_context():
+            ranked = ranker.rank(files)
+    else:
+        ranked = ranker.rank(files)
+
+    elapsed = time.time() - start_time
+    rate = len(files) / elapsed * 60 if elapsed > 0 else 0.0
+
+    print(f"\n🏆 Top {min(args.top, len(ranked))} of {len(files)} resumes")
+    for result in ranked[:args.top]:
+        if result.get('error'):
+            print(f"   -  {result['filename']}: {result['error']}")
+            continue
+        print(
+            f"  {result['rank']:>3}. {result['overall_score']:.3f} ({result['letter_grade']:<2})  "
+            f"{result['filename']}  missing: {', '.join(result['critical_missing'][:5]) or '-'}"
+        )
+
+    failed = sum(1 for r in ranked if r.get('error'))
+    print(f"\n⏱️  {elapsed:.1f}s ({rate:.0f} resumes/min), {failed} failed to parse")
+
+    if args.json_output:
+        with open(args.json_output, 'w', encoding='utf-8') as f:
+            json.dump(ranked, f, indent=2)
+        print(f"💾 Full ranking written to {args.json_output}")
+
+
+if __name__ == '__main__':
+    main()
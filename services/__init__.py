@@ -4,6 +4,6 @@ Contains business logic separated from routes and models.
 """
 
 from .resume import (ResumeOptimizationPipeline,
-create_docx_sync, create_pdf_sync,get_enhanced_cache)
+create_docx_sync, create_pdf_sync,get_enhanced_cache,get_job_manager)
 __all__ = ["ResumeOptimizationPipeline",
-"create_docx_sync", "create_pdf_sync","get_enhanced_cache"]
\ No newline at end of file
+"create_docx_sync", "create_pdf_sync","get_enhanced_cache","get_job_manager"]
\ No newline at end of file
@@ -0,0 +1,297 @@
+"""
+Token-bucket rate limiting for the optimization endpoints.
+Each request draws from a per-user bucket (RATE_LIMIT_PER_HOUR) and a
+global per-provider bucket (RATE_LIMIT_PROVIDER_PER_MINUTE) in one atomic
+Redis Lua call shared by every gunicorn worker, with an in-process fallback
+when Redis is unavailable.
+"""
+
+import time
+import math
+import threading
+from dataclasses import dataclass
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from flask import current_app, jsonify, make_response
+
+# Redis imports with fallback
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+# Checks every bucket and only spends tokens when all of them allow the
+# request, so a request rejected by the global bucket does not cost the
+# user a token. A cost above a bucket's capacity needs (and drains) a full
+# bucket, so large batches are slowed down rather than rejected forever.
+# KEYS: bucket keys. ARGV: now, cost, then capacity and refill rate
+# (tokens/second) for each key.
+# Returns {allowed, index of the limiting bucket (1-based, 0 if allowed),
+#          retry after (ms), remaining tokens in that bucket}
+TOKEN_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local tokens, needs = {}, {}
+local limiting, retry_ms = 0, 0
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[1 + i * 2])
+    local rate = tonumber(ARGV[2 + i * 2])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local level = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    level = math.min(capacity, level + math.max(0, now - ts) * rate)
+    tokens[i] = level
+    needs[i] = math.min(cost, capacity)
+    if level < needs[i] then
+        local wait = math.ceil((needs[i] - level) / rate * 1000)
+        if wait > retry_ms then
+            limiting, retry_ms = i, wait
+        end
+    end
+end
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[1 + i * 2])
+    local rate = tonumber(ARGV[2 + i * 2])
+    if limiting == 0 then
+        tokens[i] = tokens[i] - needs[i]
+    end
+    redis.call('HSET', key, 'tokens', tostring(tokens[i]), 'ts', tostring(now))
+    redis.call('PEXPIRE', key, math.ceil(capacity / rate * 1000) + 1000)
+end
+
+if limiting == 0 then
+    return {1, 0, 0, tostring(tokens[1])}
+end
+return {0, limiting, retry_ms, tostring(tokens[limiting])}
+"""
+
+
+@dataclass
+class Bucket:
+    """One token bucket: `capacity` tokens, refilled at `rate` tokens/second."""
+    key: str
+    scope: str
+    capacity: float
+    rate: float
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    scope: Optional[str] = None  # Bucket that rejected the request
+    limit: Optional[float] = None
+    remaining: float = 0.0
+    retry_after: float = 0.0  # Seconds until the request would be allowed
+
+
+class InMemoryTokenBuckets:
+    """Process-local buckets used when Redis is unavailable."""
+
+    def __init__(self, max_buckets: int = 10000):
+        self.max_buckets = max_buckets
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # key -> (tokens, ts)
+        self._lock = threading.Lock()
+
+    def acquire(self, buckets: List[Bucket], cost: float, now: float) -> RateLimitResult:
+        with self._lock:
+            levels = []
+            limiting, retry_after = None, 0.0
+            for bucket in buckets:
+                tokens, ts = self._buckets.get(bucket.key, (bucket.capacity, now))
+                level = min(bucket.capacity, tokens + max(0.0, now - ts) * bucket.rate)
+                levels.append(level)
+                if level < min(cost, bucket.capacity):
+                    wait = (min(cost, bucket.capacity) - level) / bucket.rate
+                    if wait > retry_after:
+                        limiting, retry_after = bucket, wait
+
+            for bucket, level in zip(buckets, levels):
+                spent = min(cost, bucket.capacity) if limiting is None else 0.0
+                self._buckets[bucket.key] = (level - spent, now)
+
+            if len(self._buckets) > self.max_buckets:
+                self._evict_full(buckets, now)
+
+        if limiting is None:
+            return RateLimitResult(allowed=True, remaining=levels[0] - min(cost, buckets[0].capacity))
+        return RateLimitResult(
+            allowed=False,
+            scope=limiting.scope,
+            limit=limiting.capacity,
+            remaining=levels[buckets.index(limiting)],
+            retry_after=retry_after
+        )
+
+    def _evict_full(self, buckets: List[Bucket], now: float) -> None:
+        """Drop buckets idle long enough to have refilled (they restart full anyway)."""
+        max_refill = max(b.capacity / b.rate for b in buckets)
+        idle = [key for key, (_, ts) in self._buckets.items() if now - ts > max_refill]
+        for key in idle:
+            del self._buckets[key]
+
+
+class RateLimiter:
+    """Per-user and per-provider token buckets."""
+
+    KEY_PREFIX = 'ratelimit:'
+
+    def __init__(
+        self,
+        client=None,
+        user_per_hour: int = 10,
+        provider_per_minute: int = 60,
+        enabled: bool = True
+    ):
+        self.client = client
+        self.user_per_hour = user_per_hour
+        self.provider_per_minute = provider_per_minute
+        self.enabled = enabled
+        self.memory = InMemoryTokenBuckets()
+        self._script = client.register_script(TOKEN_BUCKET_SCRIPT) if client is not None else None
+        self.backend = 'redis' if client is not None else 'memory'
+
+    def buckets_for(self, user_id, provider: str) -> List[Bucket]:
+        buckets = []
+        if self.user_per_hour > 0:
+            buckets.append(Bucket(
+                key=f"{self.KEY_PREFIX}user:{user_id}",
+                scope='user',
+                capacity=float(self.user_per_hour),
+                rate=self.user_per_hour / 3600.0
+            ))
+        if self.provider_per_minute > 0:
+            buckets.append(Bucket(
+                key=f"{self.KEY_PREFIX}provider:{provider}",
+                scope='provider',
+                capacity=float(self.provider_per_minute),
+                rate=self.provider_per_minute / 60.0
+            ))
+        return buckets
+
+    def acquire(self, user_id, provider: str, cost: float = 1) -> RateLimitResult:
+        """
+        Take `cost` tokens from the user's and the provider's buckets.
+
+        Args:
+            user_id: Requesting user
+            provider: MODEL_PROVIDER the request will use
+            cost: Tokens to spend (e.g. number of LLM optimizations)
+
+        Returns:
+            RateLimitResult; nothing is spent when allowed is False
+        """
+        buckets = self.buckets_for(user_id, provider)
+        if not self.enabled or not buckets:
+            return RateLimitResult(allowed=True)
+
+        now = time.time()
+        if self._script is not None:
+            try:
+                return self._acquire_redis(buckets, cost, now)
+            except Exception as e:
+                print(f"⚠️  Redis rate limiter unavailable, using in-process buckets: {str(e)}")
+        return self.memory.acquire(buckets, cost, now)
+
+    def _acquire_redis(self, buckets: List[Bucket], cost: float, now: float) -> RateLimitResult:
+        args = [now, cost]
+        for bucket in buckets:
+            args.extend([bucket.capacity, bucket.rate])
+        allowed, limiting, retry_ms, remaining = self._script(keys=[b.key for b in buckets], args=args)
+
+        if allowed:
+            return RateLimitResult(allowed=True, remaining=float(remaining))
+        bucket = buckets[int(limiting) - 1]
+        return RateLimitResult(
+            allowed=False,
+            scope=bucket.scope,
+            limit=bucket.capacity,
+            remaining=float(remaining),
+            retry_after=int(retry_ms) / 1000.0
+        )
+
+
+def rate_limited(cost: Union[int, Callable[[], int]] = 1):
+    """
+    Decorator enforcing the optimization rate limits on a route.
+
+    Apply below @login_required. Rejected requests get 429 with a
+    Retry-After header.
+
+    Args:
+        cost: Tokens per request, or a callable computing them from the
+            current request (e.g. the number of job descriptions in a batch)
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            from flask_login import current_user
+
+            request_cost = cost() if callable(cost) else cost
+            result = get_rate_limiter().acquire(
+                current_user.id,
+                current_app.config.get('MODEL_PROVIDER', 'hf').lower(),
+                max(1, request_cost)
+            )
+            if result.allowed:
+                return view(*args, **kwargs)
+
+            retry_after = max(1, math.ceil(result.retry_after))
+            print(f"🚦 Rate limited user {current_user.id} ({result.scope}), retry in {retry_after}s")
+            message = (
+                'You have reached your optimization limit. Please try again later.'
+                if result.scope == 'user'
+                else 'The optimization service is busy. Please try again shortly.'
+            )
+            response = make_response(jsonify({
+                'error': 'Rate Limit Exceeded',
+                'message': message,
+                'scope': result.scope,
+                'status_code': 429,
+                'retry_after': retry_after
+            }), 429)
+            response.headers['Retry-After'] = str(retry_after)
+            response.headers['X-RateLimit-Limit'] = str(int(result.limit))
+            response.headers['X-RateLimit-Remaining'] = str(max(0, int(result.remaining)))
+            return response
+        return wrapper
+    return decorator
+
+
+# Global rate limiter instance
+_rate_limiter = None
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter, configured from the current app."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(
+            client=_connect_redis(),
+            user_per_hour=int(current_app.config.get('RATE_LIMIT_PER_HOUR', 10)),
+            provider_per_minute=int(current_app.config.get('RATE_LIMIT_PROVIDER_PER_MINUTE', 60)),
+            enabled=current_app.config.get('RATE_LIMIT_ENABLED', True)
+        )
+        print(f"🚦 Rate limiter initialized: {_rate_limiter.backend}")
+    return _rate_limiter
+
+
+def _connect_redis():
+    """Sync Redis client for the limiter, or None to use in-process buckets."""
+    if not REDIS_AVAILABLE:
+        return None
+    try:
+        client = redis.Redis.from_url(
+            current_app.config.get('REDIS_URL', 'redis://localhost:6379/0'),
+            decode_responses=True,
+            socket_connect_timeout=2.0,
+            socket_timeout=1.0
+        )
+        client.ping()
+        return client
+    except Exception as e:
+        print(f"⚠️  Redis rate limiter unavailable, using in-process buckets: {str(e)}")
+        return None
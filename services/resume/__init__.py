@@ -6,7 +6,8 @@ Handles AI-powered resume analysis, rewriting, and optimization.
 from .resume_optimization_pipeline import ResumeOptimizationPipeline
 from .formatting import create_docx_sync, create_pdf_sync
 from .cache import get_enhanced_cache
+from .jobs import get_job_manager
 __all__ = [
 "ResumeOptimizationPipeline",
-"create_docx_sync", "create_pdf_sync","get_enhanced_cache"
+"create_docx_sync", "create_pdf_sync","get_enhanced_cache","get_job_manager"
 ]
\ No newline at end of file
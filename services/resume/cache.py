@@ -21,6 +21,8 @@ except ImportError:
     print("Warning: redis not installed. Using in-memory cache fallback.")
 
 from schemas import OptimizedResume, GapReport, OptimizationResult
+from utils import run_sync
+from utils.deadline import set_current_deadline
 
 
 class CacheKeyGenerator:
@@ -74,6 +76,12 @@ class CacheKeyGenerator:
         model_hash = hashlib.md5(model_name.encode('utf-8')).hexdigest()[:8]
         return f"chunks:{model_hash}:{chunks_hash}"
     
+    @staticmethod
+    def normalization_key(raw_text: str, prompt_version: str, model_name: str) -> str:
+        """Generate content-addressed cache key for a normalized (LLM-parsed) resume."""
+        hash_input = "|".join([raw_text.strip(), prompt_version, model_name])
+        return f"normalized:{hashlib.sha256(hash_input.encode('utf-8')).hexdigest()[:24]}"
+    
     @staticmethod
     def gap_analysis_key(resume_hash: str, jd_hash: str) -> str:
         """Generate cache key for gap analysis."""
@@ -278,7 +286,8 @@ class ResumeCache:
         result: Dict[str, Any],
         options: Dict[str, Any] = None,
         model_info: Dict[str, str] = None,
-        ttl: Optional[int] = None
+        ttl: Optional[int] = None,
+        stale_ttl: int = 0
     ) -> bool:
         """
         Cache optimization result.
@@ -290,22 +299,26 @@ class ResumeCache:
             options: Optimization options
             model_info: Model information
             ttl: Cache TTL in seconds
+            stale_ttl: Extra seconds the entry is kept after ttl so it can
+                be served stale while it is refreshed
             
         Returns:
             True if cached successfully
         """
         
         cache_key = CacheKeyGenerator.request_key(resume_text, jd_text, options, model_info)
+        ttl = ttl or 24 * 60 * 60
         
         # Add cache metadata
         cache_data = result.copy()
         cache_data.update({
             'cached_at': datetime.now().isoformat(),
+            'cached_at_ts': time.time(),
             'cache_key': cache_key,
-            'ttl': ttl or 24 * 60 * 60
+            'ttl': ttl
         })
         
-        success = await self.cache.set(cache_key, cache_data, ttl)
+        success = await self.cache.set(cache_key, cache_data, ttl + stale_ttl)
         
         if success:
             print(f"💾 Result cached: {cache_key}")
@@ -406,8 +419,9 @@ class ResumeCache:
 class CacheManager:
     """High-level cache management for the resume optimization pipeline."""
     
-    def __init__(self):
-        self.cache = ResumeCache()
+    def __init__(self, cache: Optional[ResumeCache] = None):
+        self.cache = cache or ResumeCache()
+        self._refreshing = set()  # cache keys with a background refresh running
     
     async def get_or_process(
         self,
@@ -415,6 +429,7 @@ class CacheManager:
         processor_func,
         *processor_args,
         ttl: Optional[int] = None,
+        stale_while_revalidate: int = 0,
         **processor_kwargs
     ) -> Tuple[Any, bool]:
         """
@@ -425,6 +440,8 @@ class CacheManager:
             processor_func: Function to call if not in cache
             *processor_args: Arguments for processor function
             ttl: Cache TTL
+            stale_while_revalidate: Seconds past ttl during which an expired
+                entry is still returned while a background refresh runs
             **processor_kwargs: Keyword arguments for processor function
             
         Returns:
@@ -435,9 +452,70 @@ class CacheManager:
         cached_result = await self.cache.get_cached_result(**cache_key_data)
         
         if cached_result:
-            return cached_result, True
+            age = time.time() - cached_result.get('cached_at_ts', time.time())
+            fresh_for = cached_result.get('ttl') or ttl or 24 * 60 * 60
+            
+            if age <= fresh_for:
+                return cached_result, True
+            
+            if age <= fresh_for + stale_while_revalidate:
+                cached_result['stale'] = True
+                self._schedule_refresh(
+                    cache_key_data, processor_func, processor_args, processor_kwargs,
+                    ttl, stale_while_revalidate
+                )
+                return cached_result, True
+        
+        result = await self._process_and_cache(
+            cache_key_data, processor_func, processor_args, processor_kwargs,
+            ttl, stale_while_revalidate
+        )
+        return result, False
+    
+    def _schedule_refresh(
+        self,
+        cache_key_data: Dict[str, Any],
+        processor_func,
+        processor_args: tuple,
+        processor_kwargs: Dict[str, Any],
+        ttl: Optional[int],
+        stale_while_revalidate: int
+    ):
+        """Recompute a stale entry in the background (at most one refresh per key)."""
+        
+        cache_key = CacheKeyGenerator.request_key(**cache_key_data)
+        if cache_key in self._refreshing:
+            return
+        self._refreshing.add(cache_key)
+        print(f"♻️  Serving stale result, refreshing in background: {cache_key}")
+        
+        async def refresh():
+            # The refresh outlives the request that triggered it, so it is
+            # not bound by that request's deadline (this task has its own context)
+            set_current_deadline(None)
+            try:
+                await self._process_and_cache(
+                    cache_key_data, processor_func, processor_args, processor_kwargs,
+                    ttl, stale_while_revalidate
+                )
+            except Exception as e:
+                print(f"❌ Background cache refresh failed for {cache_key}: {str(e)}")
+            finally:
+                self._refreshing.discard(cache_key)
+        
+        asyncio.get_running_loop().create_task(refresh())
+    
+    async def _process_and_cache(
+        self,
+        cache_key_data: Dict[str, Any],
+        processor_func,
+        processor_args: tuple,
+        processor_kwargs: Dict[str, Any],
+        ttl: Optional[int],
+        stale_while_revalidate: int
+    ) -> Any:
+        """Run the processor and cache its result."""
         
-        # Not in cache - process
         start_time = time.time()
         result = await processor_func(*processor_args, **processor_kwargs)
         processing_time = (time.time() - start_time) * 1000
@@ -451,10 +529,11 @@ class CacheManager:
         await self.cache.cache_result(
             result=result,
             ttl=ttl,
+            stale_ttl=stale_while_revalidate,
             **cache_key_data
         )
         
-        return result, False
+        return result
     
     async def invalidate_related_cache(
         self,
@@ -533,18 +612,17 @@ class CacheWarmer:
 # Sync wrappers
 def get_cached_result_sync(*args, **kwargs) -> Optional[Dict[str, Any]]:
     """Synchronous wrapper for get_cached_result."""
-    cache = ResumeCache()
-    return asyncio.run(cache.get_cached_result(*args, **kwargs))
+    return run_sync(get_cache().get_cached_result(*args, **kwargs))
 
 
 def cache_result_sync(*args, **kwargs) -> bool:
     """Synchronous wrapper for cache_result."""
-    cache = ResumeCache()
-    return asyncio.run(cache.cache_result(*args, **kwargs))
+    return run_sync(get_cache().cache_result(*args, **kwargs))
 
 
 # Global cache instance
 _cache_instance = None
+_cache_manager = None
 
 def get_cache() -> ResumeCache:
     """Get global cache instance."""
@@ -569,6 +647,7 @@ class CacheAnalytics:
             'cache_savings_ms': 0.0,
             'session_start': time.time()
         }
+        self.type_stats: Dict[str, Dict[str, float]] = {}  # data_type -> hits/misses/savings
     
     async def log_cache_operation(
         self,
@@ -601,6 +680,12 @@ class CacheAnalytics:
             self.session_stats['sets'] += 1
         elif operation == 'error':
             self.session_stats['errors'] += 1
+
+        if data_type and operation in ('hit', 'miss'):
+            type_stats = self.type_stats.setdefault(data_type, {'hits': 0, 'misses': 0, 'savings_ms': 0.0})
+            type_stats['hits' if operation == 'hit' else 'misses'] += 1
+            if operation == 'hit':
+                type_stats['savings_ms'] += processing_time_saved
         
         # Calculate current hit rate
         hit_rate = (self.session_stats['hits'] / self.session_stats['total_requests'] * 100) if self.session_stats['total_requests'] > 0 else 0
@@ -658,7 +743,16 @@ class CacheAnalytics:
                 self.session_stats['cache_savings_ms'] / self.session_stats['hits'], 2
             ) if self.session_stats['hits'] > 0 else 0,
             'cache_errors': self.session_stats['errors'],
-            'sets_performed': self.session_stats['sets']
+            'sets_performed': self.session_stats['sets'],
+            'by_data_type': {
+                data_type: {
+                    'hits': stats['hits'],
+                    'misses': stats['misses'],
+                    'hit_rate_percentage': round(stats['hits'] / (stats['hits'] + stats['misses']) * 100, 2),
+                    'time_saved_ms': round(stats['savings_ms'], 2)
+                }
+                for data_type, stats in self.type_stats.items()
+            }
         }
     
     async def generate_cache_report(self) -> Dict[str, Any]:
@@ -783,6 +877,14 @@ def get_enhanced_cache() -> EnhancedResumeCache:
     return _cache_instance
 
 
+def get_cache_manager() -> CacheManager:
+    """Get global cache manager backed by the enhanced cache."""
+    global _cache_manager
+    if _cache_manager is None:
+        _cache_manager = CacheManager(get_enhanced_cache())
+    return _cache_manager
+
+
 # Decorator for automatic caching
 def cache_result(
     data_type: str = 'generic',
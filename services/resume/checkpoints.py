@@ -0,0 +1,61 @@
+"""
+Stage checkpoints for the optimization pipeline.
+Stage outputs (raw text, normalized resume, optimization result) are kept
+under the request hash for a short TTL so a retried request resumes from the
+first stage that has not completed yet.
+"""
+
+import copy
+from typing import Any, Optional
+
+from flask import current_app
+
+from services.resume.cache import get_enhanced_cache
+
+
+CHECKPOINT_STAGES = ('extract', 'normalize', 'optimize')
+
+
+class PipelineCheckpoints:
+    """Reads and writes per-stage checkpoints in the resume cache backend."""
+
+    KEY_PREFIX = 'checkpoint:'
+
+    def __init__(self, cache, ttl: int, enabled: bool = True):
+        self.cache = cache
+        self.ttl = ttl
+        self.enabled = enabled
+
+    def _key(self, request_hash: str, stage: str) -> str:
+        return f"{self.KEY_PREFIX}{request_hash}:{stage}"
+
+    async def load(self, request_hash: Optional[str], stage: str) -> Optional[Any]:
+        """Return the saved output of a stage, or None."""
+        if not self.enabled or not request_hash:
+            return None
+        value = await self.cache.get(self._key(request_hash, stage))
+        if value is not None:
+            print(f"♻️  Resuming from '{stage}' checkpoint: {request_hash[:12]}")
+        return copy.deepcopy(value)  # the in-memory backend hands out the stored object
+
+    async def save(self, request_hash: Optional[str], stage: str, value: Any) -> bool:
+        """Persist the output of a completed stage."""
+        if not self.enabled or not request_hash:
+            return False
+        return await self.cache.set(self._key(request_hash, stage), copy.deepcopy(value), self.ttl)
+
+    async def clear(self, request_hash: Optional[str]) -> None:
+        """Drop all checkpoints once the run has been persisted."""
+        if not self.enabled or not request_hash:
+            return
+        for stage in CHECKPOINT_STAGES:
+            await self.cache.delete(self._key(request_hash, stage))
+
+
+def get_pipeline_checkpoints() -> PipelineCheckpoints:
+    """Checkpoint store configured from the current app."""
+    return PipelineCheckpoints(
+        get_enhanced_cache().cache,
+        ttl=int(current_app.config.get('PIPELINE_CHECKPOINT_TTL', 60 * 60)),
+        enabled=current_app.config.get('PIPELINE_CHECKPOINTS_ENABLED', True)
+    )
@@ -0,0 +1,295 @@
+"""
+Section-aware chunking of normalized resumes for embedding.
+Walks a NormalizedResumeSchema (summary, each work experience, projects,
+skills, education, certifications) and emits DocumentChunks sized for the
+configured embedding model. Items of the same section are packed into as
+few chunks as fit the token budget, so a resume needs the fewest embedding
+inputs; an item too long for one chunk is split on line boundaries with
+overlap, repeating its heading in every piece.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+
+from flask import current_app
+
+from providers import get_embed_model_name
+from schemas import DocumentChunk, NormalizedResumeSchema
+
+# For exact token counts of OpenAI embedding models
+try:
+    import tiktoken
+    TIKTOKEN_SUPPORT = True
+except ImportError:
+    TIKTOKEN_SUPPORT = False
+
+
+# Input window of known embedding models, in tokens
+EMBED_MODEL_MAX_TOKENS = {
+    'text-embedding-3-small': 8191,
+    'text-embedding-3-large': 8191,
+    'text-embedding-ada-002': 8191,
+    'BAAI/bge-large-en-v1.5': 512,
+    'BAAI/bge-base-en-v1.5': 512,
+    'BAAI/bge-small-en-v1.5': 512,
+    'sentence-transformers/all-MiniLM-L6-v2': 256,
+    'sentence-transformers/all-mpnet-base-v2': 384,
+}
+DEFAULT_MODEL_MAX_TOKENS = 512
+
+# Estimated counts can be off by a few percent; keep that much headroom
+ESTIMATE_HEADROOM = 0.9
+
+CHUNK_SEPARATOR = '\n\n'
+
+
+class TokenCounter:
+    """Counts tokens with the model's tiktoken encoding, or estimates them."""
+
+    def __init__(self, model: Optional[str] = None):
+        self.encoding = None
+        if TIKTOKEN_SUPPORT and model:
+            try:
+                self.encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                pass  # not an OpenAI model; its tokenizer is unknown here
+            except Exception as e:
+                # The encoding file is downloaded on first use
+                print(f"⚠️  tiktoken encoding for {model} unavailable, estimating token counts: {str(e)}")
+
+    @property
+    def exact(self) -> bool:
+        return self.encoding is not None
+
+    def count(self, text: str) -> int:
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        # ~4 characters per BPE token; WordPiece vocabularies split resume
+        # jargon more finely, so take whichever estimate is larger
+        return max(math.ceil(len(text) / 4), math.ceil(len(text.split()) * 1.3))
+
+
+@dataclass
+class ResumeItem:
+    """One logical entry of a resume section (a job, a project, the skills list)."""
+    section: str
+    label: str
+    heading: str
+    lines: List[str]
+
+    @property
+    def text(self) -> str:
+        return '\n'.join([self.heading] + self.lines) if self.heading else '\n'.join(self.lines)
+
+
+class ResumeChunker:
+    """Turns a normalized resume into token-budgeted DocumentChunks."""
+
+    def __init__(self, max_tokens: int = 512, overlap_tokens: int = 50, counter: Optional[TokenCounter] = None):
+        self.counter = counter or TokenCounter()
+        budget = max_tokens if self.counter.exact else int(max_tokens * ESTIMATE_HEADROOM)
+        self.max_tokens = max(32, budget)
+        self.overlap_tokens = max(0, min(overlap_tokens, self.max_tokens // 4))
+
+    def chunk_resume(self, resume: Union[NormalizedResumeSchema, Dict[str, Any]]) -> List[DocumentChunk]:
+        """
+        Chunk a normalized resume for embedding.
+
+        Args:
+            resume: NormalizedResumeSchema or its dict dump
+
+        Returns:
+            DocumentChunks in resume order, each within max_tokens
+        """
+        if not isinstance(resume, NormalizedResumeSchema):
+            resume = NormalizedResumeSchema.model_validate(resume)
+
+        chunks: List[DocumentChunk] = []
+        for section_items in _group_by_section(resume_items(resume)):
+            for text, labels, part in self._pack(section_items):
+                metadata: Dict[str, Any] = {'items': labels}
+                if part:
+                    metadata['part'], metadata['parts'] = part
+                chunks.append(DocumentChunk(
+                    text=text,
+                    section=section_items[0].section,
+                    chunk_index=len(chunks),
+                    token_count=self.counter.count(text),
+                    metadata=metadata
+                ))
+        return chunks
+
+    def _pack(self, items: List[ResumeItem]) -> List[tuple]:
+        """Greedily pack one section's items into chunks: (text, labels, (part, parts) or None)."""
+        packed = []
+        texts: List[str] = []
+        labels: List[str] = []
+
+        def flush():
+            if texts:
+                packed.append((CHUNK_SEPARATOR.join(texts), list(labels), None))
+                texts.clear()
+                labels.clear()
+
+        for item in items:
+            text = item.text
+            if self.counter.count(text) > self.max_tokens:
+                flush()
+                pieces = self._split(item)
+                packed.extend((piece, [item.label], (i + 1, len(pieces))) for i, piece in enumerate(pieces))
+                continue
+            if texts and self.counter.count(CHUNK_SEPARATOR.join(texts + [text])) > self.max_tokens:
+                flush()
+            texts.append(text)
+            labels.append(item.label)
+        flush()
+        return packed
+
+    def _split(self, item: ResumeItem) -> List[str]:
+        """Split an oversized item on line boundaries, overlapping consecutive pieces."""
+        heading_tokens = self.counter.count(item.heading) + 1 if item.heading else 0
+        body_budget = max(16, self.max_tokens - heading_tokens)
+
+        lines: List[str] = []
+        for line in item.lines:
+            lines.extend(self._split_line(line, body_budget) if self.counter.count(line) > body_budget else [line])
+
+        pieces: List[List[str]] = []
+        current: List[str] = []
+        for line in lines:
+            if current and self.counter.count('\n'.join(current + [line])) > body_budget:
+                pieces.append(current)
+                current = self._overlap(current, body_budget - self.counter.count(line))
+            current.append(line)
+        if current:
+            pieces.append(current)
+
+        return ['\n'.join(([item.heading] if item.heading else []) + piece) for piece in pieces]
+
+    def _overlap(self, lines: List[str], room: int) -> List[str]:
+        """Trailing lines of a finished piece to repeat at the start of the next."""
+        carried: List[str] = []
+        limit = min(self.overlap_tokens, room)
+        for line in reversed(lines):
+            if self.counter.count('\n'.join([line] + carried)) > limit:
+                break
+            carried.insert(0, line)
+        return carried
+
+    def _split_line(self, line: str, budget: int) -> List[str]:
+        """Split a single over-long line into overlapping word windows."""
+        words = line.split()
+        windows: List[str] = []
+        start = 0
+        while start < len(words):
+            end = start + 1
+            while end < len(words) and self.counter.count(' '.join(words[start:end + 1])) <= budget:
+                end += 1
+            windows.append(' '.join(words[start:end]))
+            if end >= len(words):
+                break
+            overlap = 0
+            while overlap < end - start - 1 and self.counter.count(' '.join(words[end - overlap - 1:end])) <= self.overlap_tokens:
+                overlap += 1
+            start = end - overlap
+        return windows
+
+
+def resume_items(resume: NormalizedResumeSchema) -> List[ResumeItem]:
+    """Flatten a normalized resume into section items, in resume order."""
+    items: List[ResumeItem] = []
+
+    if resume.professional_summary and resume.professional_summary.strip():
+        items.append(ResumeItem('summary', 'Professional Summary', '', [resume.professional_summary.strip()]))
+
+    for job in resume.work_experience:
+        heading = _join(' — ', job.job_title, job.company) + _dates(job.start_date, job.end_date)
+        lines = [f"- {line}" for line in job.responsibilities + job.metrics_achieved if line]
+        if job.tools_used:
+            lines.append(f"Tools: {', '.join(job.tools_used)}")
+        items.append(ResumeItem('experience', _join(' at ', job.job_title, job.company), heading, lines))
+
+    for project in resume.projects_and_portfolio:
+        heading = _join(' — ', project.name, project.role) + _dates(project.start_date, project.end_date)
+        lines = [project.description] if project.description else []
+        lines.extend(f"- {outcome}" for outcome in project.outcomes if outcome)
+        if project.tools_used:
+            lines.append(f"Tools: {', '.join(project.tools_used)}")
+        items.append(ResumeItem('projects', project.name, heading, lines))
+
+    if resume.skills:
+        skills = resume.skills
+        lines = [
+            f"{label}: {', '.join(values)}"
+            for label, values in (
+                ('Core competencies', skills.core_competencies),
+                ('Tools and software', skills.tools_and_software),
+                ('Methodologies', skills.methodologies),
+                ('Soft skills', skills.soft_skills),
+                ('Languages', skills.languages),
+            )
+            if values
+        ]
+        lines.extend(f"{category.category_name}: {', '.join(category.skills)}" for category in skills.specialized_skills if category.skills)
+        if lines:
+            items.append(ResumeItem('skills', 'Skills', '', lines))
+
+    for school in resume.education:
+        degree = ' in '.join(part for part in (school.degree, school.field_of_study) if part)
+        heading = _join(' — ', degree, school.institution) + _dates(None, school.completion_date)
+        lines = [f"Grade: {school.grade}"] if school.grade else []
+        lines.extend(f"- {achievement}" for achievement in school.achievements if achievement)
+        items.append(ResumeItem('education', school.institution, heading, lines))
+
+    for cert in resume.certifications_and_licenses:
+        line = _join(' — ', cert.name, cert.issuing_organization) + _dates(None, cert.issue_date)
+        items.append(ResumeItem('certifications', cert.name, '', [line]))
+
+    return [item for item in items if item.text.strip()]
+
+
+def _group_by_section(items: List[ResumeItem]) -> List[List[ResumeItem]]:
+    groups: Dict[str, List[ResumeItem]] = {}
+    for item in items:
+        groups.setdefault(item.section, []).append(item)
+    return list(groups.values())
+
+
+def _join(separator: str, *parts: Optional[str]) -> str:
+    return separator.join(part.strip() for part in parts if part and part.strip())
+
+
+def _dates(start: Optional[str], end: Optional[str]) -> str:
+    span = ' – '.join(date for date in (start, end) if date)
+    return f" ({span})" if span else ''
+
+
+# Global chunker instance, and the embedding model it is sized for
+_resume_chunker = None
+_resume_chunker_model = None
+
+def get_resume_chunker() -> ResumeChunker:
+    """
+    Get the process-wide resume chunker, sized for the active embedding model.
+
+    EMBED_CHUNK_MAX_TOKENS caps the chunk size (0 = the model's whole input
+    window, i.e. the fewest chunks); it is never allowed past the window.
+    """
+    global _resume_chunker, _resume_chunker_model
+    model = get_embed_model_name()
+    if _resume_chunker is None or _resume_chunker_model != model:
+        window = EMBED_MODEL_MAX_TOKENS.get(model, DEFAULT_MODEL_MAX_TOKENS)
+        configured = int(current_app.config.get('EMBED_CHUNK_MAX_TOKENS', 0))
+        _resume_chunker = ResumeChunker(
+            max_tokens=min(configured, window) if configured > 0 else window,
+            overlap_tokens=int(current_app.config.get('EMBED_CHUNK_OVERLAP_TOKENS', 50)),
+            counter=TokenCounter(model)
+        )
+        _resume_chunker_model = model
+    return _resume_chunker
+
+
+def chunk_resume(resume: Union[NormalizedResumeSchema, Dict[str, Any]]) -> List[DocumentChunk]:
+    """Chunk a normalized resume with the app's chunker (see ResumeChunker.chunk_resume)."""
+    return get_resume_chunker().chunk_resume(resume)
@@ -3,27 +3,22 @@ Document ingestion and parsing utilities.
 Handles DOCX, PDF, and text input for resume processing.
 """
 
-import os
-import tempfile
+import asyncio
 from typing import Any,Dict, List, Optional, Tuple
-import mammoth
 from pydantic import BaseModel
+from flask import current_app
 from providers import get_models
 from helpers import validate_json_with_retry
 from schemas import NormalizedResumeSchema,OptimizationResult
-import requests
 import json
 from datetime import datetime
-from utils import get_optimization_prompt,get_normalization_prompt,get_json_prompt,parse_and_validate_normalized_resume,extract_json_from_response
-
-
-# For PDF support
-try:
-    import pypdf
-    PDF_SUPPORT = True
-except ImportError:
-    PDF_SUPPORT = False
-    print("Warning: pypdf not installed. PDF support disabled.")
+from utils import get_optimization_prompt,get_normalization_prompt,get_section_normalization_prompt,get_json_prompt,parse_and_validate_normalized_resume,extract_json_from_response
+from utils import Deadline,DeadlineExceeded,current_deadline,deadline_scope
+from .extraction import extract_text_from_docx_bytes,extract_text_from_pdf_bytes,extract_text_from_file_bytes
+from .pdf_pool import get_pdf_page_pool
+from .downloads import get_resume_downloader
+from .extraction_cache import get_extraction_cache
+from .section_normalizer import SectionPart,plan_section_parts,draft_for_part,merge_section_parts
 
 
 
@@ -37,7 +32,10 @@ class DocumentProcessor:
             self,
             text: Optional[str] = None,
             docx_url: Optional[str] = None, 
-            pdf_url: Optional[str] = None
+            pdf_url: Optional[str] = None,
+            deadline: Optional[Deadline] = None,
+            file_bytes: Optional[bytes] = None,
+            file_type: Optional[str] = None
         ) :
             """
                 Main docuemnt processor function that handles all resume input types.
@@ -46,6 +44,9 @@ class DocumentProcessor:
                     text: Raw text input
                     docx_url: Path or URL to DOCX file
                     pdf_url: Path or URL to PDF file
+                    deadline: Request deadline (defaults to the current one)
+                    file_bytes: Uploaded file content held in memory
+                    file_type: Type of file_bytes ('pdf' or 'docx')
                     
                 Returns:
                     ParsedResume object with structured data
@@ -53,143 +54,239 @@ class DocumentProcessor:
                 Raises:
                     ValueError: If no input provided or processing fails
             """
+            raw_text, input_type = await self.extract_raw_text(
+                text, docx_url, pdf_url, deadline=deadline, file_bytes=file_bytes, file_type=file_type
+            )
+
+            print("normalized raw text.....")
+            # Parse the text into structured format
+            parsed = await self.normalize_resume(raw_text,input_type, deadline=deadline)
+            print("normalizing raw text done")
+            
+            return parsed
+
+      async def extract_raw_text(
+            self,
+            text: Optional[str] = None,
+            docx_url: Optional[str] = None,
+            pdf_url: Optional[str] = None,
+            deadline: Optional[Deadline] = None,
+            file_bytes: Optional[bytes] = None,
+            file_type: Optional[str] = None
+        ) -> Tuple[str, str]:
+            """
+            Extract raw resume text from whichever input was provided.
+
+            Returns:
+                Tuple of (raw_text, input_type)
+
+            Raises:
+                ValueError: If no input provided or extraction fails
+                DeadlineExceeded: If the request deadline has already passed
+            """
+            deadline = deadline or current_deadline()
+            if deadline is not None:
+                deadline.check("extraction")
+
             if text:
                 raw_text = text
                 input_type = "text"
+            elif file_bytes is not None:
+                raw_text = await get_extraction_cache().get_or_extract(
+                    file_bytes,
+                    file_type,
+                    lambda: asyncio.to_thread(extract_text_from_file_bytes, f".{file_type}", file_bytes, get_pdf_page_pool())
+                )
+                input_type = file_type
             elif docx_url:
-                raw_text = await self.extract_text_from_docx(docx_url)
+                raw_text = await self.extract_text_from_docx(docx_url, deadline=deadline)
                 input_type = "docx"
             elif pdf_url:
-                raw_text = await self.extract_text_from_pdf(pdf_url)
+                raw_text = await self.extract_text_from_pdf(pdf_url, deadline=deadline)
                 input_type = "pdf"
             else:
                 raise ValueError("No input provided")
 
             print(f"📄 Processing resume from {input_type} ({len(raw_text)} characters)")
+            return raw_text, input_type
 
-
-            print("normalized raw text.....")
-            # Parse the text into structured format
-            parsed = await self._normalize_with_llm(raw_text,input_type)
-            print("normalizing raw text done")
-            
-            return parsed
-
-      async def extract_text_from_docx(self, docx_path: str) -> str:
+      async def extract_text_from_docx(self, docx_path: str, deadline: Optional[Deadline] = None) -> str:
             """
             Extract text from DOCX file using mammoth.
             
             Args:
                 docx_path: Path or URL to DOCX file
+                deadline: Caps the download time at the remaining budget
                 
             Returns:
                 Extracted text content
             """
-            
-            try:
-                # Handle URL vs local path
-                if docx_path.startswith(('http://', 'https://')):
-                    # Download file
-                        response = requests.get(docx_path, timeout=30)
-                        response.raise_for_status()
-                        
-                        # Save to temporary file
-                        with tempfile.NamedTemporaryFile(suffix='.docx', delete=False) as temp_file:
-                            temp_file.write(response.content)
-                            temp_path = temp_file.name
-                else:
-                    temp_path = docx_path
-                
-                # Extract text with mammoth
-                with open(temp_path, "rb") as docx_file:
-                    result = mammoth.extract_raw_text(docx_file)
-                    text = result.value
-                
-                # Clean up temporary file if downloaded
-                if docx_path.startswith(('http://', 'https://')):
-                    os.unlink(temp_path)
-                
-                if not text.strip():
-                    raise ValueError("DOCX file appears to be empty")
-                    
-                return text.strip()
-                
-            except Exception as e:
-                raise ValueError(f"Failed to extract text from DOCX: {str(e)}")
+            data = await self._read_source(docx_path, 'docx', deadline)
+            return await get_extraction_cache().get_or_extract(
+                data, 'docx', lambda: asyncio.to_thread(extract_text_from_docx_bytes, data)
+            )
 
 
-      async def extract_text_from_pdf(self, pdf_path: str) -> str:
+      async def extract_text_from_pdf(self, pdf_path: str, deadline: Optional[Deadline] = None) -> str:
             """
             Extract text from PDF file using pypdf.
             
             Args:
                 pdf_path: Path or URL to PDF file
+                deadline: Caps the download time at the remaining budget
                 
             Returns:
                 Extracted text content
             """
-            
-            if not PDF_SUPPORT:
-                raise ValueError("PDF support not available. Install pypdf: pip install pypdf")
-            
+            data = await self._read_source(pdf_path, 'pdf', deadline)
+            return await get_extraction_cache().get_or_extract(
+                data, 'pdf', lambda: asyncio.to_thread(extract_text_from_pdf_bytes, data, get_pdf_page_pool())
+            )
+
+      async def _read_source(self, path: str, file_type: str, deadline: Optional[Deadline]) -> bytes:
+            """Stream a URL or read a local file into memory."""
+            if path.startswith(('http://', 'https://')):
+                return await get_resume_downloader().fetch(path, file_type, deadline=deadline)
             try:
-                # Handle URL vs local path
-                if pdf_path.startswith(('http://', 'https://')):
-                    # Download file
-                
-                    response = requests.get(pdf_path, timeout=30)
-                    response.raise_for_status()
-                    
-                    # Save to temporary file
-                    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
-                        temp_file.write(response.content)
-                        temp_path = temp_file.name
-                else:
-                    temp_path = pdf_path
-                
-                # Extract text with pypdf
-                text_parts = []
-                with open(temp_path, 'rb') as pdf_file:
-                    pdf_reader = pypdf.PdfReader(pdf_file)
-                    
-                    for page in pdf_reader.pages:
-                        page_text = page.extract_text()
-                        if page_text.strip():
-                            text_parts.append(page_text)
-                
-                # Clean up temporary file if downloaded
-                if pdf_path.startswith(('http://', 'https://')):
-                    os.unlink(temp_path)
-                
-                full_text = '\n'.join(text_parts)
-                
-                if not full_text.strip():
-                    raise ValueError("PDF file appears to be empty or text could not be extracted")
-                    
-                return full_text.strip()
-                
+                return await asyncio.to_thread(_read_file, path)
+            except Exception as e:
+                raise ValueError(f"Failed to read resume file: {str(e)}")
+
+      async def normalize_resume(self, raw_text: str, file_type: str, deadline: Optional[Deadline] = None):
+            """
+            Normalize resume text, trying the rule-based parser before the LLM.
+
+            Parses at or above RULE_PARSER_CONFIDENCE_THRESHOLD are returned
+            as-is; weaker ones are passed to the LLM as a draft to correct.
+            Resumes longer than SECTION_NORMALIZE_MIN_CHARS are normalized
+            section by section in parallel.
+
+            Args:
+                raw_text: Raw extracted text from document
+                file_type: Source file type for context
+                deadline: Request deadline (defaults to the current one)
+
+            Returns:
+                Structured and normalized resume data
+            """
+            hint = None
+            if current_app.config.get('RULE_PARSER_ENABLED', True):
+                rule_parse = await get_extraction_cache().get_or_parse(raw_text, file_type)
+                threshold = float(current_app.config.get('RULE_PARSER_CONFIDENCE_THRESHOLD', 0.85))
+                if rule_parse.resume is not None and rule_parse.confidence >= threshold:
+                    print(f"⚡ Rule-based parse accepted (confidence {rule_parse.confidence:.2f}), skipping LLM normalization")
+                    return rule_parse.resume
+                print(f"📝 Rule-based parse confidence {rule_parse.confidence:.2f} < {threshold:.2f}, normalizing with LLM")
+                hint = rule_parse.resume
+
+            parsed = await self._normalize_long_resume(raw_text, file_type, deadline=deadline, hint=hint)
+            if parsed is not None:
+                return parsed
+            return await self._normalize_with_llm(raw_text, file_type, deadline=deadline, hint=hint)
+
+      async def _normalize_long_resume(
+            self,
+            raw_text: str,
+            file_type: str,
+            deadline: Optional[Deadline] = None,
+            hint: Optional[Dict[str, Any]] = None
+        ) -> Optional[Dict[str, Any]]:
+            """
+            Normalize a long resume section by section, in parallel.
+
+            Each part (profile, experience, education, ...) is parsed by its
+            own LLM call against only its slice of the schema, so wall time
+            is set by the slowest part instead of one huge completion.
+
+            Returns:
+                Merged normalized resume, or None when the resume is too short,
+                has too few sections, or a part failed (use a single call then)
+            """
+            min_chars = int(current_app.config.get('SECTION_NORMALIZE_MIN_CHARS', 6000))
+            if min_chars <= 0 or len(raw_text) < min_chars:
+                return None
+
+            parts = plan_section_parts(raw_text)
+            if len(parts) < 3 or parts[0].name != 'profile':
+                return None
+
+            print(f"🧩 Normalizing {len(parts)} resume parts in parallel: {[part.name for part in parts]}")
+            with deadline_scope(deadline):
+                results = await asyncio.gather(
+                    *(self._normalize_part(part, file_type, draft_for_part(part, hint)) for part in parts),
+                    return_exceptions=True
+                )
+
+            failed = [part.name for part, result in zip(parts, results) if isinstance(result, BaseException)]
+            for result in results:
+                if isinstance(result, DeadlineExceeded):
+                    raise result
+            if failed:
+                print(f"⚠️  Section normalization failed for {failed}, falling back to a single call")
+                return None
+
+            try:
+                return merge_section_parts(results, file_type)
             except Exception as e:
-                raise ValueError(f"Failed to extract text from PDF: {str(e)}")
-      async def _normalize_with_llm(self, raw_text: str, file_type: str):
+                print(f"⚠️  Merged section normalization did not validate, falling back to a single call: {str(e)}")
+                return None
+
+      async def _normalize_part(
+            self,
+            part: SectionPart,
+            file_type: str,
+            draft: Optional[Dict[str, Any]] = None
+        ) -> BaseModel:
+            """Normalize one resume part against its sub-schema."""
+            system_message, user_message = get_section_normalization_prompt(
+                part.text, part.schema.model_json_schema(), file_type, draft=draft
+            )
+            deadline = current_deadline()
+            if deadline is not None:
+                deadline.check(f"{part.name} normalization")
+            response = await self.chat_model.chat(
+                get_json_prompt(system_message, user_message),
+                temperature=0.1,
+                max_tokens=part.max_tokens
+            )
+            response_text = response if isinstance(response, str) else getattr(response, "content", str(response))
+            try:
+                response_text = json.dumps(extract_json_from_response(response_text))
+            except Exception:
+                pass  # let the validator attempt a repair
+            return await validate_json_with_retry(response_text, part.schema, chat_model=self.chat_model, deadline=deadline)
+
+      async def _normalize_with_llm(
+            self,
+            raw_text: str,
+            file_type: str,
+            deadline: Optional[Deadline] = None,
+            hint: Optional[Dict[str, Any]] = None
+        ):
             """
             Use LLM to normalize and structure resume text.
             
             Args:
                 raw_text: Raw extracted text from document
                 file_type: Source file type for context
+                deadline: Request deadline (defaults to the current one)
+                hint: Draft parse from the rule-based parser, if any
                 
             Returns:
                 Structured and normalized resume data
             """
             
             
-            system_message, user_message = get_normalization_prompt(raw_text, file_type)
+            system_message, user_message = get_normalization_prompt(raw_text, file_type, hint=hint)
             messages = get_json_prompt(system_message, user_message)
-            response = await self.chat_model.chat(
-                messages,
-                temperature=0.1,  # Low temperature for accuracy
-                max_tokens=8000
-            )
+            with deadline_scope(deadline) as deadline:
+                if deadline is not None:
+                    deadline.check("normalization")
+                response = await self.chat_model.chat(
+                    messages,
+                    temperature=0.1,  # Low temperature for accuracy
+                    max_tokens=8000
+                )
         
             # If client returns an object, ensure  extracted the text:
             response_text = response if isinstance(response, str) else getattr(response, "content", str(response))
@@ -203,7 +300,8 @@ class DocumentProcessor:
             normalized_resume: Dict[str, Any],
             jd_text: str,
             jd_title: Optional[str] = None,
-            optimization_focus: str = "professional-concise"
+            optimization_focus: str = "professional-concise",
+            deadline: Optional[Deadline] = None
       ):
         """
         Perform comprehensive gap analysis and resume optimization in one LLM call.
@@ -213,6 +311,7 @@ class DocumentProcessor:
             jd_text: Job description text
             jd_title: Optional job title
             optimization_focus: Optimization tone/style
+            deadline: Request deadline (defaults to the current one)
             
         Returns:
             Comprehensive Optimization Result with gap analysis and optimized resume
@@ -232,12 +331,15 @@ class DocumentProcessor:
             ]
             
             # Execute LLM call with optimized parameters
-            response = await self.chat_model.chat(
-                messages=messages,
-                temperature=0.2,  # Low temperature for consistency and accuracy
-                max_tokens=8000,  # Large response needed for comprehensive output
-                top_p=0.9
-            )
+            with deadline_scope(deadline) as deadline:
+                if deadline is not None:
+                    deadline.check("gap analysis")
+                response = await self.chat_model.chat(
+                    messages=messages,
+                    temperature=0.2,  # Low temperature for consistency and accuracy
+                    max_tokens=8000,  # Large response needed for comprehensive output
+                    top_p=0.9
+                )
             
             print(f"📝 Generated comprehensive analysis ({len(response)} chars)")
             # Extract and validate JSON response
@@ -245,11 +347,13 @@ class DocumentProcessor:
 
             return json_response
             
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             print(f"❌ LLM gap analysis + optimization failed: {str(e)}")
             raise ValueError(f"Failed to analyze and optimize resume: {str(e)}")
 
 
-
-
-
+def _read_file(path: str) -> bytes:
+    with open(path, 'rb') as source:
+        return source.read()
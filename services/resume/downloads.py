@@ -0,0 +1,136 @@
+"""
+Async downloads of remote resume files (docx_url / pdf_url inputs).
+One pooled httpx.AsyncClient per event loop is shared by all requests; the
+body is streamed into memory with a hard byte cap, and the content type and
+file signature are checked on the first chunk so HTML error pages or
+oversized files are rejected without downloading them.
+"""
+
+import asyncio
+import weakref
+from typing import Optional
+
+import httpx
+from flask import current_app
+
+from utils import Deadline, DeadlineExceeded, current_deadline
+from .extraction import FileTooLargeError
+
+# Content types servers send for each format (checked before the body is read)
+ALLOWED_CONTENT_TYPES = {
+    'pdf': {'application/pdf', 'application/x-pdf', 'application/octet-stream', 'binary/octet-stream'},
+    'docx': {
+        'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+        'application/zip',
+        'application/octet-stream',
+        'binary/octet-stream',
+    },
+}
+
+# Leading bytes of each format
+FILE_SIGNATURES = {'pdf': b'%PDF', 'docx': b'PK\x03\x04'}
+
+
+class ResumeDownloader:
+    """Streams resume files over a shared, pooled async HTTP client."""
+
+    def __init__(
+        self,
+        max_bytes: int,
+        timeout: float = 30.0,
+        max_connections: int = 20,
+        keepalive_expiry: float = 30.0
+    ):
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        # AsyncClient connections belong to the loop that opened them
+        self._clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]' = weakref.WeakKeyDictionary()
+
+    def client(self) -> httpx.AsyncClient:
+        """The pooled client of the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=self.limits,
+                timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 10.0)),
+                follow_redirects=True,
+                max_redirects=5,
+                headers={'Accept': 'application/pdf, application/vnd.openxmlformats-officedocument.wordprocessingml.document, */*;q=0.5'}
+            )
+            self._clients[loop] = client
+        return client
+
+    async def fetch(self, url: str, file_type: str, deadline: Optional[Deadline] = None) -> bytes:
+        """
+        Download a resume file into memory.
+
+        Args:
+            url: http(s) URL of the file
+            file_type: Expected format ('pdf' or 'docx')
+            deadline: Request deadline (defaults to the current one); caps the timeout
+
+        Returns:
+            The file bytes
+
+        Raises:
+            FileTooLargeError: If the file exceeds max_bytes
+            ValueError: On HTTP errors or content that is not a file_type file
+            DeadlineExceeded: If the request deadline has passed
+        """
+        deadline = deadline or current_deadline()
+        timeout = self.timeout
+        if deadline is not None:
+            deadline.check("download")
+            timeout = deadline.timeout(self.timeout)
+
+        try:
+            return await asyncio.wait_for(self._stream(url, file_type), timeout=timeout)
+        except asyncio.TimeoutError:
+            if deadline is not None and deadline.expired:
+                raise DeadlineExceeded(f"Deadline of {deadline.budget:.0f}s exceeded during download")
+            raise ValueError(f"Download timed out after {timeout:.0f}s")
+        except httpx.HTTPError as e:
+            raise ValueError(f"Download failed: {str(e)}")
+
+    async def _stream(self, url: str, file_type: str) -> bytes:
+        async with self.client().stream('GET', url) as response:
+            if response.status_code >= 400:
+                raise ValueError(f"Download failed with HTTP {response.status_code}")
+
+            content_type = response.headers.get('content-type', '').split(';')[0].strip().lower()
+            if content_type and content_type not in ALLOWED_CONTENT_TYPES[file_type]:
+                raise ValueError(f"Expected a {file_type.upper()} file but the server sent '{content_type}'")
+
+            declared = response.headers.get('content-length')
+            if declared and declared.isdigit() and int(declared) > self.max_bytes:
+                raise FileTooLargeError(f"File exceeds the {self.max_bytes // (1024 * 1024)} MB limit")
+
+            buffer = bytearray()
+            async for chunk in response.aiter_bytes():
+                if not buffer and not chunk.startswith(FILE_SIGNATURES[file_type][:len(chunk)]):
+                    raise ValueError(f"Downloaded content is not a {file_type.upper()} file")
+                if len(buffer) + len(chunk) > self.max_bytes:
+                    raise FileTooLargeError(f"File exceeds the {self.max_bytes // (1024 * 1024)} MB limit")
+                buffer.extend(chunk)
+            return bytes(buffer)
+
+
+# Global downloader instance
+_resume_downloader = None
+
+def get_resume_downloader() -> ResumeDownloader:
+    """Get the process-wide resume downloader, configured from the current app."""
+    global _resume_downloader
+    if _resume_downloader is None:
+        _resume_downloader = ResumeDownloader(
+            max_bytes=int(current_app.config.get('MAX_RESUME_SIZE_MB', 5)) * 1024 * 1024,
+            timeout=float(current_app.config.get('RESUME_DOWNLOAD_TIMEOUT_SECONDS', 30)),
+            max_connections=int(current_app.config.get('RESUME_DOWNLOAD_MAX_CONNECTIONS', 20))
+        )
+    return _resume_downloader
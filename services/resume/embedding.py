@@ -11,6 +11,7 @@ import asyncio
 from .keywords import KeywordMatch, extract_keywords_from_text
 from providers import get_models
 from schemas  import DocumentChunk
+from utils import run_sync
 
 @dataclass
 class EmbeddingResult:
@@ -151,7 +152,8 @@ def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
 def find_similar_chunks(
     resume_embeddings: List[EmbeddingResult],
     jd_embedding: EmbeddingResult,
-    similarity_threshold: float = 0.3
+    similarity_threshold: float = 0.3,
+    jd_keywords: Optional[List[str]] = None
 ) -> List[SimilarityMatch]:
     """
     Find resume chunks that are similar to the job description.
@@ -160,12 +162,16 @@ def find_similar_chunks(
         resume_embeddings: Resume chunk embeddings
         jd_embedding: Job description embedding
         similarity_threshold: Minimum similarity score to include
+        jd_keywords: JD keywords if already extracted (see extract_jd_requirements)
         
     Returns:
         List of SimilarityMatch objects
     """
     
     matches = []
+    if jd_keywords is None:
+        jd_keywords = [kw.keyword for kw in extract_keywords_from_text(jd_embedding.text)]
+    jd_kw_set = {keyword.lower() for keyword in jd_keywords}
     
     for resume_emb in resume_embeddings:
         # Calculate similarity
@@ -174,10 +180,8 @@ def find_similar_chunks(
         if similarity >= similarity_threshold:
             # Find matching keywords between chunk and JD
             resume_keywords = extract_keywords_from_text(resume_emb.text)
-            jd_keywords = extract_keywords_from_text(jd_embedding.text)
             
             resume_kw_set = {kw.keyword.lower() for kw in resume_keywords}
-            jd_kw_set = {kw.keyword.lower() for kw in jd_keywords}
             matching_keywords = list(resume_kw_set & jd_kw_set)
             
             # Create chunk object for compatibility
@@ -205,7 +209,9 @@ def find_similar_chunks(
 async def analyze_semantic_gaps(
     resume_chunks: List[DocumentChunk],
     jd_text: str,
-    similarity_threshold: float = 0.3
+    similarity_threshold: float = 0.3,
+    jd_embedding: Optional[List[float]] = None,
+    jd_keywords: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     Analyze semantic gaps between resume and job description.
@@ -214,6 +220,8 @@ async def analyze_semantic_gaps(
         resume_chunks: Resume text chunks
         jd_text: Job description text
         similarity_threshold: Minimum similarity for matches
+        jd_embedding: JD vector if already computed (skips embedding the JD)
+        jd_keywords: JD keywords if already extracted
         
     Returns:
         Gap analysis with similarity metrics
@@ -236,10 +244,14 @@ async def analyze_semantic_gaps(
     
     # Generate embeddings
     resume_embeddings = await embedder.embed_resume_chunks(resume_chunks)
-    jd_embedding = await embedder.embed_job_description(jd_text)
+    if jd_embedding is not None:
+        clean_text = jd_text.strip()
+        jd_embedding = EmbeddingResult(text=clean_text, embedding=jd_embedding, token_count=len(clean_text.split()))
+    else:
+        jd_embedding = await embedder.embed_job_description(jd_text)
     
     # Find similar chunks
-    similar_chunks = find_similar_chunks(resume_embeddings, jd_embedding, similarity_threshold)
+    similar_chunks = find_similar_chunks(resume_embeddings, jd_embedding, similarity_threshold, jd_keywords)
     
     # Calculate section-level similarities
     section_similarities = {}
@@ -272,7 +284,7 @@ async def analyze_semantic_gaps(
 def embed_resume_chunks_sync(chunks: List[DocumentChunk]) -> List[EmbeddingResult]:
     """Synchronous wrapper for embed_resume_chunks."""
     embedder = ResumeEmbedder()
-    return asyncio.run(embedder.embed_resume_chunks(chunks))
+    return run_sync(embedder.embed_resume_chunks(chunks))
 
 
 def analyze_semantic_gaps_sync(
@@ -281,7 +293,7 @@ def analyze_semantic_gaps_sync(
     similarity_threshold: float = 0.3
 ) -> Dict[str, Any]:
     """Synchronous wrapper for analyze_semantic_gaps."""
-    return asyncio.run(analyze_semantic_gaps(resume_chunks, jd_text, similarity_threshold))
+    return run_sync(analyze_semantic_gaps(resume_chunks, jd_text, similarity_threshold))
 
 
 class GapAnalyzer:
@@ -534,4 +546,4 @@ def perform_gap_analysis_sync(
     jd_title: Optional[str] = None
 ) -> Dict[str, Any]:
     """Synchronous wrapper for perform_gap_analysis."""
-    return asyncio.run(perform_gap_analysis(resume_chunks, jd_text, jd_title))
\ No newline at end of file
+    return run_sync(perform_gap_analysis(resume_chunks, jd_text, jd_title))
\ No newline at end of file
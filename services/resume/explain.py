@@ -10,6 +10,7 @@ import asyncio
 from schemas import Rationale, ChangeRationale,OptimizedResume
 from helpers import validate_json_with_retry
 from providers import get_models
+from utils import run_sync
 from .rewrite import ResumePrompts
 class ResumeDiffGenerator:
     """Generates detailed diffs between original and optimized resumes."""
@@ -346,4 +347,4 @@ class ExplanationGenerator:
 def generate_explanations_sync(*args, **kwargs) -> Rationale:
     """Synchronous wrapper for generate_explanations."""
     generator = ExplanationGenerator()
-    return asyncio.run(generator.generate_explanations(*args, **kwargs))
\ No newline at end of file
+    return run_sync(generator.generate_explanations(*args, **kwargs))
\ No newline at end of file
@@ -0,0 +1,323 @@
+"""
+Synchronous text extraction from in-memory resume files.
+Module-level functions with no app or provider state, so they can run in a
+ProcessPoolExecutor for bulk workloads.
+"""
+
+import io
+import os
+import signal
+import zipfile
+import threading
+import multiprocessing
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, List, Optional, Sequence, Tuple, Union
+
+import mammoth
+
+# For PDF support
+try:
+    import pypdf
+    PDF_SUPPORT = True
+except ImportError:
+    PDF_SUPPORT = False
+
+
+SUPPORTED_EXTENSIONS = {'.pdf', '.docx', '.txt'}
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# WordprocessingML namespaces (transitional and strict OOXML)
+WORD_NAMESPACES = (
+    'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+    'http://purl.oclc.org/ooxml/wordprocessingml/main',
+)
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+DOCX_MAIN_PART = 'word/document.xml'
+LIST_BULLET = '• '
+TABLE_CELL_SEPARATOR = ' | '
+
+FileContent = Union[bytes, BinaryIO]
+
+
+class FileTooLargeError(ValueError):
+    """Raised when an uploaded file exceeds the configured size cap."""
+
+
+class PageTimeout(Exception):
+    """Raised inside a worker when a single PDF page takes too long."""
+
+
+def read_capped(stream: BinaryIO, max_bytes: int) -> bytes:
+    """
+    Read a file-like object into memory, failing as soon as it grows past
+    max_bytes instead of reading the whole thing first.
+
+    Args:
+        stream: Binary file-like object (e.g. a werkzeug upload stream)
+        max_bytes: Maximum allowed size
+
+    Returns:
+        The file bytes
+
+    Raises:
+        FileTooLargeError: If the stream holds more than max_bytes
+    """
+    buffer = io.BytesIO()
+    while True:
+        chunk = stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            return buffer.getvalue()
+        if buffer.tell() + len(chunk) > max_bytes:
+            raise FileTooLargeError(f"File exceeds the {max_bytes // (1024 * 1024)} MB limit")
+        buffer.write(chunk)
+
+
+def _as_stream(data: FileContent) -> BinaryIO:
+    return io.BytesIO(data) if isinstance(data, (bytes, bytearray, memoryview)) else data
+
+
+def extract_text_from_pdf_bytes(data: FileContent, page_pool=None) -> str:
+    """
+    Extract text from PDF file content using pypdf.
+
+    Args:
+        data: PDF file bytes or binary file-like object
+        page_pool: Optional PdfPagePool; documents with at least
+            page_pool.min_pages pages are extracted page-parallel
+
+    Returns:
+        Extracted text content
+    """
+    if not PDF_SUPPORT:
+        raise ValueError("PDF support not available. Install pypdf: pip install pypdf")
+
+    try:
+        pdf_reader = pypdf.PdfReader(_as_stream(data))
+        page_count = len(pdf_reader.pages)
+        if page_pool is not None and page_count >= page_pool.min_pages:
+            if not isinstance(data, bytes):
+                data.seek(0)
+                data = data.read()
+            page_texts = page_pool.extract(data, page_count)
+        else:
+            page_texts = [page.extract_text() for page in pdf_reader.pages]
+        text_parts = [text for text in page_texts if text and text.strip()]
+    except Exception as e:
+        raise ValueError(f"Failed to extract text from PDF: {str(e)}")
+
+    full_text = '\n'.join(text_parts)
+    if not full_text.strip():
+        raise ValueError("PDF file appears to be empty or text could not be extracted")
+    return full_text.strip()
+
+
+def worker_pool_context() -> multiprocessing.context.BaseContext:
+    """
+    Multiprocessing context for extraction worker pools.
+
+    The web process runs request threads and an event-loop thread, so a
+    fork()ed worker could inherit a lock another thread was holding.
+    forkserver starts workers from a clean single-threaded server process
+    (with this module preloaded); spawn is used where it is unavailable.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+@contextmanager
+def _page_time_limit(seconds: Optional[float]) -> Iterator[None]:
+    """Raise PageTimeout after `seconds` (SIGALRM; main thread of a Unix process only)."""
+    if not seconds or not hasattr(signal, 'setitimer') or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise PageTimeout()
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def extract_pdf_pages(
+    data: bytes,
+    page_indexes: Sequence[int],
+    page_timeout: Optional[float] = None
+) -> Tuple[List[str], List[int]]:
+    """
+    Extract the text of selected PDF pages (process pool task).
+
+    Args:
+        data: PDF file bytes
+        page_indexes: Zero-based pages to extract, in order
+        page_timeout: Seconds allowed per page; slower pages are skipped
+
+    Returns:
+        Tuple of (page texts in page_indexes order, indexes of timed-out pages)
+    """
+    pdf_reader = pypdf.PdfReader(io.BytesIO(data))
+    texts, timed_out = [], []
+    for index in page_indexes:
+        try:
+            with _page_time_limit(page_timeout):
+                texts.append(pdf_reader.pages[index].extract_text() or '')
+        except PageTimeout:
+            texts.append('')
+            timed_out.append(index)
+    return texts, timed_out
+
+
+def extract_text_from_docx_bytes(data: FileContent) -> str:
+    """
+    Extract text from DOCX file content.
+
+    Streams the document XML (see extract_docx_ooxml) and falls back to
+    mammoth for files it cannot read.
+
+    Args:
+        data: DOCX file bytes or binary file-like object
+
+    Returns:
+        Extracted text content
+    """
+    stream = _as_stream(data)
+    try:
+        text = extract_docx_ooxml(stream)
+    except Exception:
+        text = ''
+
+    if not text.strip():
+        try:
+            stream.seek(0)
+            text = mammoth.extract_raw_text(stream).value
+        except Exception as e:
+            raise ValueError(f"Failed to extract text from DOCX: {str(e)}")
+
+    if not text.strip():
+        raise ValueError("DOCX file appears to be empty")
+    return text.strip()
+
+
+def extract_docx_ooxml(data: FileContent) -> str:
+    """
+    Extract text by streaming word/document.xml out of the DOCX zip.
+
+    Skips building a document model: the XML is read incrementally and
+    each element is discarded once handled. One line is emitted per
+    paragraph; list items get a bullet prefix and table rows become one
+    line with their cells joined by " | ". Text box paragraphs are emitted
+    as their own lines and mc:Fallback copies of drawings are skipped.
+
+    Args:
+        data: DOCX file bytes or binary file-like object
+
+    Returns:
+        Extracted text ('' if the document body has no text)
+
+    Raises:
+        zipfile.BadZipFile, KeyError, ET.ParseError: On files that are not
+            a readable DOCX
+    """
+    tags = {f'{{{ns}}}{name}': name for ns in WORD_NAMESPACES for name in ('p', 't', 'tab', 'br', 'cr', 'numPr', 'pStyle', 'tbl', 'tr', 'tc')}
+
+    # Open containers: the document, or the table cell being read
+    containers: List[List[str]] = [[]]
+    rows: List[List[str]] = []
+    paragraphs: List[List[str]] = []
+    list_items: List[bool] = []
+    fallback_depth = 0
+
+    with zipfile.ZipFile(_as_stream(data)) as archive, archive.open(DOCX_MAIN_PART) as xml:
+        for event, elem in ET.iterparse(xml, events=('start', 'end')):
+            if elem.tag == MC_FALLBACK:
+                fallback_depth += 1 if event == 'start' else -1
+                if event == 'end':
+                    elem.clear()
+                continue
+            if fallback_depth:
+                continue
+
+            name = tags.get(elem.tag)
+            if event == 'start':
+                if name == 'p':
+                    paragraphs.append([])
+                    list_items.append(False)
+                elif name == 'tr':
+                    rows.append([])
+                elif name == 'tc':
+                    containers.append([])
+                continue
+
+            if name == 't':
+                if paragraphs and elem.text:
+                    paragraphs[-1].append(elem.text)
+            elif name == 'tab':
+                if paragraphs:
+                    paragraphs[-1].append('\t')
+            elif name in ('br', 'cr'):
+                if paragraphs:
+                    paragraphs[-1].append('\n')
+            elif name == 'numPr' or (name == 'pStyle' and _is_list_style(elem)):
+                if list_items:
+                    list_items[-1] = True
+            elif name == 'p':
+                text = ''.join(paragraphs.pop()).strip()
+                if list_items.pop() and text:
+                    text = LIST_BULLET + text
+                if text:
+                    containers[-1].append(text)
+            elif name == 'tc':
+                rows[-1].append(' '.join(containers.pop()))
+            elif name == 'tr':
+                cells = [cell for cell in rows.pop() if cell]
+                if cells:
+                    containers[-1].append(TABLE_CELL_SEPARATOR.join(cells))
+            elif name == 'tbl':
+                pass
+            else:
+                continue
+            elem.clear()
+
+    return '\n'.join(containers[0])
+
+
+def _is_list_style(elem: ET.Element) -> bool:
+    """Paragraph styles that are numbered via the style definition (e.g. 'List Bullet')."""
+    value = next((v for k, v in elem.attrib.items() if k.endswith('}val')), '')
+    return value.replace(' ', '').lower().startswith(('listbullet', 'listnumber'))
+
+
+def extract_text_from_file_bytes(filename: str, data: bytes, page_pool=None) -> str:
+    """
+    Extract text from a resume file, choosing the parser by extension.
+
+    Args:
+        filename: Original file name (used for its extension)
+        data: File bytes
+        page_pool: Optional PdfPagePool for long PDFs
+
+    Returns:
+        Extracted text content
+    """
+    extension = get_extension(filename)
+    if extension == '.pdf':
+        return extract_text_from_pdf_bytes(data, page_pool)
+    if extension == '.docx':
+        return extract_text_from_docx_bytes(data)
+    if extension == '.txt':
+        return data.decode('utf-8', errors='ignore').strip()
+    raise ValueError(f"Unsupported resume file type: {filename}")
+
+
+def get_extension(filename: str) -> Optional[str]:
+    """Lower-cased file extension including the dot."""
+    return os.path.splitext(filename)[1].lower() or None
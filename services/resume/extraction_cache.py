@@ -0,0 +1,177 @@
+"""
+Content-addressed cache for resume text extraction.
+Extracted text is keyed by the SHA-256 of the uploaded/downloaded bytes, so
+re-uploads of the same file skip PDF/DOCX parsing. The rule-based parse of the
+text is cached the same way. Entries live in an in-process LRU tier in front
+of the shared cache backend (Redis, or the in-memory fallback); hits and the
+extraction time they saved are reported through CacheAnalytics.
+"""
+
+import time
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from flask import current_app
+
+from utils.prompts import NORMALIZATION_PROMPT_VERSION
+from .cache import get_enhanced_cache
+from .rule_parser import RuleParseResult, parse_resume
+
+# Bump when extraction output changes (parser upgrades, cleanup rules)
+EXTRACTION_CACHE_VERSION = "v2"
+
+
+class LRUTier:
+    """Small thread-safe in-process LRU of recent entries."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def set(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class ExtractionCache:
+    """Two-tier cache of extracted resume text and rule-based parses."""
+
+    def __init__(self, backend=None, analytics=None, lru_size: int = 256, ttl: int = 7 * 24 * 60 * 60, enabled: bool = True):
+        self.backend = backend
+        self.analytics = analytics
+        self.lru = LRUTier(lru_size)
+        self.ttl = ttl
+        self.enabled = enabled
+        self.tier_hits = {'memory': 0, 'shared': 0}
+
+    @staticmethod
+    def text_key(data: bytes, file_type: str) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        return f"extract:{EXTRACTION_CACHE_VERSION}:{file_type}:{digest}"
+
+    @staticmethod
+    def rule_parse_key(raw_text: str, file_type: str) -> str:
+        digest = hashlib.sha256(raw_text.encode('utf-8')).hexdigest()
+        return f"extract:rule:{NORMALIZATION_PROMPT_VERSION}:{file_type}:{digest}"
+
+    async def get_or_extract(
+        self,
+        data: bytes,
+        file_type: str,
+        extract: Callable[[], Awaitable[str]]
+    ) -> str:
+        """
+        Extracted text of a file, from cache or by running extract().
+
+        Args:
+            data: File bytes (hashed for the key)
+            file_type: 'pdf' or 'docx'
+            extract: Coroutine function performing the extraction on a miss
+
+        Returns:
+            Extracted text
+        """
+        entry = await self._get_or_compute(
+            self.text_key(data, file_type),
+            'extraction',
+            lambda: _timed(extract)
+        )
+        return entry['text']
+
+    async def get_or_parse(self, raw_text: str, file_type: str) -> RuleParseResult:
+        """Rule-based parse of raw_text, from cache or by running the parser."""
+        async def parse():
+            result, elapsed_ms = await _timed_call(asyncio.to_thread(parse_resume, raw_text, file_type))
+            return {'result': asdict(result), 'elapsed_ms': elapsed_ms}
+
+        entry = await self._get_or_compute(self.rule_parse_key(raw_text, file_type), 'rule_parse', parse)
+        return RuleParseResult(**entry['result'])
+
+    async def _get_or_compute(
+        self,
+        key: str,
+        data_type: str,
+        compute: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        if not self.enabled:
+            return await compute()
+
+        entry = self.lru.get(key)
+        tier = 'memory'
+        if entry is None and self.backend is not None:
+            entry = await self.backend.get(key)
+            tier = 'shared'
+            if entry is not None:
+                self.lru.set(key, entry)
+
+        if entry is not None:
+            self.tier_hits[tier] += 1
+            await self._log('hit', key, data_type, entry.get('elapsed_ms', 0.0))
+            return entry
+
+        await self._log('miss', key, data_type)
+        entry = await compute()
+        self.lru.set(key, entry)
+        if self.backend is not None and await self.backend.set(key, entry, self.ttl):
+            await self._log('set', key, data_type)
+        return entry
+
+    async def _log(self, operation: str, key: str, data_type: str, saved_ms: float = 0.0) -> None:
+        if self.analytics is None:
+            return
+        try:
+            await self.analytics.log_cache_operation(operation, key, data_type, saved_ms)
+        except Exception:
+            pass  # analytics must never fail extraction
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'enabled': self.enabled, 'lru_entries': len(self.lru), 'tier_hits': dict(self.tier_hits)}
+
+
+async def _timed(extract: Callable[[], Awaitable[str]]) -> Dict[str, Any]:
+    text, elapsed_ms = await _timed_call(extract())
+    return {'text': text, 'elapsed_ms': elapsed_ms}
+
+
+async def _timed_call(awaitable: Awaitable[Any]):
+    start = time.perf_counter()
+    result = await awaitable
+    return result, round((time.perf_counter() - start) * 1000, 2)
+
+
+# Global extraction cache instance
+_extraction_cache = None
+
+def get_extraction_cache() -> ExtractionCache:
+    """Get the process-wide extraction cache, configured from the current app."""
+    global _extraction_cache
+    if _extraction_cache is None:
+        enhanced = get_enhanced_cache()
+        _extraction_cache = ExtractionCache(
+            backend=enhanced.cache,
+            analytics=enhanced.analytics,
+            lru_size=int(current_app.config.get('EXTRACTION_CACHE_LRU_SIZE', 256)),
+            ttl=int(current_app.config.get('EXTRACTION_CACHE_TTL', 7 * 24 * 60 * 60)),
+            enabled=current_app.config.get('EXTRACTION_CACHE_ENABLED', True)
+        )
+    return _extraction_cache
@@ -13,6 +13,7 @@ from docx.oxml.shared import OxmlElement, qn
 import asyncio
 
 from schemas import OptimizedResume, ExperienceItem
+from utils import run_sync
 
 
 class ModernResumeFormatter:
@@ -494,7 +495,7 @@ def create_docx_sync(
     template_style: str = "professional"
 ) -> bytes:
     """Synchronous wrapper for create_docx."""
-    return asyncio.run(ResumeDocumentBuilder.create_docx(optimized_resume, contact_info, template_style))
+    return run_sync(ResumeDocumentBuilder.create_docx(optimized_resume, contact_info, template_style))
 
 
 def create_pdf_sync(
@@ -503,7 +504,7 @@ def create_pdf_sync(
     template_style: str = "professional"
 ) -> bytes:
     """Synchronous wrapper for create_pdf."""
-    return asyncio.run(ResumeDocumentBuilder.create_pdf(optimized_resume, contact_info, template_style))
+    return run_sync(ResumeDocumentBuilder.create_pdf(optimized_resume, contact_info, template_style))
 
 
 class DocumentMetadata:
@@ -0,0 +1,755 @@
+"""
+Background job queue for resume optimization.
+Runs the optimization pipeline on a pool of worker threads so web workers
+return immediately, with a Redis-backed queue and an in-process fallback.
+Jobs are queued per priority class (see scheduling.py). A job optimizes one
+resume against one job description, or against many (a batch job).
+A claimed job stays leased to its worker until it finishes; jobs whose
+worker died are found by their expired lease and requeued or failed.
+"""
+
+import os
+import json
+import time
+import uuid
+import threading
+import traceback
+import concurrent.futures
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import current_app
+
+# Redis imports with fallback
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+from schemas import ResumeInput, JDInput, OptimizationOptions
+from utils import Deadline, DeadlineExceeded, get_event_loop_runner
+from .progress import InMemoryProgressBroker, RedisProgressBroker, status_event, batch_item_event
+from .scheduling import (
+    PRIORITY_CLASSES, PRIORITY_PREMIUM, PRIORITY_FREE, PRIORITY_BATCH, DEFAULT_WEIGHTS,
+    WeightedRoundRobin, ClassStats, parse_class_settings
+)
+
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+
+FINISHED_STATUSES = {JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED}
+
+# Job kinds: one resume against one JD, or against a list of JDs
+JOB_KIND_OPTIMIZE = 'optimize'
+JOB_KIND_BATCH = 'batch'
+
+# Extra time a job may run past its deadline before the worker cancels it
+# outright (stages normally stop themselves at the deadline)
+DEADLINE_GRACE_SECONDS = 5.0
+
+
+class JobCancelled(Exception):
+    """Raised in the worker when a running job is cancelled by its client."""
+
+
+@dataclass
+class OptimizationJob:
+    """A queued optimization request and its lifecycle state."""
+    job_id: str
+    user_id: int
+    payload: Dict[str, Any]  # Serialized resume_input / jd_input / options
+    status: str = JOB_QUEUED
+    priority: str = PRIORITY_FREE
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    request_hash: Optional[str] = None  # Pipeline checkpoint key, known once text is extracted
+    retry_of: Optional[str] = None
+    kind: str = JOB_KIND_OPTIMIZE
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'OptimizationJob':
+        return cls(**data)
+
+    def public_dict(self) -> Dict[str, Any]:
+        """Job status safe to return to the client (no input payload)."""
+        return {
+            'job_id': self.job_id,
+            'kind': self.kind,
+            'status': self.status,
+            'priority': self.priority,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'result': self.result,
+            'error': self.error,
+            'retry_of': self.retry_of
+        }
+
+
+class InMemoryJobStore:
+    """Process-local job store used when Redis is unavailable."""
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.timestamps: Dict[str, float] = {}
+        self.cancelled: set = set()
+        self._lock = threading.Lock()
+
+    def save(self, job: OptimizationJob) -> None:
+        with self._lock:
+            self._evict_expired()
+            self.jobs[job.job_id] = job.to_dict()
+            self.timestamps[job.job_id] = time.time()
+
+    def get(self, job_id: str) -> Optional[OptimizationJob]:
+        with self._lock:
+            data = self.jobs.get(job_id)
+            return OptimizationJob.from_dict(dict(data)) if data else None
+
+    def request_cancel(self, job_id: str) -> None:
+        with self._lock:
+            self.cancelled.add(job_id)
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self.cancelled
+
+    def _evict_expired(self) -> None:
+        now = time.time()
+        expired = [k for k, ts in self.timestamps.items() if now - ts > self.ttl]
+        for key in expired:
+            self.jobs.pop(key, None)
+            self.timestamps.pop(key, None)
+            self.cancelled.discard(key)
+
+
+class RedisJobStore:
+    """Redis job store shared by every gunicorn worker."""
+
+    KEY_PREFIX = 'optimizer:job:'
+
+    def __init__(self, client, ttl: int):
+        self.client = client
+        self.ttl = ttl
+
+    def save(self, job: OptimizationJob) -> None:
+        self.client.setex(
+            f"{self.KEY_PREFIX}{job.job_id}",
+            self.ttl,
+            json.dumps(job.to_dict(), default=str)
+        )
+
+    def get(self, job_id: str) -> Optional[OptimizationJob]:
+        data = self.client.get(f"{self.KEY_PREFIX}{job_id}")
+        return OptimizationJob.from_dict(json.loads(data)) if data else None
+
+    # Cancellation is a separate key so the worker's own saves never clear it
+    def request_cancel(self, job_id: str) -> None:
+        self.client.setex(f"{self.KEY_PREFIX}{job_id}:cancel", self.ttl, '1')
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        return bool(self.client.exists(f"{self.KEY_PREFIX}{job_id}:cancel"))
+
+
+class InMemoryJobQueue:
+    """One FIFO of job ids per priority class."""
+
+    def __init__(self):
+        self._queues = {name: deque() for name in PRIORITY_CLASSES}
+        self._condition = threading.Condition()
+
+    def push(self, job_id: str, priority: str = PRIORITY_FREE, front: bool = False) -> None:
+        with self._condition:
+            if front:
+                self._queues[priority].appendleft(job_id)
+            else:
+                self._queues[priority].append(job_id)
+            self._condition.notify()
+
+    def pop(self, classes: List[str], timeout: float) -> Optional[Tuple[str, str]]:
+        """(class, job id) from the first non-empty class in `classes`, waiting up to timeout."""
+        with self._condition:
+            self._condition.wait_for(lambda: any(self._queues[c] for c in classes), timeout=timeout)
+            for name in classes:
+                if self._queues[name]:
+                    return name, self._queues[name].popleft()
+        return None
+
+    def depth(self, priority: Optional[str] = None) -> int:
+        with self._condition:
+            if priority:
+                return len(self._queues[priority])
+            return sum(len(q) for q in self._queues.values())
+
+    # Jobs and workers share the process, so a claimed job cannot outlive its worker
+    def ack(self, job_id: str) -> None:
+        pass
+
+    def extend(self, job_id: str) -> None:
+        pass
+
+    def expired(self) -> List[str]:
+        return []
+
+
+# Atomically take the first job id from the class lists (KEYS[2:]) and lease
+# it in the processing set (KEYS[1]) until ARGV[1]
+_CLAIM_SCRIPT = """
+for i = 2, #KEYS do
+    local job_id = redis.call('LPOP', KEYS[i])
+    if job_id then
+        redis.call('ZADD', KEYS[1], ARGV[1], job_id)
+        return {i - 1, job_id}
+    end
+end
+return false
+"""
+
+
+class RedisJobQueue:
+    """
+    One Redis list of job ids per priority class, plus a processing set.
+
+    pop() moves a job id into the processing set (scored by lease expiry)
+    in the same step that takes it off its list, so a worker that dies
+    mid-job leaves the id behind instead of losing it. Workers extend the
+    lease while the job runs and ack it when done; expired() hands out ids
+    whose lease ran out. BLMOVE would block on a single list only, and
+    workers take from several classes in scheduling order, so pop() polls.
+    """
+
+    QUEUE_KEY = 'optimizer:queue'
+    PROCESSING_KEY = 'optimizer:processing'
+    POLL_INTERVAL_SECONDS = 0.2
+
+    def __init__(self, client, lease_seconds: float = 60.0):
+        self.client = client
+        self.lease_seconds = lease_seconds
+        self._claim = client.register_script(_CLAIM_SCRIPT)
+
+    def _key(self, priority: str) -> str:
+        return f"{self.QUEUE_KEY}:{priority}"
+
+    def push(self, job_id: str, priority: str = PRIORITY_FREE, front: bool = False) -> None:
+        if front:
+            self.client.lpush(self._key(priority), job_id)
+        else:
+            self.client.rpush(self._key(priority), job_id)
+
+    def pop(self, classes: List[str], timeout: float) -> Optional[Tuple[str, str]]:
+        """(class, job id) from the first non-empty class in `classes`, leased to the caller."""
+        keys = [self.PROCESSING_KEY] + [self._key(c) for c in classes]
+        give_up = time.monotonic() + timeout
+        while True:
+            item = self._claim(keys=keys, args=[time.time() + self.lease_seconds])
+            if item:
+                index, job_id = item
+                return classes[int(index) - 1], job_id
+            remaining = give_up - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(self.POLL_INTERVAL_SECONDS, remaining))
+
+    def ack(self, job_id: str) -> None:
+        """Release a claimed job (finished, or pushed back)."""
+        self.client.zrem(self.PROCESSING_KEY, job_id)
+
+    def extend(self, job_id: str) -> None:
+        """Renew the lease of a running job."""
+        self.client.zadd(self.PROCESSING_KEY, {job_id: time.time() + self.lease_seconds}, xx=True)
+
+    def expired(self) -> List[str]:
+        """Claimed job ids whose lease ran out; each is returned to one caller only."""
+        job_ids = self.client.zrangebyscore(self.PROCESSING_KEY, '-inf', time.time())
+        return [job_id for job_id in job_ids if self.client.zrem(self.PROCESSING_KEY, job_id)]
+
+    def depth(self, priority: Optional[str] = None) -> int:
+        if priority:
+            return int(self.client.llen(self._key(priority)))
+        pipe = self.client.pipeline()
+        for name in PRIORITY_CLASSES:
+            pipe.llen(self._key(name))
+        return sum(int(n) for n in pipe.execute())
+
+
+class OptimizationJobManager:
+    """
+    Owns the job store, the queue and the worker threads of one process.
+
+    Web requests call submit() and return the job id straight away; worker
+    threads pop job ids and run the optimization pipeline inside an app context.
+
+    Workers pick the next priority class by weighted round-robin among the
+    classes under their concurrency quota, and keep
+    OPTIMIZER_PREMIUM_RESERVED_WORKERS workers free of non-premium jobs so
+    premium latency holds while free or batch work saturates the rest.
+
+    A worker holds a lease (OPTIMIZER_JOB_LEASE_SECONDS) on the job it
+    runs and renews it while waiting on the pipeline. Any worker finding an
+    expired lease requeues the job if it never started, and fails it if it
+    was running (its client can retry from the checkpoints).
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.worker_count = int(app.config.get('OPTIMIZER_WORKER_COUNT', 2))
+        self.job_ttl = int(app.config.get('OPTIMIZER_JOB_TTL', 24 * 60 * 60))
+        self.poll_timeout = float(app.config.get('OPTIMIZER_QUEUE_POLL_SECONDS', 2))
+        self.deadline_seconds = float(app.config.get('PIPELINE_DEADLINE_SECONDS', 120))
+        self.batch_deadline_seconds = float(app.config.get('BATCH_OPTIMIZE_DEADLINE_SECONDS', 900))
+        self.cancel_poll_seconds = float(app.config.get('OPTIMIZER_CANCEL_POLL_SECONDS', 1))
+        self.lease_seconds = float(app.config.get('OPTIMIZER_JOB_LEASE_SECONDS', 60))
+
+        # Priority classes: scheduling weights, per-class concurrency quotas
+        # and workers reserved for premium jobs (all per process)
+        self.class_weights = parse_class_settings(app.config.get('OPTIMIZER_CLASS_WEIGHTS'), DEFAULT_WEIGHTS)
+        self.class_quotas = parse_class_settings(
+            app.config.get('OPTIMIZER_CLASS_CONCURRENCY'),
+            {name: self.worker_count for name in PRIORITY_CLASSES}
+        )
+        self.premium_reserved = min(
+            int(app.config.get('OPTIMIZER_PREMIUM_RESERVED_WORKERS', 1)),
+            max(0, self.worker_count - 1)
+        )
+        self.scheduler = WeightedRoundRobin(self.class_weights)
+        self.class_stats = ClassStats()
+        self._running = {name: 0 for name in PRIORITY_CLASSES}
+        self._running_lock = threading.Lock()
+
+        self.backend = 'memory'
+        client = self._connect_redis(app.config.get('JOB_QUEUE_BACKEND', 'auto'))
+        if client is not None:
+            self.store = RedisJobStore(client, self.job_ttl)
+            self.queue = RedisJobQueue(client, self.lease_seconds)
+            self.events = RedisProgressBroker(client, self.job_ttl)
+            self.backend = 'redis'
+        else:
+            self.store = InMemoryJobStore(self.job_ttl)
+            self.queue = InMemoryJobQueue()
+            self.events = InMemoryProgressBroker(self.job_ttl)
+
+        self._pipeline = None
+        self._workers: List[threading.Thread] = []
+        self._workers_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._reap_lock = threading.Lock()
+        self._next_reap = 0.0
+
+        print(f"🧵 Optimization job queue initialized: {self.backend} ({self.worker_count} workers)")
+
+    def _connect_redis(self, backend: str):
+        """Return a sync Redis client, or None to use the in-process queue."""
+        if backend == 'memory' or not REDIS_AVAILABLE:
+            return None
+
+        try:
+            client = redis.Redis.from_url(
+                self.app.config.get('REDIS_URL', 'redis://localhost:6379/0'),
+                decode_responses=True,
+                socket_connect_timeout=5.0
+            )
+            client.ping()
+            return client
+        except Exception as e:
+            if backend == 'redis':
+                raise
+            print(f"⚠️  Redis job queue unavailable, using in-process queue: {str(e)}")
+            return None
+
+    @property
+    def pipeline(self):
+        if self._pipeline is None:
+            from .resume_optimization_pipeline import ResumeOptimizationPipeline
+            self._pipeline = ResumeOptimizationPipeline()
+        return self._pipeline
+
+    def ensure_workers(self) -> None:
+        """Start worker threads for this process (threads do not survive fork)."""
+        with self._lock:
+            if self._workers_pid == os.getpid() and all(w.is_alive() for w in self._workers):
+                return
+
+            self._workers = [w for w in self._workers if w.is_alive() and self._workers_pid == os.getpid()]
+            for index in range(len(self._workers), self.worker_count):
+                worker = threading.Thread(
+                    target=self._worker_loop,
+                    name=f"optimizer-worker-{index}",
+                    daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+            self._workers_pid = os.getpid()
+
+    def submit(
+        self,
+        user_id: int,
+        resume_input: ResumeInput,
+        jd_input: JDInput,
+        options: OptimizationOptions,
+        priority: str = PRIORITY_FREE
+    ) -> OptimizationJob:
+        """
+        Enqueue an optimization request.
+
+        Args:
+            user_id: Owner of the job
+            resume_input: Resume input data
+            jd_input: Job description input
+            options: Optimization options
+            priority: Priority class (premium, free or batch)
+
+        Returns:
+            The queued OptimizationJob
+        """
+        job = OptimizationJob(
+            job_id=uuid.uuid4().hex,
+            user_id=user_id,
+            payload={
+                'resume_input': resume_input.model_dump(mode='json'),
+                'jd_input': jd_input.dict(),
+                'options': options.dict()
+            },
+            priority=priority
+        )
+        self._enqueue(job)
+        print(f"📥 Optimization job queued: {job.job_id} ({job.priority})")
+        return job
+
+    def submit_batch(
+        self,
+        user_id: int,
+        resume_input: ResumeInput,
+        jd_inputs: List[JDInput],
+        options: OptimizationOptions,
+        priority: str = PRIORITY_BATCH
+    ) -> OptimizationJob:
+        """
+        Enqueue a batch optimization of one resume against many job descriptions.
+
+        Args:
+            user_id: Owner of the job
+            resume_input: Resume input data
+            jd_inputs: Job descriptions to optimize against
+            options: Optimization options (shared by every JD)
+            priority: Priority class (batch unless the caller says otherwise)
+
+        Returns:
+            The queued OptimizationJob
+        """
+        job = OptimizationJob(
+            job_id=uuid.uuid4().hex,
+            user_id=user_id,
+            payload={
+                'resume_input': resume_input.model_dump(mode='json'),
+                'jd_inputs': [jd_input.dict() for jd_input in jd_inputs],
+                'options': options.dict()
+            },
+            priority=priority,
+            kind=JOB_KIND_BATCH
+        )
+        self._enqueue(job)
+        print(f"📥 Batch optimization job queued: {job.job_id} ({len(jd_inputs)} job descriptions, {job.priority})")
+        return job
+
+    def retry(self, job: OptimizationJob) -> OptimizationJob:
+        """
+        Queue a new job for a failed one, resuming from its checkpoints.
+
+        Args:
+            job: The failed job
+
+        Returns:
+            The new queued OptimizationJob
+        """
+        retry_job = OptimizationJob(
+            job_id=uuid.uuid4().hex,
+            user_id=job.user_id,
+            payload={**job.payload, 'resume_from': job.request_hash},
+            request_hash=job.request_hash,
+            retry_of=job.job_id,
+            priority=job.priority,
+            kind=job.kind
+        )
+        self._enqueue(retry_job)
+
+        print(f"🔁 Optimization job {job.job_id} retried as {retry_job.job_id}")
+        return retry_job
+
+    def _enqueue(self, job: OptimizationJob) -> None:
+        self.store.save(job)
+        self.publish_event(job.job_id, status_event(JOB_QUEUED))
+        self.queue.push(job.job_id, job.priority)
+        self.ensure_workers()
+
+    def cancel(self, job: OptimizationJob) -> OptimizationJob:
+        """
+        Cancel a queued or running job.
+
+        Queued jobs are marked cancelled straight away; running jobs are
+        flagged and their worker cancels the pipeline on its next check.
+
+        Args:
+            job: The job to cancel
+
+        Returns:
+            The job with its updated status
+        """
+        if job.is_finished:
+            return job
+
+        self.store.request_cancel(job.job_id)
+        if job.status == JOB_QUEUED:
+            job.status = JOB_CANCELLED
+            job.finished_at = time.time()
+            self.store.save(job)
+            self.publish_event(job.job_id, status_event(JOB_CANCELLED))
+
+        print(f"🛑 Cancellation requested for optimization job {job.job_id}")
+        return job
+
+    def get_job(self, job_id: str) -> Optional[OptimizationJob]:
+        return self.store.get(job_id)
+
+    def publish_event(self, job_id: str, event: Dict[str, Any]) -> None:
+        """Publish a progress event for a job; failures never affect the job."""
+        try:
+            self.events.publish(job_id, event)
+        except Exception as e:
+            print(f"⚠️  Failed to publish progress event for {job_id}: {str(e)}")
+
+    def read_events(self, job_id: str, last_event_id: Optional[str], timeout: float):
+        """Progress events after last_event_id, waiting up to timeout seconds."""
+        return self.events.read(job_id, last_event_id, timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue and worker stats; wait times and running counts are for this process."""
+        wait_stats = self.class_stats.snapshot()
+        with self._running_lock:
+            running = dict(self._running)
+        return {
+            'backend': self.backend,
+            'queue_depth': self.queue.depth(),
+            'worker_count': self.worker_count,
+            'workers_alive': sum(1 for w in self._workers if w.is_alive()),
+            'premium_reserved_workers': self.premium_reserved,
+            'classes': {
+                name: {
+                    'queue_depth': self.queue.depth(name),
+                    'running': running[name],
+                    'weight': self.class_weights[name],
+                    'concurrency': self.class_quotas[name],
+                    **wait_stats[name]
+                }
+                for name in PRIORITY_CLASSES
+            }
+        }
+
+    def _has_capacity(self, priority: str) -> bool:
+        """Whether one more job of this class fits its quota (call with _running_lock held)."""
+        if self._running[priority] >= self.class_quotas[priority]:
+            return False
+        if priority != PRIORITY_PREMIUM:
+            non_premium = sum(n for name, n in self._running.items() if name != PRIORITY_PREMIUM)
+            return non_premium < self.worker_count - self.premium_reserved
+        return True
+
+    def _next_job(self) -> Optional[Tuple[str, str]]:
+        """Pop the next (class, job id) this worker may run, or None."""
+        with self._running_lock:
+            eligible = [name for name in PRIORITY_CLASSES if self._has_capacity(name)]
+        order = self.scheduler.order(eligible)
+        if not order:
+            time.sleep(min(self.poll_timeout, 1.0))
+            return None
+
+        item = self.queue.pop(order, self.poll_timeout)
+        if not item:
+            return None
+
+        priority, job_id = item
+        position = order.index(priority)
+        for empty in order[:position]:
+            self.scheduler.reset(empty)
+
+        with self._running_lock:
+            if not self._has_capacity(priority):
+                # Another worker filled the quota meanwhile; put the job back in front
+                self.queue.push(job_id, priority, front=True)
+                self.queue.ack(job_id)
+                return None
+            self._running[priority] += 1
+
+        self.scheduler.record(priority, order[position:])
+        return priority, job_id
+
+    def _reap_expired_jobs(self) -> None:
+        """Requeue or fail jobs whose worker stopped renewing its lease (one thread per interval)."""
+        if time.monotonic() < self._next_reap or not self._reap_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_reap = time.monotonic() + self.lease_seconds / 2
+            for job_id in self.queue.expired():
+                job = self.store.get(job_id)
+                if job is None or job.is_finished:
+                    continue
+                if job.status == JOB_QUEUED:
+                    print(f"♻️  Requeueing optimization job {job_id}: its worker stopped before starting it")
+                    self.queue.push(job_id, job.priority, front=True)
+                    continue
+
+                print(f"❌ Optimization job {job_id} failed: its worker stopped while running it")
+                job.status = JOB_FAILED
+                job.error = 'Worker stopped while running the job'
+                job.finished_at = time.time()
+                self.store.save(job)
+                self.publish_event(job_id, status_event(job.status, result=job.result, error=job.error))
+        finally:
+            self._reap_lock.release()
+
+    def _worker_loop(self) -> None:
+        while True:
+            try:
+                self._reap_expired_jobs()
+                item = self._next_job()
+            except Exception as e:
+                print(f"❌ Job queue pop failed: {str(e)}")
+                time.sleep(self.poll_timeout)
+                continue
+
+            if not item:
+                continue
+
+            priority, job_id = item
+            try:
+                with self.app.app_context():
+                    self._run_job(job_id)
+            finally:
+                with self._running_lock:
+                    self._running[priority] -= 1
+                try:
+                    self.queue.ack(job_id)
+                except Exception as e:
+                    # The lease expires and the reaper skips the finished job
+                    print(f"⚠️  Failed to release optimization job {job_id}: {str(e)}")
+
+    def _run_job(self, job_id: str) -> None:
+        job = self.store.get(job_id)
+        if job is None or job.status != JOB_QUEUED or self.store.is_cancel_requested(job_id):
+            return
+
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        self.class_stats.record_start(job.priority, job.created_at)
+        self.store.save(job)
+        self.publish_event(job_id, status_event(JOB_RUNNING))
+        print(f"⚙️  Running optimization job {job_id}")
+
+        def on_progress(event: Dict[str, Any]) -> None:
+            # Remember the checkpoint key so a failed job can be retried
+            if event.get('request_hash') and event['request_hash'] != job.request_hash:
+                job.request_hash = event['request_hash']
+                self.store.save(job)
+            self.publish_event(job_id, event)
+
+        try:
+            if job.kind == JOB_KIND_BATCH:
+                deadline = Deadline(self.batch_deadline_seconds)
+                future = get_event_loop_runner().submit(self.pipeline._run_batch_optimization(
+                    ResumeInput(**job.payload['resume_input']),
+                    [JDInput(**jd) for jd in job.payload['jd_inputs']],
+                    OptimizationOptions(**job.payload['options']),
+                    job.user_id,
+                    emit=lambda item: self.publish_event(job_id, batch_item_event(**item)),
+                    deadline=deadline
+                ))
+                job.result = self._wait_for_pipeline(job_id, future, deadline)
+            else:
+                deadline = Deadline(self.deadline_seconds)
+                future = get_event_loop_runner().submit(self.pipeline._run_optimization_pipeline(
+                    ResumeInput(**job.payload['resume_input']),
+                    JDInput(**job.payload['jd_input']),
+                    OptimizationOptions(**job.payload['options']),
+                    job.user_id,
+                    progress=on_progress,
+                    resume_from=job.payload.get('resume_from'),
+                    deadline=deadline
+                ))
+                result = self._wait_for_pipeline(job_id, future, deadline)
+                job.result = {
+                    'result_id': result.get('result_id'),
+                    'processing_time_ms': result.get('processing_time_ms')
+                }
+            job.status = JOB_COMPLETED
+        except JobCancelled:
+            print(f"🛑 Optimization job {job_id} cancelled")
+            job.status = JOB_CANCELLED
+            job.error = 'Cancelled by client'
+        except Exception as e:
+            print(f"❌ Optimization job {job_id} failed: {str(e)}")
+            print(traceback.format_exc())
+            job.status = JOB_FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            self.store.save(job)
+            self.publish_event(job_id, status_event(job.status, result=job.result, error=job.error))
+
+    def _wait_for_pipeline(
+        self,
+        job_id: str,
+        future: concurrent.futures.Future,
+        deadline: Deadline
+    ) -> Dict[str, Any]:
+        """
+        Wait for a pipeline run, renewing the job's lease meanwhile and
+        cancelling the run if the client cancels the job or it overruns its
+        deadline.
+
+        Raises:
+            JobCancelled: If the client cancelled the job
+            DeadlineExceeded: If the run ignored its deadline past the grace period
+        """
+        while True:
+            try:
+                return future.result(timeout=self.cancel_poll_seconds)
+            except concurrent.futures.TimeoutError:
+                pass
+
+            try:
+                self.queue.extend(job_id)
+            except Exception as e:
+                print(f"⚠️  Failed to renew lease of optimization job {job_id}: {str(e)}")
+            # cancel() is False when the run finished in the meantime
+            if self.store.is_cancel_requested(job_id) and future.cancel():
+                raise JobCancelled(job_id)
+            if deadline.remaining() < -DEADLINE_GRACE_SECONDS and future.cancel():
+                raise DeadlineExceeded(f"Optimization did not finish within its {deadline.budget:.0f}s deadline")
+
+
+# Global job manager instance
+_job_manager = None
+
+def get_job_manager() -> OptimizationJobManager:
+    """Get the process-wide job manager, starting workers if needed."""
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = OptimizationJobManager(current_app._get_current_object())
+    _job_manager.ensure_workers()
+    return _job_manager
@@ -6,6 +6,7 @@ Curated allowlist of technical skills and keyword extraction logic.
 import re
 from typing import Any, List, Set, Dict, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 
 
 @dataclass
@@ -124,6 +125,15 @@ class TechnicalSkills:
             return 'other'
 
 
+@lru_cache(maxsize=1)
+def _skill_patterns() -> Tuple[Tuple[str, 're.Pattern'], ...]:
+    """Compiled word-boundary pattern for every known skill (built once per process)."""
+    return tuple(
+        (skill, re.compile(r'\b' + re.escape(skill.lower()) + r'\b'))
+        for skill in TechnicalSkills.get_all_skills()
+    )
+
+
 def extract_keywords_from_text(text: str, importance_weights: Dict[str, str] = None) -> List[KeywordMatch]:
     """
     Extract technical keywords from text using curated allowlist.
@@ -141,13 +151,11 @@ def extract_keywords_from_text(text: str, importance_weights: Dict[str, str] = N
     
     text_lower = text.lower()
     sentences = text.split('.')
-    all_skills = TechnicalSkills.get_all_skills()
     matches = []
     
-    for skill in all_skills:
+    for skill, pattern in _skill_patterns():
         # Use word boundaries to avoid partial matches
-        pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-        skill_matches = re.finditer(pattern, text_lower)
+        skill_matches = pattern.finditer(text_lower)
         
         match_positions = list(skill_matches)
         if match_positions:
@@ -0,0 +1,229 @@
+"""
+Page-parallel PDF text extraction.
+pypdf is pure Python and CPU-bound, so long PDFs are split into page ranges
+extracted in a shared process pool and reassembled in page order. Each page
+gets a time limit inside the worker; if a worker still overruns its chunk's
+page budget after starting it, the pool is torn down and recreated so later
+documents are not stuck behind it.
+"""
+
+import os
+import math
+import time
+import itertools
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from flask import current_app
+
+from .extraction import extract_pdf_pages, worker_pool_context
+
+# Extra time a started chunk may take on top of its pages' budget (parsing the PDF, pickling)
+POOL_OVERHEAD_SECONDS = 5
+
+# How often running chunks are checked against their budget
+STUCK_CHECK_SECONDS = 1.0
+
+# Chunk outcomes other than a result
+_STUCK = 'stuck'
+_LOST = 'lost'
+_FAILED = 'failed'
+
+
+# Queue on which a pool worker reports (task id, start time) as it starts a chunk
+_worker_started_queue = None
+
+def _init_worker(started_queue) -> None:
+    global _worker_started_queue
+    _worker_started_queue = started_queue
+
+
+def _extract_chunk(task_id: int, data: bytes, page_indexes: Sequence[int], page_timeout: float) -> Tuple[List[str], List[int]]:
+    # time.monotonic() is system-wide, so the parent can compare it with its own clock
+    _worker_started_queue.put((task_id, time.monotonic()))
+    return extract_pdf_pages(data, page_indexes, page_timeout)
+
+
+class PdfPagePool:
+    """Process pool extracting the pages of long PDFs in parallel."""
+
+    def __init__(self, max_workers: int, min_pages: int = 8, page_timeout: float = 10.0):
+        self.max_workers = max_workers
+        self.min_pages = min_pages
+        self.page_timeout = page_timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._started_queue = None
+        self._started: Dict[int, float] = {}
+        self._task_ids = itertools.count()
+        self._lock = threading.Lock()
+        self.recycled = 0
+
+    def extract(self, data: bytes, page_count: int) -> List[str]:
+        """
+        Extract every page of a PDF, preserving page order.
+
+        Pages that time out come back as empty strings rather than failing
+        the whole document. Chunks lost to a crashed or recycled pool
+        (including one recycled for another document's stuck worker) are
+        retried once on a fresh pool.
+
+        Args:
+            data: PDF file bytes
+            page_count: Number of pages in the document
+
+        Returns:
+            Page texts, one per page
+        """
+        chunk_size = max(1, math.ceil(page_count / (self.max_workers * 2)))
+        chunks = [list(range(start, min(start + chunk_size, page_count))) for start in range(0, page_count, chunk_size)]
+
+        results = self._run_chunks(data, chunks)
+        lost = [i for i, result in enumerate(results) if result is _LOST]
+        if lost:
+            for i, result in zip(lost, self._run_chunks(data, [chunks[i] for i in lost])):
+                results[i] = result
+
+        texts: List[str] = []
+        skipped: List[int] = []
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, tuple):
+                chunk_texts, timed_out = result
+                texts.extend(chunk_texts)
+                skipped.extend(timed_out)
+            else:
+                texts.extend([''] * len(chunk))
+                skipped.extend(chunk)
+
+        if skipped:
+            print(f"⏱️  Skipped {len(skipped)} of {page_count} PDF pages that exceeded {self.page_timeout}s or failed: {skipped[:10]}")
+        return texts
+
+    def _run_chunks(self, data: bytes, chunks: List[List[int]]) -> list:
+        """
+        Run page chunks on the pool.
+
+        The pool is shared with other documents, so there is no deadline
+        for the whole document: a chunk is only considered stuck once a
+        worker has been running it for longer than its pages' budget (the
+        per-page limit inside the worker should make that impossible).
+
+        Returns:
+            Per chunk: (texts, timed-out pages), _STUCK if its worker
+            overran, _LOST if the pool failed underneath it, or _FAILED if
+            extraction raised
+        """
+        executor, started_queue = self._get_executor()
+        task_ids = [next(self._task_ids) for _ in chunks]
+        try:
+            futures = [
+                executor.submit(_extract_chunk, task_id, data, chunk, self.page_timeout)
+                for task_id, chunk in zip(task_ids, chunks)
+            ]
+        except (BrokenProcessPool, RuntimeError):  # broken, or shut down by a recycle
+            self._recycle(executor)
+            return [_LOST] * len(chunks)
+
+        budgets = {future: self.page_timeout * len(chunk) + POOL_OVERHEAD_SECONDS for future, chunk in zip(futures, chunks)}
+        future_ids = dict(zip(futures, task_ids))
+        pending = set(futures)
+        stuck = set()
+        while pending and not stuck:
+            _, pending = wait(pending, timeout=STUCK_CHECK_SECONDS)
+            started = self._started_times(started_queue, [future_ids[future] for future in pending])
+            now = time.monotonic()
+            stuck = {
+                future for future in pending
+                if future_ids[future] in started and now - started[future_ids[future]] > budgets[future]
+            }
+
+        if stuck:
+            self._recycle(executor)
+            # This document's other chunks die with the pool; let them resolve as lost
+            wait(pending - stuck, timeout=POOL_OVERHEAD_SECONDS)
+
+        results = []
+        for future in futures:
+            if future in stuck:
+                results.append(_STUCK)
+            elif not future.done() or future.cancelled() or isinstance(future.exception(), BrokenProcessPool):
+                results.append(_LOST)
+            elif future.exception() is not None:
+                results.append(_FAILED)
+            else:
+                results.append(future.result())
+
+        # Every start report was sent before its result, so none arrives after this
+        self._started_times(started_queue, [])
+        with self._lock:
+            for task_id in task_ids:
+                self._started.pop(task_id, None)
+
+        if _LOST in results:
+            self._recycle(executor)
+        return results
+
+    def _started_times(self, started_queue, task_ids: List[int]) -> Dict[int, float]:
+        """Collect workers' start reports; start times of the given tasks that have started."""
+        with self._lock:
+            if started_queue is self._started_queue:
+                while not started_queue.empty():
+                    task_id, started = started_queue.get()
+                    self._started[task_id] = started
+            return {task_id: self._started[task_id] for task_id in task_ids if task_id in self._started}
+
+    def _get_executor(self) -> Tuple[ProcessPoolExecutor, object]:
+        with self._lock:
+            if self._executor is None:
+                context = worker_pool_context()
+                self._started_queue = context.SimpleQueue()
+                # Never fork the multi-threaded web process (see worker_pool_context)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(self._started_queue,)
+                )
+            return self._executor, self._started_queue
+
+    def _recycle(self, executor: ProcessPoolExecutor) -> None:
+        """Kill a pool with stuck or dead workers; the next document gets a fresh one."""
+        with self._lock:
+            if self._executor is not executor:
+                return  # another thread already replaced it
+            self._executor = None
+            self._started_queue = None
+            self.recycled += 1
+
+        print("♻️  Recycling PDF extraction pool after a stuck or crashed worker")
+        # shutdown() alone waits on running tasks forever; terminate the workers first
+        for process in list((getattr(executor, '_processes', None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global PDF page pool instance
+_pdf_page_pool = None
+_pdf_page_pool_initialized = False
+
+def get_pdf_page_pool() -> Optional[PdfPagePool]:
+    """
+    Get the process-wide PDF page pool, configured from the current app.
+
+    Returns None when page-parallel extraction is disabled
+    (PDF_PARALLEL_MIN_PAGES = 0 or a single worker).
+    """
+    global _pdf_page_pool, _pdf_page_pool_initialized
+    if not _pdf_page_pool_initialized:
+        min_pages = int(current_app.config.get('PDF_PARALLEL_MIN_PAGES', 8))
+        max_workers = int(current_app.config.get('PDF_EXTRACT_WORKERS', 0)) or os.cpu_count() or 1
+        if min_pages > 0 and max_workers > 1:
+            _pdf_page_pool = PdfPagePool(
+                max_workers=max_workers,
+                min_pages=min_pages,
+                page_timeout=float(current_app.config.get('PDF_PAGE_TIMEOUT_SECONDS', 10))
+            )
+            print(f"📑 PDF page pool: {max_workers} workers for PDFs with {min_pages}+ pages")
+        _pdf_page_pool_initialized = True
+    return _pdf_page_pool
@@ -0,0 +1,129 @@
+"""
+Progress events for optimization jobs.
+Workers publish stage events as the pipeline advances; the SSE endpoint reads
+them back. Redis Streams are used when Redis is available so any gunicorn
+worker can serve the stream, with an in-process fallback.
+"""
+
+import json
+import time
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Pipeline stages reported to clients: stage -> (step, percent, message)
+PROGRESS_STAGES = {
+    'extract': (1, 20, 'Resume text extracted'),
+    'normalize': (2, 45, 'Resume structured'),
+    'analyze': (3, 85, 'Gap analysis and optimization complete'),
+    'persist': (4, 100, 'Results saved'),
+}
+
+
+def stage_event(stage: str, **data) -> Dict[str, Any]:
+    """Build a 'stage' progress event for one of PROGRESS_STAGES."""
+    step, percent, message = PROGRESS_STAGES[stage]
+    return {
+        'type': 'stage',
+        'stage': stage,
+        'step': step,
+        'progress': percent,
+        'message': message,
+        'timestamp': time.time(),
+        **data
+    }
+
+
+def status_event(status: str, **data) -> Dict[str, Any]:
+    """Build a job 'status' event (queued / running / completed / failed)."""
+    return {'type': 'status', 'status': status, 'timestamp': time.time(), **data}
+
+
+def batch_item_event(**data) -> Dict[str, Any]:
+    """Build a 'batch_item' event: one job description of a batch job finished."""
+    return {'type': 'batch_item', 'timestamp': time.time(), **data}
+
+
+class InMemoryProgressBroker:
+    """Per-process event log used when Redis is unavailable."""
+
+    def __init__(self, ttl: int, max_events: int = 100):
+        self.ttl = ttl
+        self.max_events = max_events
+        self._events: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        self._updated: Dict[str, float] = {}
+        self._sequence = 0
+        self._condition = threading.Condition()
+
+    def publish(self, job_id: str, event: Dict[str, Any]) -> str:
+        with self._condition:
+            self._evict_expired()
+            self._sequence += 1
+            events = self._events.setdefault(job_id, [])
+            events.append((self._sequence, event))
+            del events[:-self.max_events]
+            self._updated[job_id] = time.time()
+            self._condition.notify_all()
+            return str(self._sequence)
+
+    def read(
+        self,
+        job_id: str,
+        last_id: Optional[str],
+        timeout: float
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Events after last_id, waiting up to timeout seconds for new ones."""
+        after = int(last_id) if last_id and last_id.isdigit() else 0
+
+        def pending():
+            return [(str(seq), event) for seq, event in self._events.get(job_id, []) if seq > after]
+
+        with self._condition:
+            self._condition.wait_for(lambda: bool(pending()), timeout=timeout)
+            return pending()
+
+    def _evict_expired(self) -> None:
+        now = time.time()
+        expired = [k for k, ts in self._updated.items() if now - ts > self.ttl]
+        for key in expired:
+            self._events.pop(key, None)
+            self._updated.pop(key, None)
+
+
+class RedisProgressBroker:
+    """Event log per job in a Redis Stream, shared by every gunicorn worker."""
+
+    KEY_PREFIX = 'optimizer:events:'
+
+    def __init__(self, client, ttl: int, max_events: int = 100):
+        self.client = client
+        self.ttl = ttl
+        self.max_events = max_events
+
+    def publish(self, job_id: str, event: Dict[str, Any]) -> str:
+        key = f"{self.KEY_PREFIX}{job_id}"
+        pipe = self.client.pipeline()
+        pipe.xadd(key, {'data': json.dumps(event, default=str)}, maxlen=self.max_events, approximate=True)
+        pipe.expire(key, self.ttl)
+        event_id, _ = pipe.execute()
+        return event_id
+
+    def read(
+        self,
+        job_id: str,
+        last_id: Optional[str],
+        timeout: float
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Events after last_id, blocking up to timeout seconds for new ones."""
+        if not last_id or '-' not in last_id:
+            last_id = '0-0'
+        response = self.client.xread(
+            {f"{self.KEY_PREFIX}{job_id}": last_id},
+            count=self.max_events,
+            block=max(1, int(timeout * 1000))
+        )
+        events = []
+        for _, entries in response or []:
+            for event_id, fields in entries:
+                events.append((event_id, json.loads(fields['data'])))
+        return events
@@ -0,0 +1,292 @@
+"""
+Recruiter mode: rank many resumes against one job description.
+Uses only the deterministic scoring stack (keyword extraction, skill
+coverage, TransparentScoring and optional embedding similarity) - no LLM
+calls. JD analysis is done once; resume extraction and keyword analysis
+run in a long-lived process pool shared by every ranking run.
+"""
+
+import os
+import re
+import zipfile
+import threading
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .extraction import SUPPORTED_EXTENSIONS, extract_text_from_file_bytes, get_extension, worker_pool_context
+from .keywords import extract_jd_requirements, extract_keywords_from_text, calculate_skill_coverage
+from .policy import TransparentScoring
+
+
+# Section headers used for the completeness component of the score
+SECTION_PATTERNS = {
+    'summary': re.compile(r'^\s*(professional\s+)?(summary|profile|objective|about me)\b', re.I | re.M),
+    'experience': re.compile(r'^\s*(work\s+|professional\s+)?(experience|employment|work history)\b', re.I | re.M),
+    'skills': re.compile(r'^\s*(technical\s+|core\s+)?(skills|competencies|technologies)\b', re.I | re.M),
+    'education': re.compile(r'^\s*(education|academic)\b', re.I | re.M),
+    'projects': re.compile(r'^\s*(projects|portfolio)\b', re.I | re.M),
+    'certifications': re.compile(r'^\s*(certifications?|licenses?)\b', re.I | re.M),
+}
+
+# Truncate resume text sent to the embedder (most models cap input length)
+MAX_EMBED_CHARS = 8000
+
+
+@dataclass
+class JDProfile:
+    """Job description analysis shared by every resume in a ranking run."""
+    text: str
+    required_skills: List[str]
+    importance_map: Dict[str, str]
+    embedding: Optional[List[float]] = None
+
+
+@dataclass
+class ResumeAnalysis:
+    """Deterministic per-resume analysis produced in a worker process."""
+    filename: str
+    text: str = ''
+    keyword_analysis: Dict[str, Any] = field(default_factory=dict)
+    sections: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+def build_jd_profile(jd_text: str) -> JDProfile:
+    """Extract JD requirements once for the whole ranking run."""
+    required_skills, importance_map = extract_jd_requirements(jd_text)
+    return JDProfile(text=jd_text, required_skills=required_skills, importance_map=importance_map)
+
+
+def detect_sections(text: str) -> Dict[str, str]:
+    """Map section name -> header found, for the sections present in the text."""
+    sections = {}
+    for name, pattern in SECTION_PATTERNS.items():
+        match = pattern.search(text)
+        if match:
+            sections[name] = match.group(0).strip()
+    return sections
+
+
+def analyze_resume(filename: str, data: bytes, jd_profile: JDProfile) -> ResumeAnalysis:
+    """
+    Extract text and compute keyword coverage for one resume file.
+
+    Args:
+        filename: Resume file name
+        data: File bytes
+        jd_profile: Shared JD analysis
+
+    Returns:
+        ResumeAnalysis (with error set instead of raising)
+    """
+    try:
+        text = extract_text_from_file_bytes(filename, data)
+        resume_keywords = [m.keyword for m in extract_keywords_from_text(text, jd_profile.importance_map)]
+        keyword_analysis = calculate_skill_coverage(
+            resume_keywords, jd_profile.required_skills, jd_profile.importance_map
+        )
+        keyword_analysis['importance_map'] = jd_profile.importance_map
+        return ResumeAnalysis(
+            filename=filename,
+            text=text,
+            keyword_analysis=keyword_analysis,
+            sections=detect_sections(text)
+        )
+    except Exception as e:
+        return ResumeAnalysis(filename=filename, error=str(e))
+
+
+# Process-wide analysis pools, by worker count
+_analysis_pools: Dict[int, ProcessPoolExecutor] = {}
+_analysis_pools_lock = threading.Lock()
+
+def get_analysis_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Get the long-lived resume analysis pool with max_workers workers (created on first use)."""
+    with _analysis_pools_lock:
+        executor = _analysis_pools.get(max_workers)
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=worker_pool_context())
+            _analysis_pools[max_workers] = executor
+        return executor
+
+
+def _discard_analysis_pool(executor: ProcessPoolExecutor) -> None:
+    """Drop a broken pool; the next ranking run gets a fresh one."""
+    with _analysis_pools_lock:
+        for max_workers, pool in list(_analysis_pools.items()):
+            if pool is executor:
+                del _analysis_pools[max_workers]
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _reset_after_fork() -> None:
+    # The parent's pools (and their worker processes) belong to the parent
+    global _analysis_pools_lock
+    _analysis_pools.clear()
+    _analysis_pools_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class ResumeRanker:
+    """Ranks resume files against a single job description."""
+
+    def __init__(
+        self,
+        jd_text: str,
+        use_embeddings: bool = False,
+        max_workers: Optional[int] = None,
+        embed_batch_size: int = 64
+    ):
+        self.jd_profile = build_jd_profile(jd_text)
+        self.use_embeddings = use_embeddings
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.embed_batch_size = embed_batch_size
+
+    def analyze(self, files: Iterable[Tuple[str, bytes]]) -> List[ResumeAnalysis]:
+        """Extract and keyword-analyze resumes, in parallel when worthwhile."""
+        files = list(files)
+        if self.max_workers <= 1 or len(files) < 2 * self.max_workers:
+            return [analyze_resume(name, data, self.jd_profile) for name, data in files]
+
+        # The JD profile travels with each chunk of tasks (pickled once per chunk)
+        chunksize = max(1, len(files) // (self.max_workers * 4))
+        filenames, payloads = zip(*files)
+        executor = get_analysis_pool(self.max_workers)
+        try:
+            return list(executor.map(analyze_resume, filenames, payloads, repeat(self.jd_profile), chunksize=chunksize))
+        except BrokenProcessPool:
+            _discard_analysis_pool(executor)
+            raise
+
+    def rank(self, files: Iterable[Tuple[str, bytes]]) -> List[Dict[str, Any]]:
+        """
+        Score and rank resumes.
+
+        Args:
+            files: (filename, bytes) pairs
+
+        Returns:
+            Ranked list (best first); files that failed to parse come last
+            with an 'error' field
+        """
+        analyses = self.analyze(files)
+        parsed = [a for a in analyses if not a.error]
+        failed = [a for a in analyses if a.error]
+
+        similarities = self._embedding_similarities(parsed) if self.use_embeddings else [0.0] * len(parsed)
+
+        ranked = []
+        for analysis, similarity in zip(parsed, similarities):
+            score = TransparentScoring.calculate_match_score(
+                keyword_analysis=analysis.keyword_analysis,
+                semantic_analysis={'semantic_similarity': similarity, 'total_chunks_analyzed': 1},
+                gap_analysis={},
+                resume_sections=analysis.sections
+            )
+            ranked.append({
+                'filename': analysis.filename,
+                'overall_score': score['overall_score'],
+                'letter_grade': score['score_letter_grade'],
+                'keyword_coverage': analysis.keyword_analysis.get('coverage_score', 0.0),
+                'semantic_similarity': round(similarity, 3),
+                'matched_keywords': sorted(analysis.keyword_analysis.get('matched_keywords', [])),
+                'missing_keywords': sorted(analysis.keyword_analysis.get('missing_keywords', [])),
+                'critical_missing': sorted(analysis.keyword_analysis.get('critical_missing', [])),
+                'component_scores': {
+                    name: component['raw_score'] for name, component in score['component_scores'].items()
+                }
+            })
+
+        ranked.sort(key=lambda r: (r['overall_score'], r['keyword_coverage']), reverse=True)
+        for position, result in enumerate(ranked, start=1):
+            result['rank'] = position
+
+        ranked.extend({'filename': a.filename, 'rank': None, 'error': a.error} for a in failed)
+        return ranked
+
+    def _embedding_similarities(self, analyses: List[ResumeAnalysis]) -> List[float]:
+        """
+        Cosine similarity of each resume to the JD, embedding in batches (needs app context).
+
+        Returns:
+            One similarity per analysis, in the same order (filenames need
+            not be unique, e.g. the same name in two zip folders)
+        """
+        from providers import get_models
+        from utils import run_sync
+        from .embedding import cosine_similarity
+
+        embedder, _ = get_models()
+        if self.jd_profile.embedding is None:
+            self.jd_profile.embedding = run_sync(embedder.embed([self.jd_profile.text.strip()]))[0]
+
+        similarities = []
+        for start in range(0, len(analyses), self.embed_batch_size):
+            batch = analyses[start:start + self.embed_batch_size]
+            embeddings = run_sync(embedder.embed([a.text[:MAX_EMBED_CHARS] for a in batch]))
+            similarities.extend(cosine_similarity(embedding, self.jd_profile.embedding) for embedding in embeddings)
+        return similarities
+
+
+def _is_resume_member(info: zipfile.ZipInfo) -> bool:
+    name = os.path.basename(info.filename)
+    return not info.is_dir() and not name.startswith('.') and get_extension(name) in SUPPORTED_EXTENSIONS
+
+
+def count_zip_resumes(zip_source) -> int:
+    """Number of supported resume files in a zip archive (reads only its directory)."""
+    with zipfile.ZipFile(zip_source) as archive:
+        return sum(1 for info in archive.infolist() if _is_resume_member(info))
+
+
+def iter_zip_resumes(
+    zip_source,
+    max_files: Optional[int] = None,
+    max_file_bytes: Optional[int] = None
+) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yield (filename, bytes) for supported resume files inside a zip archive.
+
+    Args:
+        zip_source: Path or binary file object of the zip
+        max_files: Stop with ValueError after this many resumes
+        max_file_bytes: Skip members whose uncompressed size exceeds this
+    """
+    with zipfile.ZipFile(zip_source) as archive:
+        count = 0
+        for info in archive.infolist():
+            if not _is_resume_member(info):
+                continue
+            if max_file_bytes and info.file_size > max_file_bytes:
+                print(f"⚠️  Skipping oversized resume in archive: {info.filename}")
+                continue
+            count += 1
+            if max_files and count > max_files:
+                raise ValueError(f"Archive contains more than {max_files} resumes")
+            yield info.filename, archive.read(info)
+
+
+def iter_directory_resumes(directory: str) -> Iterator[Tuple[str, bytes]]:
+    """Yield (relative filename, bytes) for supported resume files under a directory."""
+    for root, _, filenames in os.walk(directory):
+        for name in sorted(filenames):
+            if name.startswith('.') or get_extension(name) not in SUPPORTED_EXTENSIONS:
+                continue
+            path = os.path.join(root, name)
+            with open(path, 'rb') as f:
+                yield os.path.relpath(path, directory), f.read()
+
+
+def iter_resume_source(path: str) -> Iterator[Tuple[str, bytes]]:
+    """Resumes from a directory or a .zip file path."""
+    if os.path.isdir(path):
+        return iter_directory_resumes(path)
+    if zipfile.is_zipfile(path):
+        return iter_zip_resumes(path)
+    raise ValueError(f"Expected a directory or zip archive: {path}")
@@ -5,24 +5,35 @@ from flask import Flask,request,render_template,jsonify,current_app
 from io import BytesIO
 from weasyprint import HTML, CSS
 import os
+import copy
 import time
 from db import db
-from typing import Dict, Any,Optional,Tuple,List
+from typing import Dict, Any,Optional,Tuple,List,Callable
 from schemas import (
     ResumeInput, JDInput, OptimizationOptions, OptimizationResult
 )
 import asyncio
 from models import Resume , ResumeOptimization,User
 from datetime import datetime
-from services.resume.cache import get_enhanced_cache
+from services.resume.cache import get_enhanced_cache, get_cache_manager, CacheKeyGenerator
 from services.resume.document_processor import DocumentProcessor
 from services.resume.storage import store_resume_files_sync, generate_resume_hash_sync
-from services.resume.embedding import perform_gap_analysis_sync
+from services.resume.embedding import perform_gap_analysis_sync, analyze_semantic_gaps
+from services.resume.chunking import chunk_resume
+from providers import get_embed_model_name
 from services.resume.rewrite import optimize_resume_sync
 from services.resume.explain import generate_explanations_sync
 from services.resume.policy import apply_guardrails_sync, score_resume_match
 from services.resume.formatting import create_docx_sync, create_pdf_sync
-from utils import _to_safe_float , _to_safe_list, _to_safe_dict, _to_safe_string
+from services.resume.keywords import extract_jd_requirements
+from services.resume.stages import StageGraph
+from services.resume.singleflight import get_single_flight
+from services.resume.progress import stage_event
+from services.resume.checkpoints import get_pipeline_checkpoints
+from utils import _to_safe_float , _to_safe_list, _to_safe_dict, _to_safe_string, run_sync
+from utils import Deadline, DeadlineExceeded, with_deadline
+from utils.deadline import set_current_deadline, reset_current_deadline
+from utils.prompts import NORMALIZATION_PROMPT_VERSION, OPTIMIZATION_PROMPT_VERSION
 class ResumeOptimizationPipeline:
 
     def __init__(self):
@@ -38,66 +49,216 @@ class ResumeOptimizationPipeline:
         resume_input: ResumeInput,
         jd_input: JDInput, 
         options: OptimizationOptions,
-        user_id:str
+        user_id:str,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        resume_from: Optional[str] = None,
+        deadline: Optional[Deadline] = None
     ) -> Dict[str, Any]:
         """
         Execute the complete optimization pipeline - simplified without user tracking.
+
+        Steps run as a StageGraph: with PIPELINE_SEMANTIC_ANALYSIS on, the
+        JD keywords and embedding used by the semantic analysis are computed
+        while the resume is extracted. Per-stage wall times are returned in
+        'stage_timings_ms'.
+        Normalization and analysis are served from the result cache when
+        possible and otherwise coalesced with identical in-flight requests
+        (see SingleFlight); each caller still saves its own result.
+        Stage outputs are checkpointed under the request hash until the
+        result is persisted, so a retry skips the stages that already ran.
+        Every stage runs against one request deadline: LLM retries and
+        fallbacks that cannot finish in time are skipped and the run fails
+        with DeadlineExceeded instead of outliving the client.
         
         Args:
             resume_input: Resume input data
             jd_input: Job description input
             options: Optimization options
-            request_hash: Unique request identifier
+            user_id: Owner of the result
+            progress: Optional callback receiving a progress event as each
+                stage (extract, normalize, analyze, persist) finishes
+            resume_from: Request hash of a failed run to resume; its
+                extracted text is used instead of re-reading the input
+            deadline: Time budget for the whole run (defaults to
+                PIPELINE_DEADLINE_SECONDS from now)
             
         Returns:
             Complete optimization result
         """
+        deadline = deadline or Deadline(float(current_app.config.get('PIPELINE_DEADLINE_SECONDS', 120)))
+        deadline_token = set_current_deadline(deadline)
         try:
             request_start_time = time.time()
-            # Step 1: Ingest and parse resume
-            print("📄 Step 1: Ingesting resume...")
+            reported_stages = set()
+
+            async def report(stage: str, **data):
+                if stage not in reported_stages:
+                    reported_stages.add(stage)
+                    await self._report_progress(progress, stage, **data)
+
             document_processor_instance = self.document_processor
-    
-            parsed_resume = await document_processor_instance.process_document(
-                text=resume_input.text,
-                docx_url=resume_input.docx_url,
-                pdf_url=resume_input.pdf_url
-            )
-   
-            # Generate request hash for caching and tracking
-            print("🔍 Step 2: Generating request hash...")
-            request_hash = generate_resume_hash_sync(
-                resume_text=resume_input.text ,
-                jd_text=jd_input.text,
-                options=options.dict()
-            )
-        
-            print("🔍 Step 3: Analyzing gaps and optimizing...")
-            comprehensive_result = await self._document_processor.analyze_and_optimize(
-                normalized_resume=parsed_resume,  # NormalizedResumeSchema structure
-                jd_text=jd_input.text,
-                jd_title=jd_input.title,
-                optimization_focus=options.tone
-            )
-            
             model_provider = current_app.config.get('MODEL_PROVIDER', 'unknown')
-            
+            semantic_enabled = current_app.config.get('PIPELINE_SEMANTIC_ANALYSIS', False)
+            checkpoints = get_pipeline_checkpoints()
+
+            # Each stage declares what it needs; JD-only work overlaps with
+            # resume extraction and LLM normalization.
+            async def extract_stage(_):
+                saved = await checkpoints.load(resume_from, 'extract')
+                if saved:
+                    return tuple(saved)
+
+                print("📄 Step 1: Ingesting resume...")
+                return await document_processor_instance.extract_raw_text(
+                    text=resume_input.text,
+                    docx_url=resume_input.docx_url,
+                    pdf_url=resume_input.pdf_url,
+                    file_bytes=resume_input.file_bytes,
+                    file_type=resume_input.file_type
+                )
+
+            async def cache_key_stage(deps):
+                raw_text, _ = deps['extract']
+                return self._cache_key_data(raw_text, jd_input, options)
+
+            async def request_hash_stage(deps):
+                # Generate request hash for caching and tracking
+                print("🔍 Step 2: Generating request hash...")
+                raw_text, input_type = deps['extract']
+                request_hash = generate_resume_hash_sync(
+                    resume_text=raw_text,
+                    jd_text=jd_input.text,
+                    options=options.dict()
+                )
+                await checkpoints.save(request_hash, 'extract', [raw_text, input_type])
+                await report('extract', request_hash=request_hash)
+                return request_hash
+
+            async def jd_clean_stage(_):
+                return " ".join((jd_input.text or "").split())
+
+            async def jd_requirements_stage(deps):
+                required_skills, importance_map = await asyncio.to_thread(
+                    extract_jd_requirements, deps['jd_clean']
+                )
+                return {'required_skills': required_skills, 'importance_map': importance_map}
+
+            async def jd_embedding_stage(deps):
+                # Optional input: the semantic analysis embeds the JD itself without it
+                try:
+                    return await self._embed_job_description(deps['jd_clean'])
+                except DeadlineExceeded:
+                    raise
+                except Exception as e:
+                    print(f"⚠️  JD embedding failed: {str(e)}")
+                    return None
+
+            async def optimize_stage(deps):
+                raw_text, input_type = deps['extract']
+                request_hash = deps['request_hash']
+
+                saved = await checkpoints.load(request_hash, 'optimize')
+                if saved:
+                    await report('normalize', cached=True)
+                    await report('analyze', cached=True)
+                    return saved
+
+                async def normalize_and_analyze():
+                    stage_start = time.perf_counter()
+                    print("normalized raw text.....")
+                    saved_normalization = await checkpoints.load(request_hash, 'normalize')
+                    if saved_normalization:
+                        parsed = saved_normalization['parsed_resume']
+                        normalization_key = saved_normalization['normalization_key']
+                    else:
+                        deadline.check("normalization")
+                        parsed, normalization_key = await self._normalize_with_cache(raw_text, input_type, user_id)
+                        await checkpoints.save(request_hash, 'normalize', {
+                            'parsed_resume': parsed,
+                            'normalization_key': normalization_key
+                        })
+                    print("normalizing raw text done")
+                    graph.timings_ms['normalize'] = round((time.perf_counter() - stage_start) * 1000, 2)
+                    await report('normalize')
+
+                    stage_start = time.perf_counter()
+                    print("🔍 Step 3: Analyzing gaps and optimizing...")
+                    # Embedding analysis of the resume chunks overlaps with the LLM call
+                    semantic_task = None
+                    if semantic_enabled:
+                        semantic_task = asyncio.create_task(self._semantic_analysis(
+                            parsed,
+                            deps['jd_clean'],
+                            jd_embedding=deps['jd_embedding'],
+                            jd_keywords=deps['jd_requirements']['required_skills']
+                        ))
+                    try:
+                        result = await document_processor_instance.analyze_and_optimize(
+                            normalized_resume=parsed,  # NormalizedResumeSchema structure
+                            jd_text=jd_input.text,
+                            jd_title=jd_input.title,
+                            optimization_focus=options.tone,
+                            deadline=deadline
+                        )
+                        if semantic_task is not None:
+                            result['semantic_analysis'] = await semantic_task
+                    finally:
+                        if semantic_task is not None and not semantic_task.done():
+                            semantic_task.cancel()
+                    graph.timings_ms['analyze'] = round((time.perf_counter() - stage_start) * 1000, 2)
+                    return {'parsed_resume': parsed, 'normalization_key': normalization_key, 'optimization': result}
+
+                outcome = await self._optimize_with_cache(deps['cache_key'], normalize_and_analyze)
+                # Cache hits and coalesced followers skip the steps above
+                cached = outcome['optimization'].get('cache_hit') or outcome['optimization'].get('coalesced')
+                await report('normalize', cached=bool(cached))
+                await report('analyze', cached=bool(cached))
+                await checkpoints.save(request_hash, 'optimize', outcome)
+                return outcome
+
+            graph = StageGraph()
+            graph.add_stage('extract', extract_stage)
+            graph.add_stage('cache_key', cache_key_stage, depends_on=['extract'])
+            graph.add_stage('request_hash', request_hash_stage, depends_on=['extract'])
+            optimize_deps = ['extract', 'cache_key', 'request_hash']
+            if semantic_enabled:
+                # JD-only inputs of the semantic analysis, ready before normalization finishes
+                graph.add_stage('jd_clean', jd_clean_stage)
+                graph.add_stage('jd_requirements', jd_requirements_stage, depends_on=['jd_clean'])
+                graph.add_stage('jd_embedding', jd_embedding_stage, depends_on=['jd_clean'])
+                optimize_deps += ['jd_clean', 'jd_requirements', 'jd_embedding']
+            graph.add_stage('optimize', optimize_stage, depends_on=optimize_deps)
+
+            stage_results = await graph.run()
+            parsed_resume = stage_results['optimize']['parsed_resume']
+            comprehensive_result = stage_results['optimize']['optimization']
+
             total_time = (time.time() - request_start_time) * 1000
             # Save to database
             print("saving to database....")
-            result_id = self.save_optimization_to_db(
+            persist_start = time.perf_counter()
+            result_id = await asyncio.to_thread(
+                self.save_optimization_to_db,
                 user_id=user_id,
                 resume_input_metadata=resume_input,
                 processed_resume=parsed_resume,
                 jd_input=jd_input,
                 optimization_result=comprehensive_result,
                 processing_time_ms=total_time,
-                model_provider=model_provider
+                model_provider=model_provider,
+                normalization_key=stage_results['optimize'].get('normalization_key')
             )
+            graph.timings_ms['persist'] = round((time.perf_counter() - persist_start) * 1000, 2)
+            await checkpoints.clear(stage_results['request_hash'])
+            await report('persist', result_id=result_id)
             print("saving to database done.")
 
             
             comprehensive_result['processing_time_ms'] = round(total_time, 2)
+            comprehensive_result['result_id'] = result_id
+            comprehensive_result['request_hash'] = stage_results['request_hash']
+            comprehensive_result['stage_timings_ms'] = graph.timings_ms
+            print(f"⏱️  Stage timings (ms): {graph.timings_ms}")
             print(f"✅ Optimization complete in {total_time:.0f}ms")
             # print("🛡️  Step 6: Applying guardrails...")
             # clean_resume, policy_violations = apply_guardrails_sync(optimized_resume)
@@ -107,17 +268,344 @@ class ResumeOptimizationPipeline:
         
             # docx_bytes = create_docx_sync(optimized_resume, contact_info)
             # pdf_bytes = create_pdf_sync(optimized_resume, contact_info) if options.include_pdf else None
-            return 200
+            return comprehensive_result
+        finally:
+            reset_current_deadline(deadline_token)
+
+
+    async def _report_progress(
+        self,
+        progress: Optional[Callable[[Dict[str, Any]], None]],
+        stage: str,
+        **data
+    ):
+        """Send a stage event to the progress callback without blocking the loop."""
+        if progress is None:
+            return
+        try:
+            await asyncio.to_thread(progress, stage_event(stage, **data))
+        except Exception as e:
+            print(f"⚠️  Progress report failed for stage {stage}: {str(e)}")
+
+    def _cache_key_data(self, raw_text: str, jd_input: JDInput, options: OptimizationOptions) -> Dict[str, Any]:
+        """Inputs identifying an optimization for the result cache and single-flight."""
+        return {
+            'resume_text': raw_text,
+            'jd_text': jd_input.text or "",
+            'options': options.dict(),
+            'model_info': self._get_model_info()
+        }
+
+    async def _optimize_with_cache(self, cache_key_data: Dict[str, Any], compute_func) -> Dict[str, Any]:
+        """
+        Return the optimization outcome for cache_key_data, computing it only
+        when needed.
+
+        Consults the result cache first (optionally stale-while-revalidate),
+        then coalesces identical in-flight requests before calling compute_func.
+
+        Args:
+            cache_key_data: Output of _cache_key_data
+            compute_func: Coroutine factory returning
+                {'parsed_resume', 'normalization_key', 'optimization'}
+
+        Returns:
+            A private copy of the outcome dict, safe to mutate
+        """
+        async def compute():
+            # Identical in-flight requests share one run
+            if not current_app.config.get('SINGLE_FLIGHT_ENABLED', True):
+                return await compute_func()
+            request_key = CacheKeyGenerator.request_key(**cache_key_data)
+            # Followers stop waiting on the leader once their own deadline passes
+            outcome, shared = await with_deadline(get_single_flight().do(request_key, compute_func), "optimization")
+            outcome['optimization']['coalesced'] = shared
+            return outcome
+
+        if not current_app.config.get('RESULT_CACHE_ENABLED', True):
+            return await compute()
+
+        # Result cache keyed on resume text, JD, options and model/prompt versions
+        outcome, cache_hit = await get_cache_manager().get_or_process(
+            cache_key_data,
+            compute,
+            ttl=int(current_app.config.get('RESULT_CACHE_TTL', 24 * 60 * 60)),
+            stale_while_revalidate=int(current_app.config.get('RESULT_CACHE_STALE_WHILE_REVALIDATE', 0))
+        )
+        outcome = copy.deepcopy(outcome)  # callers mutate the result; keep the cached copy intact
+        outcome['optimization']['cache_hit'] = cache_hit
+        outcome['optimization']['cache_stale'] = bool(outcome.get('stale'))
+        return outcome
+
+    async def _run_batch_optimization(
+        self,
+        resume_input: ResumeInput,
+        jd_inputs: List[JDInput],
+        options: OptimizationOptions,
+        user_id: int,
+        emit: Optional[Callable[[Dict[str, Any]], None]] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
+        """
+        Optimize one resume against many job descriptions (batch job).
+
+        The resume is extracted and normalized once; analyze_and_optimize then
+        runs for every JD concurrently (capped by BATCH_OPTIMIZE_CONCURRENCY)
+        and each result is saved as its own optimization record. The whole
+        batch runs against one deadline; JDs still outstanding when it
+        passes fail instead of running on.
+
+        Args:
+            resume_input: Resume input data
+            jd_inputs: Job descriptions to optimize against
+            options: Optimization options (shared by every JD)
+            user_id: Owner of the results
+            emit: Called (off the event loop) with one event dict per JD as
+                soon as it finishes
+            deadline: Time budget for the whole batch (defaults to
+                BATCH_OPTIMIZE_DEADLINE_SECONDS from now)
+
+        Returns:
+            Batch summary with one item per JD, in input order
+        """
+        batch_start_time = time.time()
+        model_provider = current_app.config.get('MODEL_PROVIDER', 'unknown')
+        concurrency = max(1, int(current_app.config.get('BATCH_OPTIMIZE_CONCURRENCY', 4)))
+        deadline = deadline or Deadline(float(current_app.config.get('BATCH_OPTIMIZE_DEADLINE_SECONDS', 900)))
+        deadline_token = set_current_deadline(deadline)
+
+        try:
+            print(f"📄 Batch: ingesting resume for {len(jd_inputs)} job descriptions...")
+            raw_text, input_type = await self.document_processor.extract_raw_text(
+                text=resume_input.text,
+                docx_url=resume_input.docx_url,
+                pdf_url=resume_input.pdf_url,
+                file_bytes=resume_input.file_bytes,
+                file_type=resume_input.file_type
+            )
+            deadline.check("normalization")
+            parsed_resume, normalization_key = await self._normalize_with_cache(raw_text, input_type, user_id)
+
+            semaphore = asyncio.Semaphore(concurrency)
+            db_lock = asyncio.Lock()  # the DB session is shared by this app context
+            summary = {'total': len(jd_inputs), 'completed': 0, 'failed': 0}
+            items: List[Dict[str, Any]] = [{} for _ in jd_inputs]
+
+            async def report(item: Dict[str, Any]):
+                items[item['index']] = item
+                if emit is None:
+                    return
+                try:
+                    await asyncio.to_thread(emit, item)
+                except Exception as e:
+                    print(f"⚠️  Batch progress report failed for JD {item['index']}: {str(e)}")
+
+            async def optimize_for_jd(index: int, jd_input: JDInput):
+                async with semaphore:
+                    start_time = time.time()
+                    try:
+                        deadline.check("batch optimization")
+
+                        async def analyze():
+                            result = await self.document_processor.analyze_and_optimize(
+                                normalized_resume=parsed_resume,
+                                jd_text=jd_input.text,
+                                jd_title=jd_input.title,
+                                optimization_focus=options.tone,
+                                deadline=deadline
+                            )
+                            return {'parsed_resume': parsed_resume, 'normalization_key': normalization_key, 'optimization': result}
+
+                        outcome = await self._optimize_with_cache(
+                            self._cache_key_data(raw_text, jd_input, options), analyze
+                        )
+                        processing_time = (time.time() - start_time) * 1000
+
+                        async with db_lock:
+                            result_id = await asyncio.to_thread(
+                                self.save_optimization_to_db,
+                                user_id=user_id,
+                                resume_input_metadata=resume_input,
+                                processed_resume=outcome['parsed_resume'],
+                                jd_input=jd_input,
+                                optimization_result=outcome['optimization'],
+                                processing_time_ms=processing_time,
+                                model_provider=model_provider,
+                                normalization_key=normalization_key
+                            )
+
+                        summary['completed'] += 1
+                        gap_analysis = _to_safe_dict(outcome['optimization'].get('gap_analysis'))
+                        await report({
+                            'index': index,
+                            'status': 'completed',
+                            'job_title': jd_input.title,
+                            'company': jd_input.company,
+                            'result_id': result_id,
+                            'match_score': _to_safe_float(gap_analysis.get('overall_match_score'), 0.0),
+                            'cache_hit': outcome['optimization'].get('cache_hit', False),
+                            'processing_time_ms': round(processing_time, 2)
+                        })
+                    except Exception as e:
+                        print(f"❌ Batch optimization failed for JD {index}: {str(e)}")
+                        summary['failed'] += 1
+                        await report({
+                            'index': index,
+                            'status': 'failed',
+                            'job_title': jd_input.title,
+                            'company': jd_input.company,
+                            'error': str(e)
+                        })
+
+            await asyncio.gather(*(optimize_for_jd(i, jd) for i, jd in enumerate(jd_inputs)))
+
+            summary['processing_time_ms'] = round((time.time() - batch_start_time) * 1000, 2)
+            print(f"✅ Batch optimization complete: {summary}")
+            summary['items'] = items
+            return summary
         finally:
-            # Clean up temp files
-            for url in [resume_input.pdf_url, resume_input.docx_url]:
-                if url and os.path.exists(url):
-                    os.unlink(url)
+            reset_current_deadline(deadline_token)
+
+    async def _normalize_with_cache(
+        self,
+        raw_text: str,
+        input_type: str,
+        user_id: int
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Normalize resume text, reusing an earlier parse of the same text.
+
+        Lookup order: cache (keyed by raw text hash + prompt version + LLM
+        model), then the user's saved resumes carrying the same key, then
+        the rule-based parser and, when it is not confident, the LLM.
+
+        Returns:
+            Tuple of (normalized resume dict, normalization key)
+        """
+        cache = get_enhanced_cache()
+        llm_model = current_app.config.get('LLM_MODEL', 'unknown')
+        normalization_key = CacheKeyGenerator.normalization_key(raw_text, NORMALIZATION_PROMPT_VERSION, llm_model)
+        ttl = int(current_app.config.get('NORMALIZATION_CACHE_TTL', 30 * 24 * 60 * 60))
+
+        cached = await cache.cache.get(normalization_key)
+        if cached:
+            print(f"🎯 Normalization cache hit: {normalization_key}")
+            await cache.analytics.log_cache_operation('hit', normalization_key, 'normalization', 15000.0)
+            return cached, normalization_key
+
+        # Fall back to a resume this user already saved with the same parse
+        processed = await asyncio.to_thread(self._find_processed_resume, user_id, normalization_key)
+        if processed:
+            print(f"🎯 Normalization reused from saved resume: {normalization_key}")
+            await cache.analytics.log_cache_operation('hit', normalization_key, 'normalization', 15000.0)
+            await cache.cache.set(normalization_key, processed, ttl)
+            return processed, normalization_key
+
+        await cache.analytics.log_cache_operation('miss', normalization_key, 'normalization')
+        parsed = await self.document_processor.normalize_resume(raw_text, input_type)
+        if await cache.cache.set(normalization_key, parsed, ttl):
+            await cache.analytics.log_cache_operation('set', normalization_key, 'normalization')
+        return parsed, normalization_key
+
+    def _find_processed_resume(self, user_id: int, normalization_key: str) -> Optional[Dict[str, Any]]:
+        """Return processed_resume from the user's latest resume saved with this normalization key."""
+        try:
+            resume_record = (
+                Resume.query
+                .filter(
+                    Resume.user_id == user_id,
+                    Resume.resume_data['normalization_key'].astext == normalization_key
+                )
+                .order_by(Resume.created_at.desc())
+                .first()
+            )
+            if resume_record:
+                return _to_safe_dict(resume_record.resume_data.get('processed_resume')) or None
+        except Exception as e:
+            print(f"⚠️  Normalization DB lookup failed: {str(e)}")
+        return None
+
+    async def _embed_job_description(self, jd_text: str) -> Optional[List[float]]:
+        """
+        Embed the job description through the embedding cache, so repeat
+        runs against the same JD skip the provider call.
+        """
+        if len(jd_text) < 10:
+            return None
+
+        cache = get_enhanced_cache()
+        embed_model = get_embed_model_name()
+        cache_key = CacheKeyGenerator.embedding_key(jd_text, embed_model)
+
+        cached = await cache.cache.get(cache_key)
+        if cached:
+            return cached.get('embedding')
+
+        embeddings = await self.document_processor.embedder.embed([jd_text])
+        await cache.cache.set(cache_key, {
+            'embedding': embeddings[0],
+            'model_name': embed_model,
+            'text_length': len(jd_text)
+        }, ttl=7*24*60*60)  # 7 days
+        return embeddings[0]
+
+    async def _semantic_analysis(
+        self,
+        parsed_resume: Dict[str, Any],
+        jd_text: str,
+        jd_embedding: Optional[List[float]] = None,
+        jd_keywords: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Embedding similarity between the normalized resume and the job description.
+
+        The resume is split with the ResumeChunker into section-aware chunks
+        that fit the embed model's input window, then scored by
+        analyze_semantic_gaps. The result supplements the LLM's gap
+        analysis, so failures are logged and give None.
+
+        Args:
+            parsed_resume: Normalized resume
+            jd_text: Job description text
+            jd_embedding: JD vector from the jd_embedding stage, if any
+            jd_keywords: JD keywords from the jd_requirements stage, if any
+
+        Returns:
+            JSON-safe dict with the overall and per-section similarity and
+            the best matching chunks, or None
+        """
+        try:
+            chunks = chunk_resume(parsed_resume)
+            if not chunks:
+                return None
+            analysis = await analyze_semantic_gaps(
+                chunks, jd_text, jd_embedding=jd_embedding, jd_keywords=jd_keywords
+            )
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            print(f"⚠️  Semantic analysis failed: {str(e)}")
+            return None
+
+        def match_summary(match) -> Dict[str, Any]:
+            return {
+                'section': match.chunk.section,
+                'chunk_index': match.chunk.chunk_index,
+                'similarity_score': match.similarity_score,
+                'matching_keywords': sorted(match.matching_keywords)
+            }
 
+        return {
+            'semantic_similarity': _to_safe_float(analysis.get('semantic_similarity'), 0.0),
+            'section_similarities': analysis.get('section_similarities', {}),
+            'strong_matches': [match_summary(m) for m in analysis.get('strong_matches', [])],
+            'weak_match_count': len(analysis.get('weak_matches', [])),
+            'total_chunks_analyzed': analysis.get('total_chunks_analyzed', len(chunks)),
+            'embedding_dimension': analysis.get('embedding_dimension', 0)
+        }
 
     def _run_optimization_pipeline_sync(self, *args, **kwargs):
-       import asyncio
-       return  asyncio.run(self._run_optimization_pipeline(*args, **kwargs))
+       return run_sync(self._run_optimization_pipeline(*args, **kwargs))
 
     def calculate_resume_completeness(self,resume_data):
         """
@@ -211,9 +699,10 @@ class ResumeOptimizationPipeline:
         jd_input: JDInput,
         optimization_result: dict,
         processing_time_ms: float,
-        model_provider: str
+        model_provider: str,
+        normalization_key: Optional[str] = None
     ) -> str:
-        """Save optimization results to database and return the ID."""
+        """Save optimization results to database and return the resume ID used by the results page."""
 
         try:
             if isinstance(processed_resume, str):
@@ -240,6 +729,7 @@ class ResumeOptimizationPipeline:
                 title=f"Optimized Resume - {jd_input.title or 'Untitled Job'}",
                 resume_data={
                     'processed_resume': processed_resume,  # Store the full normalized resume
+                    'normalization_key': normalization_key,  # Lets later runs reuse this parse
                     'original_input_type': resume_input_metadata.input_type,
                     'file_type': resume_input_metadata.input_type,
                     'optimization_date': datetime.utcnow().isoformat()
@@ -268,8 +758,8 @@ class ResumeOptimizationPipeline:
                     'processed_resume_preview': original_preview,
                     'input_metadata': {
                         'input_type': resume_input_metadata.input_type,
-                        'has_pdf': bool(getattr(resume_input_metadata, "pdf_url", None)),
-                        'has_docx': bool(getattr(resume_input_metadata, "docx_url", None)),
+                        'has_pdf': resume_input_metadata.input_type == 'pdf',
+                        'has_docx': resume_input_metadata.input_type == 'docx',
                         'has_text': bool(getattr(resume_input_metadata, "text", None)),
                     }
                 },
@@ -313,8 +803,8 @@ class ResumeOptimizationPipeline:
                 user.last_optimization_at = datetime.utcnow()
                 db.session.commit()
             
-            print(f"✅ Optimization saved to DB with ID: {optimization.id}")
-            return str(optimization.id)
+            print(f"✅ Optimization saved to DB with ID: {optimization.id} (resume {resume_record.id})")
+            return str(resume_record.id)
             
         except Exception as e:
             db.session.rollback()
@@ -323,26 +813,6 @@ class ResumeOptimizationPipeline:
 
 
 
-    def save_temp_file(self,uploaded_file):
-        """Save uploaded file temporarily for processing."""
-        import tempfile
-        import os
-        
-        # Create temp file with proper extension
-        file_ext = '.pdf' if 'pdf' in uploaded_file.content_type else '.docx'
-        fd, temp_path = tempfile.mkstemp(suffix=file_ext)
-        
-        try:
-            with os.fdopen(fd, 'wb') as tmp_file:
-                uploaded_file.seek(0)  # Reset file pointer
-                tmp_file.write(uploaded_file.read())
-            
-            return temp_path
-        except Exception as e:
-            os.unlink(temp_path)  # Clean up on error
-            raise e
-
-
     def safe_optimization_pipeline(
         self,
         resume_input: 'ResumeInput',
@@ -466,12 +936,17 @@ class ResumeOptimizationPipeline:
     def _get_model_info(self) -> Dict[str, str]:
         """Get current model configuration info."""
         
-        return {
+        model_info = {
             'provider': current_app.config.get('MODEL_PROVIDER', 'unknown'),
             'llm_model': current_app.config.get('LLM_MODEL', 'unknown'),
-            'embed_model': current_app.config.get('EMBED_MODEL', 'unknown'),
-            'optimization_version': 'v1.0'
+            'embed_model': get_embed_model_name(),
+            'optimization_version': 'v1.0',
+            'normalization_prompt_version': NORMALIZATION_PROMPT_VERSION,
+            'optimization_prompt_version': OPTIMIZATION_PROMPT_VERSION
         }
+        if current_app.config.get('PIPELINE_SEMANTIC_ANALYSIS', False):
+            model_info['semantic_analysis'] = True  # cached results without it don't qualify
+        return model_info
 
 
     
@@ -488,7 +963,7 @@ class ResumeOptimizationPipeline:
             cache_key = f"result:{result_id}"
             
             # Try to get from cache
-            result = asyncio.run(cache.cache.get(cache_key))
+            result = run_sync(cache.cache.get(cache_key))
             return result
             
         except:
@@ -619,7 +1094,7 @@ class ResumeOptimizationPipeline:
             
             # Cache for 24 hours
             cache_key = f"temp_files:{result_id}"
-            asyncio.run(cache.cache.set(cache_key, file_info, ttl=86400))
+            run_sync(cache.cache.set(cache_key, file_info, ttl=86400))
             
             return {
                 'storage_type': 'local_temp',
@@ -11,6 +11,7 @@ from schemas import OptimizedResume, ExperienceItem
 from helpers import  validate_json_with_retry
 from .keywords import TechnicalSkills
 from providers import get_models
+from utils import run_sync
 
 
 class ResumePrompts:
@@ -317,13 +318,5 @@ class ResumeRewriter:
 # Sync wrapper
 def optimize_resume_sync(*args, **kwargs) -> OptimizedResume:
     """Synchronous wrapper for optimize_resume."""
-    import asyncio
-    async def _optimize_with_cleanup():
-        rewriter = ResumeRewriter()
-        try:
-            return await rewriter.optimize_resume(*args, **kwargs)
-        finally:
-            # Force cleanup of any remaining async resources
-            await asyncio.sleep(0.1)  # Allow cleanup tasks to complete
-    
-    return asyncio.run(_optimize_with_cleanup())
\ No newline at end of file
+    rewriter = ResumeRewriter()
+    return run_sync(rewriter.optimize_resume(*args, **kwargs))
\ No newline at end of file
@@ -0,0 +1,567 @@
+"""
+Deterministic resume parser used in front of LLM normalization.
+Splits resume text into sections by their headings, parses contact details,
+experience blocks (title/company/date range/bullets), education, skills and
+certifications into NormalizedResumeSchema, and scores how much of the
+resume it understood. Confident parses skip the LLM entirely; the rest are
+sent to the LLM as a draft to correct.
+
+Changes to the parsing rules alter cached normalizations, so bump
+NORMALIZATION_PROMPT_VERSION along with them.
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from schemas import NormalizedResumeSchema
+
+
+# Canonical section -> heading pattern (whole line, optional trailing colon)
+SECTION_HEADINGS = {
+    'summary': r'(professional\s+|career\s+|executive\s+)?(summary|profile|objective|about(\s+me)?)',
+    'experience': r'(work\s+|professional\s+|relevant\s+|employment\s+)?(experience|employment(\s+history)?|work\s+history|career\s+history)',
+    'education': r'(education|academic\s+background|education\s+(and|&)\s+training)',
+    'skills': r'((technical|core|key|professional)\s+)?(skills|competencies|technologies|tech\s+stack|skills\s+(and|&)\s+\w+)',
+    'certifications': r'(certifications?|licenses?(\s+(and|&)\s+certifications?)?|certifications?\s+(and|&)\s+licenses?)',
+    'projects': r'((selected|personal|key)\s+)?(projects|portfolio)',
+    'languages': r'languages',
+    'awards': r'(awards|honors|honours|awards\s+(and|&)\s+honors)',
+    'publications': r'publications',
+    'volunteer': r'(volunteer(ing)?(\s+experience)?|community\s+involvement)',
+    'interests': r'(interests|hobbies)',
+}
+HEADING_PATTERNS = {
+    name: re.compile(rf'^\s*{pattern}\s*:?\s*$', re.I) for name, pattern in SECTION_HEADINGS.items()
+}
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'sept': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+_MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?'
+_DATE = rf'(?:{_MONTH}\s+\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}}-\d{{2}}|\d{{4}})'
+_PRESENT = r'(?:present|current|now|today)'
+DATE_RANGE = re.compile(rf'(?P<start>{_DATE})\s*(?:-|–|—|to|until)\s*(?P<end>{_DATE}|{_PRESENT})', re.I)
+SINGLE_DATE = re.compile(rf'\b{_DATE}\b', re.I)
+YEAR = re.compile(r'\b(19|20)\d{2}\b')
+
+EMAIL = re.compile(r'[\w.+-]+@[\w-]+(\.[\w-]+)+')
+PHONE = re.compile(r'(\+?\(?\d[\d\s().-]{7,}\d)')
+URL = re.compile(r'(https?://)?(www\.)?[\w-]+(\.[\w-]+)+(/[\w./%#?=&-]*)?', re.I)
+LOCATION = re.compile(r'\b[A-Z][a-zA-Z.\s]+,\s*([A-Z]{2}|[A-Z][a-zA-Z]+)\b')
+GPA = re.compile(r'\bGPA:?\s*([\d.]+(\s*/\s*[\d.]+)?)', re.I)
+METRIC = re.compile(r'(\d+(\.\d+)?\s*%|\$\s?\d|\b\d+(\.\d+)?\s*(x|k|m|million|billion)\b|\b\d{2,}\b)', re.I)
+
+BULLET = re.compile(r'^\s*([•●▪◦‣∙·*-]|\d+[.)])\s+')
+SEPARATORS = re.compile(r'\s+(?:\||–|—|-|@|at)\s+|\s*\|\s*|,\s+')
+# "City, ST" closing a heading part; matched before SEPARATORS splits on its comma
+TRAILING_LOCATION = re.compile(
+    r'(?:^|,\s+|\s+(?:\||–|—|-|@|at)\s+|\s*\|\s*)(?P<location>[A-Z][a-zA-Z.]*(?:\s+[A-Z][a-zA-Z.]*)*,\s*[A-Z]{2})\s*$'
+)
+
+ROLE_WORDS = re.compile(
+    r'\b(engineer|developer|manager|analyst|designer|consultant|director|lead|architect|scientist|'
+    r'specialist|coordinator|administrator|intern|assistant|associate|officer|head|vp|president|'
+    r'founder|owner|technician|nurse|teacher|accountant|representative|executive|programmer|'
+    r'researcher|supervisor|advisor|editor|writer|chef|agent|clerk|operator)s?\b',
+    re.I
+)
+INSTITUTION_WORDS = re.compile(r'\b(university|college|institute|school|academy|polytechnic)\b', re.I)
+DEGREE = re.compile(
+    r'\b(bachelor(\'?s)?|master(\'?s)?|associate(\'?s)?|doctor(ate)?|ph\.?d\.?|mba|b\.?\s?sc?\.?|m\.?\s?sc?\.?|'
+    r'b\.?a\.?|m\.?a\.?|b\.?eng\.?|m\.?eng\.?|diploma|certificate)\b[^,|\n]*',
+    re.I
+)
+SKILL_CATEGORIES = {
+    'tools_and_software': re.compile(r'tools|software|platforms|technologies|frameworks|cloud|databases', re.I),
+    'methodologies': re.compile(r'methodolog|processes|practices', re.I),
+    'soft_skills': re.compile(r'soft|interpersonal', re.I),
+    'languages': re.compile(r'^(spoken|foreign)\s+languages$', re.I),
+}
+
+# Weights of the confidence components (sum to 1)
+CONFIDENCE_WEIGHTS = {
+    'contact': 0.15,
+    'experience': 0.35,
+    'education': 0.10,
+    'skills': 0.10,
+    'coverage': 0.30,
+}
+
+
+@dataclass
+class RuleParseResult:
+    """Outcome of the rule-based parse."""
+    resume: Optional[Dict[str, Any]]  # NormalizedResumeSchema dump, None if unusable
+    confidence: float
+    signals: Dict[str, float] = field(default_factory=dict)
+    unparsed_sections: List[str] = field(default_factory=list)
+
+
+def parse_resume(raw_text: str, file_type: str = 'text') -> RuleParseResult:
+    """
+    Parse resume text without an LLM.
+
+    Args:
+        raw_text: Extracted resume text
+        file_type: Source file type (stored as source_format)
+
+    Returns:
+        RuleParseResult with the parsed resume and a confidence in [0, 1]
+    """
+    lines = [line.rstrip() for line in raw_text.splitlines()]
+    header, sections = split_sections(lines)
+    if not sections:
+        return RuleParseResult(resume=None, confidence=0.0, signals={'sections': 0.0})
+
+    contact = parse_contact(header)
+    experience, exp_lines = parse_experience(sections.get('experience', []))
+    education, edu_lines = parse_education(sections.get('education', []))
+    skills = parse_skills(sections.get('skills', []), sections.get('languages', []))
+    certifications = parse_certifications(sections.get('certifications', []))
+    projects = parse_projects(sections.get('projects', []))
+
+    additional = []
+    unparsed = []
+    for name, body in sections.items():
+        if name in ('awards', 'publications', 'volunteer', 'interests'):
+            items = [_strip_bullet(line) for line in body if line.strip()]
+            additional.append({
+                'section_title': name.title(),
+                'section_type': name,
+                'content': {'items': items}
+            })
+        elif name.startswith('other:'):
+            unparsed.append(name[len('other:'):])
+
+    summary_lines = [line.strip() for line in sections.get('summary', []) if line.strip()]
+    resume = {
+        'contact_information': contact,
+        'professional_summary': ' '.join(summary_lines) or None,
+        'work_experience': experience,
+        'education': education,
+        'skills': skills,
+        'certifications_and_licenses': certifications,
+        'projects_and_portfolio': projects,
+        'additional_sections': additional,
+        'parsed_date': datetime.now().isoformat(),
+        'source_format': file_type,
+    }
+
+    signals = _score(resume, sections, exp_lines, edu_lines)
+    confidence = round(sum(CONFIDENCE_WEIGHTS[name] * signals[name] for name in CONFIDENCE_WEIGHTS), 3)
+
+    try:
+        resume = NormalizedResumeSchema.model_validate(resume).model_dump()
+    except Exception as e:
+        print(f"⚠️  Rule-based parse did not validate: {str(e)}")
+        return RuleParseResult(resume=None, confidence=0.0, signals=signals, unparsed_sections=unparsed)
+
+    return RuleParseResult(resume=resume, confidence=confidence, signals=signals, unparsed_sections=unparsed)
+
+
+def split_sections(lines: List[str]) -> Tuple[List[str], Dict[str, List[str]]]:
+    """
+    Split lines at section headings.
+
+    Returns:
+        Tuple of (lines before the first heading, section name -> body lines).
+        Unrecognized all-caps headings become 'other:<heading>' sections.
+    """
+    header: List[str] = []
+    sections: Dict[str, List[str]] = {}
+    current: Optional[List[str]] = None
+
+    for line in lines:
+        name = detect_heading(line)
+        if name:
+            current = sections.setdefault(name, [])
+            continue
+        if current is None:
+            header.append(line)
+        else:
+            current.append(line)
+    return header, sections
+
+
+def detect_heading(line: str) -> Optional[str]:
+    """Canonical section name if the line is a section heading."""
+    text = line.strip()
+    if not text or len(text) > 40 or BULLET.match(line):
+        return None
+    for name, pattern in HEADING_PATTERNS.items():
+        if pattern.match(text):
+            return name
+    # Unknown but heading-shaped: short, all caps, no digits or sentence punctuation
+    letters = re.sub(r'[^A-Za-z]', '', text)
+    if len(letters) >= 4 and text.upper() == text and not re.search(r'[\d@.,|]', text):
+        return f"other:{text.rstrip(':').strip()}"
+    return None
+
+
+def parse_contact(header: List[str]) -> Dict[str, Any]:
+    """Name, email, phone, location and profile links from the lines above the first section."""
+    text = '\n'.join(header)
+    contact: Dict[str, Any] = {'name': '', 'professional_profiles': {}}
+
+    email = EMAIL.search(text)
+    if email:
+        contact['email'] = email.group(0)
+
+    for match in PHONE.finditer(text):
+        digits = re.sub(r'\D', '', match.group(0))
+        if 10 <= len(digits) <= 15:
+            contact['phone'] = match.group(0).strip()
+            break
+
+    for match in URL.finditer(text):
+        url = match.group(0)
+        if email and url in email.group(0):
+            continue
+        lowered = url.lower()
+        if 'linkedin.com' in lowered:
+            contact['professional_profiles']['LinkedIn'] = url
+        elif 'github.com' in lowered:
+            contact['professional_profiles']['GitHub'] = url
+        elif '.' in url and not contact.get('website') and not YEAR.fullmatch(url):
+            contact['website'] = url
+
+    for line in header:
+        parts = [part.strip() for part in re.split(r'\s*[|•·]\s*', line) if part.strip()]
+        for part in parts:
+            if not contact['name'] and _looks_like_name(part):
+                contact['name'] = part
+            elif not contact.get('location'):
+                location = LOCATION.search(part)
+                if location and not EMAIL.search(part):
+                    contact['location'] = location.group(0).strip()
+    return contact
+
+
+def parse_experience(body: List[str]) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Experience entries anchored on lines carrying a date range.
+
+    Returns:
+        Tuple of (work_experience items, number of body lines consumed)
+    """
+    entries: List[Dict[str, Any]] = []
+    consumed = 0
+    pending: List[str] = []  # non-bullet lines not yet assigned to an entry
+
+    for line in body:
+        text = line.strip()
+        if not text:
+            continue
+        if BULLET.match(line):
+            if entries:
+                bullet = _strip_bullet(line)
+                entries[-1]['responsibilities'].append(bullet)
+                if METRIC.search(bullet):
+                    entries[-1]['metrics_achieved'].append(bullet)
+                consumed += 1
+            continue
+
+        dates = DATE_RANGE.search(text)
+        if dates:
+            remainder = (text[:dates.start()] + ' ' + text[dates.end():]).strip(' ,|–—-()')
+            heading = [part for part in pending if part] + ([remainder] if remainder else [])
+            title, company, location = _title_company(heading)
+            entries.append({
+                'job_title': title,
+                'company': company,
+                'start_date': normalize_date(dates.group('start')),
+                'end_date': normalize_date(dates.group('end')),
+                'location': location,
+                'responsibilities': [],
+                'metrics_achieved': [],
+            })
+            consumed += 1 + len(pending)
+            pending = []
+        elif entries and entries[-1]['responsibilities'] and not _is_entry_heading(text):
+            # Wrapped bullet text
+            entries[-1]['responsibilities'][-1] += ' ' + text
+            consumed += 1
+        else:
+            pending.append(text)
+
+    # Lines left after the last entry that never got dates
+    if entries and pending and not entries[-1]['responsibilities']:
+        entries[-1]['responsibilities'].extend(pending)
+        consumed += len(pending)
+    return entries, consumed
+
+
+def parse_education(body: List[str]) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Education entries, split on lines naming an institution or degree.
+
+    Returns:
+        Tuple of (education items, number of body lines consumed)
+    """
+    entries: List[Dict[str, Any]] = []
+    consumed = 0
+    for line in body:
+        text = _strip_bullet(line)
+        if not text:
+            continue
+        institution = INSTITUTION_WORDS.search(text)
+        degree = DEGREE.search(text)
+        current = entries[-1] if entries else None
+
+        starts_entry = (
+            current is None
+            or (institution and current.get('institution'))
+            or (degree and current.get('degree') and not institution)
+        )
+        if (institution or degree) and starts_entry:
+            current = {'institution': '', 'achievements': []}
+            entries.append(current)
+        if current is None:
+            continue
+
+        consumed += 1
+        if institution and not degree and not current['institution']:
+            # Whole line is the institution ("University of California, Berkeley")
+            current['institution'] = YEAR.sub('', text).strip(' ,()–—-')
+        for part in SEPARATORS.split(text):
+            part = part.strip()
+            if not part:
+                continue
+            if INSTITUTION_WORDS.search(part) and not current['institution']:
+                current['institution'] = YEAR.sub('', part).strip(' ,()')
+            elif DEGREE.match(part) and not current.get('degree'):
+                degree_text, field_of_study = _split_degree(part)
+                current['degree'] = degree_text
+                if field_of_study:
+                    current['field_of_study'] = field_of_study
+        gpa = GPA.search(text)
+        if gpa:
+            current['grade'] = gpa.group(1)
+        years = list(YEAR.finditer(text))
+        if years:
+            current['completion_date'] = years[-1].group(0)
+        if not institution and not degree and not gpa and not years:
+            current['achievements'].append(text)
+
+    entries = [entry for entry in entries if entry['institution']]
+    return entries, consumed
+
+
+def parse_skills(body: List[str], language_lines: List[str]) -> Optional[Dict[str, Any]]:
+    """Skills from 'Category: a, b, c' lines and plain comma/bullet separated lists."""
+    skills: Dict[str, Any] = {
+        'core_competencies': [],
+        'tools_and_software': [],
+        'methodologies': [],
+        'soft_skills': [],
+        'languages': [],
+        'specialized_skills': [],
+    }
+    for line in body:
+        text = _strip_bullet(line)
+        if not text:
+            continue
+        category, _, items = text.partition(':')
+        if items and len(category) <= 40:
+            values = _split_list(items)
+            target = next((key for key, pattern in SKILL_CATEGORIES.items() if pattern.search(category.strip())), None)
+            if target:
+                skills[target].extend(values)
+            else:
+                skills['specialized_skills'].append({'category_name': category.strip(), 'skills': values})
+        else:
+            skills['core_competencies'].extend(_split_list(text))
+
+    for line in language_lines:
+        skills['languages'].extend(_split_list(_strip_bullet(line)))
+
+    for key, values in skills.items():
+        if key != 'specialized_skills':
+            skills[key] = list(dict.fromkeys(value for value in values if value))
+
+    if not any(skills.values()):
+        return None
+    return skills
+
+
+def parse_certifications(body: List[str]) -> List[Dict[str, Any]]:
+    """One certification per line; a trailing date becomes the issue date."""
+    certifications = []
+    for line in body:
+        text = _strip_bullet(line)
+        if not text:
+            continue
+        item: Dict[str, Any] = {'name': text}
+        date = SINGLE_DATE.search(text)
+        if date:
+            item['issue_date'] = normalize_date(date.group(0))
+            item['name'] = (text[:date.start()] + text[date.end():]).strip(' ,|–—-()')
+        parts = [part.strip() for part in SEPARATORS.split(item['name']) if part.strip()]
+        if len(parts) >= 2:
+            item['name'], item['issuing_organization'] = parts[0], parts[1]
+        if item['name']:
+            certifications.append(item)
+    return certifications
+
+
+def parse_projects(body: List[str]) -> List[Dict[str, Any]]:
+    """Projects anchored on non-bullet lines, with bullets as outcomes."""
+    projects: List[Dict[str, Any]] = []
+    for line in body:
+        text = line.strip()
+        if not text:
+            continue
+        if BULLET.match(line) and projects:
+            projects[-1]['outcomes'].append(_strip_bullet(line))
+            continue
+
+        project: Dict[str, Any] = {'outcomes': []}
+        dates = DATE_RANGE.search(text)
+        if dates:
+            project['start_date'] = normalize_date(dates.group('start'))
+            project['end_date'] = normalize_date(dates.group('end'))
+            text = (text[:dates.start()] + text[dates.end():]).strip(' ,|–—-()')
+        name, description = _split_name(text)
+        project['name'] = name
+        if description:
+            project['description'] = description
+        if project['name']:
+            projects.append(project)
+    return projects
+
+
+def normalize_date(value: str) -> str:
+    """'Jan 2020' -> '2020-01'; 'Present' for ongoing; MM/YYYY, YYYY-MM and YYYY unchanged."""
+    text = value.strip().rstrip('.')
+    if re.fullmatch(_PRESENT, text, re.I):
+        return 'Present'
+    month_year = re.fullmatch(r'([A-Za-z]+)\.?\s+(\d{4})', text)
+    if month_year:
+        month = MONTHS.get(month_year.group(1)[:4].lower()) or MONTHS.get(month_year.group(1)[:3].lower())
+        if month:
+            return f"{month_year.group(2)}-{month:02d}"
+        return month_year.group(2)
+    return text
+
+
+def _score(
+    resume: Dict[str, Any],
+    sections: Dict[str, List[str]],
+    exp_lines: int,
+    edu_lines: int
+) -> Dict[str, float]:
+    """Confidence components, each in [0, 1]."""
+    contact = resume['contact_information']
+    contact_score = (0.6 if contact.get('name') else 0.0) + (0.4 if contact.get('email') or contact.get('phone') else 0.0)
+
+    experience = resume['work_experience']
+    if experience:
+        complete = sum(1 for item in experience if item['job_title'] and item['company'] and item['start_date'])
+        experience_score = complete / len(experience)
+    else:
+        # No experience section at all is plausible (students); one we could not parse is not
+        experience_score = 0.0 if 'experience' in sections else 0.5
+
+    if resume['education']:
+        education_score = 1.0
+    else:
+        education_score = 0.0 if 'education' in sections else 0.5
+
+    skills_score = 1.0 if resume['skills'] else 0.0
+
+    # Share of section lines that ended up in structured fields
+    understood = total = 0
+    for name, body in sections.items():
+        count = sum(1 for line in body if line.strip())
+        total += count
+        if name == 'experience':
+            understood += min(count, exp_lines)
+        elif name == 'education':
+            understood += min(count, edu_lines)
+        elif not name.startswith('other:'):
+            understood += count
+    coverage = understood / total if total else 0.0
+
+    return {
+        'contact': round(contact_score, 3),
+        'experience': round(experience_score, 3),
+        'education': round(education_score, 3),
+        'skills': skills_score,
+        'coverage': round(coverage, 3),
+    }
+
+
+def _title_company(parts: List[str]) -> Tuple[str, str, Optional[str]]:
+    """Job title, company and location from the text around an entry's dates."""
+    location = None
+    pieces: List[str] = []
+    for part in parts:
+        if location is None:
+            match = TRAILING_LOCATION.search(part)
+            if match and not ROLE_WORDS.search(match.group('location')):
+                location = match.group('location')
+                part = part[:match.start()]
+        pieces.extend(piece.strip() for piece in SEPARATORS.split(part) if piece and piece.strip())
+
+    if location is None:
+        for piece in list(pieces):
+            if LOCATION.fullmatch(piece) or re.fullmatch(r'remote|hybrid', piece, re.I):
+                location = piece
+                pieces.remove(piece)
+                break
+    if len(pieces) >= 3 and location is None and len(pieces[-1].split()) == 1:
+        # "Title, Company, City, State" style leftovers
+        location = pieces.pop()
+        if len(pieces) >= 3:
+            location = f"{pieces.pop()}, {location}"
+
+    if not pieces:
+        return '', '', location
+    if len(pieces) == 1:
+        return (pieces[0], '', location) if ROLE_WORDS.search(pieces[0]) else ('', pieces[0], location)
+
+    first, second = pieces[0], pieces[1]
+    if ROLE_WORDS.search(second) and not ROLE_WORDS.search(first):
+        first, second = second, first
+    return first, second, location
+
+
+def _is_entry_heading(text: str) -> bool:
+    """Non-bullet line that more likely starts the next entry than continues a bullet."""
+    return bool(ROLE_WORDS.search(text)) and len(text) <= 80 and not text.endswith('.')
+
+
+def _looks_like_name(text: str) -> bool:
+    words = text.split()
+    return (
+        2 <= len(words) <= 4
+        and all(word[:1].isupper() for word in words)
+        and not re.search(r'[\d@/:]', text)
+        and not ROLE_WORDS.search(text)
+    )
+
+
+def _split_degree(text: str) -> Tuple[str, str]:
+    """'Bachelor of Science in Computer Science' -> ('Bachelor of Science', 'Computer Science')."""
+    text = YEAR.sub('', GPA.sub('', text)).strip(' ,()')
+    degree, _, field_of_study = text.partition(' in ')
+    return degree.strip(), field_of_study.strip()
+
+
+def _split_name(text: str) -> Tuple[str, str]:
+    """'Name – description' or 'Name: description'."""
+    match = re.search(r'\s+[–—-]\s+|:\s+', text)
+    if not match:
+        return text.strip(), ''
+    return text[:match.start()].strip(), text[match.end():].strip()
+
+
+def _split_list(text: str) -> List[str]:
+    return [item.strip(' .') for item in re.split(r'\s*[,;|•·]\s*', text) if item.strip(' .')]
+
+
+def _strip_bullet(line: str) -> str:
+    return BULLET.sub('', line).strip()
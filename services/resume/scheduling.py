@@ -0,0 +1,127 @@
+"""
+Priority classes for optimization jobs.
+Premium, free and batch work is queued separately; workers choose the next
+class with smooth weighted round-robin (as in nginx upstream balancing) and
+each class has its own concurrency quota, so bulk or free-tier load cannot
+take every worker away from premium subscribers.
+"""
+
+import time
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+
+
+PRIORITY_PREMIUM = 'premium'
+PRIORITY_FREE = 'free'
+PRIORITY_BATCH = 'batch'
+
+# Highest priority first; also the tie-break order of the scheduler
+PRIORITY_CLASSES = (PRIORITY_PREMIUM, PRIORITY_FREE, PRIORITY_BATCH)
+
+DEFAULT_WEIGHTS = {PRIORITY_PREMIUM: 6, PRIORITY_FREE: 3, PRIORITY_BATCH: 1}
+
+
+def parse_class_settings(value: Optional[str], defaults: Dict[str, int]) -> Dict[str, int]:
+    """
+    Parse "premium:6,free:3,batch:1" into a dict, filling missing classes
+    from defaults.
+
+    Raises:
+        ValueError: On unknown classes or malformed entries
+    """
+    settings = dict(defaults)
+    for item in (value or '').split(','):
+        if not item.strip():
+            continue
+        name, _, number = item.partition(':')
+        name = name.strip().lower()
+        if name not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class '{name}'. Supported: {', '.join(PRIORITY_CLASSES)}")
+        settings[name] = int(number)
+    return settings
+
+
+def priority_class_for(user, requested: Optional[str] = None) -> str:
+    """
+    Priority class for a user's job.
+
+    Premium subscribers get the premium class; anyone may ask for the batch
+    class for bulk work they do not need quickly, but never for a higher one.
+    """
+    default = PRIORITY_PREMIUM if getattr(user, 'is_premium', False) else PRIORITY_FREE
+    if requested == PRIORITY_BATCH:
+        return PRIORITY_BATCH
+    return default
+
+
+class WeightedRoundRobin:
+    """
+    Smooth weighted round-robin over priority classes.
+
+    Only classes that currently have work compete, so an idle class does
+    not bank credit and later starve the others.
+    """
+
+    def __init__(self, weights: Dict[str, int]):
+        self.weights = {name: max(0, weights.get(name, 0)) for name in PRIORITY_CLASSES}
+        self._current = {name: 0 for name in PRIORITY_CLASSES}
+        self._lock = threading.Lock()
+
+    def order(self, classes: Iterable[str]) -> List[str]:
+        """Classes in the order they should be tried (best first)."""
+        with self._lock:
+            return sorted(
+                (name for name in classes if self.weights[name] > 0),
+                key=lambda name: (-(self._current[name] + self.weights[name]), PRIORITY_CLASSES.index(name))
+            )
+
+    def record(self, chosen: str, contenders: Iterable[str]) -> None:
+        """Charge `chosen` for a job taken while `contenders` had work queued."""
+        with self._lock:
+            contenders = set(contenders) | {chosen}
+            total = sum(self.weights[name] for name in contenders)
+            for name in contenders:
+                self._current[name] += self.weights[name]
+            self._current[chosen] -= total
+
+    def reset(self, name: str) -> None:
+        """Forget the credit of a class found empty."""
+        with self._lock:
+            self._current[name] = 0
+
+
+class ClassStats:
+    """Recent queue wait times per priority class (this process only)."""
+
+    def __init__(self, window: int = 500):
+        self._waits = {name: deque(maxlen=window) for name in PRIORITY_CLASSES}
+        self._started = {name: 0 for name in PRIORITY_CLASSES}
+        self._lock = threading.Lock()
+
+    def record_start(self, name: str, queued_at: float) -> None:
+        with self._lock:
+            self._waits[name].append(max(0.0, time.time() - queued_at))
+            self._started[name] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: self._summarize(name) for name in PRIORITY_CLASSES}
+
+    def _summarize(self, name: str) -> Dict[str, Any]:
+        waits = sorted(self._waits[name])
+        if not waits:
+            return {'started': self._started[name], 'wait_ms': None}
+
+        def percentile(p: float) -> float:
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))] * 1000, 1)
+
+        return {
+            'started': self._started[name],
+            'wait_ms': {
+                'avg': round(sum(waits) / len(waits) * 1000, 1),
+                'p50': percentile(0.50),
+                'p95': percentile(0.95),
+                'max': round(waits[-1] * 1000, 1)
+            }
+        }
@@ -0,0 +1,118 @@
+"""
+Section-parallel normalization planning for long resumes.
+Splits resume text at its section headings and groups the sections into
+independent parts, each normalized by its own (smaller) LLM call against
+only the NormalizedResumeSchema fields it can fill. The partial results
+are merged back into one NormalizedResumeSchema.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, create_model
+
+from schemas import NormalizedResumeSchema
+from .rule_parser import split_sections
+
+
+# Part -> (rule_parser section names, NormalizedResumeSchema fields it fills)
+SECTION_PARTS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    'profile': (('summary',), ('contact_information', 'professional_summary', 'industry_context')),
+    'experience': (('experience',), ('work_experience',)),
+    'education': (('education',), ('education',)),
+    'skills': (('skills', 'languages'), ('skills',)),
+    'certifications': (('certifications',), ('certifications_and_licenses',)),
+    'projects': (('projects',), ('projects_and_portfolio',)),
+    'additional': (('awards', 'publications', 'volunteer', 'interests'), ('additional_sections',)),
+}
+
+# Output budget per part; experience lists are by far the longest
+PART_MAX_TOKENS = {'experience': 6000}
+DEFAULT_PART_MAX_TOKENS = 2500
+
+
+@dataclass
+class SectionPart:
+    """One independently normalized slice of a resume."""
+    name: str
+    text: str
+    fields: Tuple[str, ...]
+
+    @property
+    def schema(self) -> Type[BaseModel]:
+        return part_schema(self.name)
+
+    @property
+    def max_tokens(self) -> int:
+        return PART_MAX_TOKENS.get(self.name, DEFAULT_PART_MAX_TOKENS)
+
+
+@lru_cache(maxsize=None)
+def part_schema(name: str) -> Type[BaseModel]:
+    """Pydantic model with just the NormalizedResumeSchema fields of a part."""
+    _, fields = SECTION_PARTS[name]
+    model_fields = NormalizedResumeSchema.model_fields
+    return create_model(
+        f"{name.title()}Part",
+        **{field: (model_fields[field].annotation, model_fields[field]) for field in fields}
+    )
+
+
+def plan_section_parts(raw_text: str) -> List[SectionPart]:
+    """
+    Group the resume's sections into parts for parallel normalization.
+
+    The lines above the first heading (name, contact details) always go to
+    the profile part. Unrecognized headed sections go to the additional
+    part with their heading kept, so nothing is dropped.
+
+    Returns:
+        Parts with text, in SECTION_PARTS order (empty when no headings)
+    """
+    header, sections = split_sections([line.rstrip() for line in raw_text.splitlines()])
+    if not sections:
+        return []
+
+    texts: Dict[str, List[str]] = {name: [] for name in SECTION_PARTS}
+    texts['profile'].extend(header)
+    for section, body in sections.items():
+        if section.startswith('other:'):
+            part, heading = 'additional', section[len('other:'):]
+        else:
+            part = next((name for name, (names, _) in SECTION_PARTS.items() if section in names), 'additional')
+            heading = section.upper()
+        texts[part].append(heading)
+        texts[part].extend(body)
+        texts[part].append('')
+
+    return [
+        SectionPart(name=name, text='\n'.join(lines).strip(), fields=SECTION_PARTS[name][1])
+        for name, lines in texts.items()
+        if any(line.strip() for line in lines)
+    ]
+
+
+def draft_for_part(part: SectionPart, hint: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """The slice of a rule-based draft covering a part's fields, if it has any content."""
+    if not hint:
+        return None
+    draft = {field: hint.get(field) for field in part.fields if hint.get(field)}
+    return draft or None
+
+
+def merge_section_parts(results: List[BaseModel], file_type: str) -> Dict[str, Any]:
+    """
+    Merge normalized parts into one NormalizedResumeSchema dump.
+
+    Raises:
+        ValidationError: If the merged resume does not validate (e.g. no
+            profile part produced contact_information)
+    """
+    merged: Dict[str, Any] = {}
+    for result in results:
+        merged.update(result.model_dump())
+    merged['parsed_date'] = datetime.now().isoformat()
+    merged['source_format'] = file_type
+    return NormalizedResumeSchema.model_validate(merged).model_dump()
@@ -0,0 +1,192 @@
+"""
+Single-flight request coalescing for resume optimization.
+Identical requests (same CacheKeyGenerator.request_key) that arrive while one
+is already running attach to it instead of paying for their own LLM calls.
+Within a process this uses shared asyncio futures; across gunicorn workers a
+Redis SET NX lease elects one leader and followers wait for its result.
+"""
+
+import copy
+import json
+import uuid
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from flask import current_app
+
+from services.resume.cache import get_enhanced_cache
+
+
+# Release / extend the lease only if we still own it
+_RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_EXTEND_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent executions of the same keyed computation.
+
+    The first caller for a key becomes the leader and runs the computation;
+    every other caller (in this process or, with Redis, in another worker)
+    receives a copy of the leader's result. Results must be JSON-serializable
+    to be shared across processes.
+    """
+
+    LEASE_PREFIX = 'singleflight:lease:'
+    RESULT_PREFIX = 'singleflight:result:'
+
+    def __init__(
+        self,
+        redis_client=None,
+        lease_seconds: float = 300,
+        poll_seconds: float = 0.5,
+        result_ttl: int = 120
+    ):
+        self.redis_client = redis_client
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.result_ttl = result_ttl
+
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {'leader': 0, 'local_shared': 0, 'remote_shared': 0}
+
+    async def do(
+        self,
+        key: str,
+        func: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        Run func once per key across all concurrent callers.
+
+        Args:
+            key: Request identity, e.g. CacheKeyGenerator.request_key(...)
+            func: Zero-argument coroutine factory doing the actual work
+
+        Returns:
+            Tuple of (result, shared) where shared is True if the result
+            came from another caller's execution
+        """
+        while key in self._inflight:
+            inflight = self._inflight[key]
+            print(f"🔗 Attaching to in-flight optimization: {key}")
+            try:
+                result = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if inflight.cancelled():
+                    continue  # The leader was cancelled, not us: retry
+                raise
+            self.stats['local_shared'] += 1
+            return copy.deepcopy(result), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result, shared = await self._run_distributed(key, func)
+            future.set_result(result)
+            return result if shared else copy.deepcopy(result), shared
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # Mark retrieved in case no follower attached
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _run_distributed(
+        self,
+        key: str,
+        func: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """Elect a leader across workers via Redis, or run locally without it."""
+        if not self.redis_client:
+            self.stats['leader'] += 1
+            return await func(), False
+
+        lease_key = f"{self.LEASE_PREFIX}{key}"
+        result_key = f"{self.RESULT_PREFIX}{key}"
+        token = uuid.uuid4().hex
+        lease_ms = int(self.lease_seconds * 1000)
+
+        while True:
+            try:
+                cached = await self.redis_client.get(result_key)
+                if cached:
+                    self.stats['remote_shared'] += 1
+                    print(f"🔗 Reusing optimization from another worker: {key}")
+                    return json.loads(cached), True
+
+                acquired = await self.redis_client.set(lease_key, token, nx=True, px=lease_ms)
+            except Exception as e:
+                print(f"⚠️  Single-flight lease unavailable, running locally: {str(e)}")
+                self.stats['leader'] += 1
+                return await func(), False
+
+            if acquired:
+                break
+
+            # Another worker holds the lease; wait for its result or for the
+            # lease to expire/be released (then try to take over).
+            await asyncio.sleep(self.poll_seconds)
+
+        self.stats['leader'] += 1
+        heartbeat = asyncio.create_task(self._extend_lease(lease_key, token, lease_ms))
+        try:
+            result = await func()
+            try:
+                await self.redis_client.setex(result_key, self.result_ttl, json.dumps(result, default=str))
+            except Exception as e:
+                print(f"⚠️  Failed to publish single-flight result: {str(e)}")
+            return result, False
+        finally:
+            heartbeat.cancel()
+            try:
+                await self.redis_client.eval(_RELEASE_LEASE_SCRIPT, 1, lease_key, token)
+            except Exception:
+                pass
+
+    async def _extend_lease(self, lease_key: str, token: str, lease_ms: int):
+        """Keep the lease alive while the leader is still working."""
+        while True:
+            await asyncio.sleep(max(self.lease_seconds / 3, 0.1))
+            try:
+                await self.redis_client.eval(_EXTEND_LEASE_SCRIPT, 1, lease_key, token, lease_ms)
+            except Exception:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'backend': 'redis' if self.redis_client else 'memory',
+            'in_flight': len(self._inflight),
+            **self.stats
+        }
+
+
+# Global single-flight instance (lives on the process event loop)
+_single_flight = None
+
+def get_single_flight() -> SingleFlight:
+    """Get the process-wide single-flight coordinator."""
+    global _single_flight
+    if _single_flight is None:
+        cache = get_enhanced_cache()
+        redis_client = cache.cache.redis_client if cache.cache_type == 'redis' else None
+        _single_flight = SingleFlight(
+            redis_client=redis_client,
+            lease_seconds=float(current_app.config.get('SINGLE_FLIGHT_LEASE_SECONDS', 300)),
+            poll_seconds=float(current_app.config.get('SINGLE_FLIGHT_POLL_SECONDS', 0.5)),
+            result_ttl=int(current_app.config.get('SINGLE_FLIGHT_RESULT_TTL', 120))
+        )
+    return _single_flight
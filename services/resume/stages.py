@@ -0,0 +1,117 @@
+"""
+Stage graph executor for the optimization pipeline.
+Declares pipeline steps with their dependencies and runs independent
+steps concurrently, recording per-stage wall time.
+"""
+
+import time
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+# A stage receives the results of the stages it depends on, keyed by name
+StageFunc = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+@dataclass
+class Stage:
+    """A named pipeline step and the stages it waits for."""
+    name: str
+    func: StageFunc
+    depends_on: List[str] = field(default_factory=list)
+
+
+class StageGraph:
+    """
+    Small DAG executor built on asyncio.
+
+    Each stage starts as soon as all of its dependencies have finished, so
+    stages with disjoint inputs overlap. If any stage fails, the remaining
+    stages are cancelled and the error is re-raised.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Stage] = {}
+        self.timings_ms: Dict[str, float] = {}
+
+    def add_stage(
+        self,
+        name: str,
+        func: StageFunc,
+        depends_on: Optional[List[str]] = None
+    ) -> 'StageGraph':
+        """
+        Register a stage.
+
+        Args:
+            name: Unique stage name
+            func: Async callable taking the dependency results dict
+            depends_on: Names of stages that must finish first
+
+        Returns:
+            self, for chaining
+        """
+        if name in self.stages:
+            raise ValueError(f"Duplicate pipeline stage: {name}")
+        self.stages[name] = Stage(name, func, list(depends_on or []))
+        return self
+
+    def _topological_order(self) -> List[str]:
+        """Return stage names in dependency order; raise on unknown deps or cycles."""
+        order: List[str] = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str, path: List[str]):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"Pipeline stage cycle: {' -> '.join(path + [name])}")
+            if name not in self.stages:
+                raise ValueError(f"Unknown pipeline stage dependency: {name}")
+
+            state[name] = 'visiting'
+            for dep in self.stages[name].depends_on:
+                visit(dep, path + [name])
+            state[name] = 'done'
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, [])
+        return order
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Execute all stages.
+
+        Returns:
+            Dict of stage name -> stage result
+        """
+        results: Dict[str, Any] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_stage(stage: Stage):
+            if stage.depends_on:
+                await asyncio.gather(*(tasks[dep] for dep in stage.depends_on))
+
+            start = time.perf_counter()
+            try:
+                result = await stage.func({dep: results[dep] for dep in stage.depends_on})
+            finally:
+                self.timings_ms[stage.name] = round((time.perf_counter() - start) * 1000, 2)
+
+            results[stage.name] = result
+            return result
+
+        for name in self._topological_order():
+            tasks[name] = asyncio.create_task(run_stage(self.stages[name]), name=f"stage:{name}")
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        return results
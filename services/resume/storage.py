@@ -13,6 +13,7 @@ from flask import current_app
 from botocore.exceptions import ClientError, NoCredentialsError
 import re
 from schemas import OptimizedResume
+from utils import run_sync
 
 
 class FileStorageError(Exception):
@@ -401,7 +402,7 @@ def store_resume_files_sync(
 ) -> Dict[str, Optional[str]]:
     """Synchronous wrapper for store_resume_files."""
     storage = ResumeStorageService()
-    return asyncio.run(storage.store_resume_files(
+    return run_sync(storage.store_resume_files(
         docx_bytes, pdf_bytes, user_id, resume_hash, contact_info
     ))
 
@@ -141,13 +141,14 @@ async function submitOptimizationRequest(formData) {
         const response = await fetch('/api/v1/optimizer/optimize', {
             method: 'POST',
             headers: {
-                'X-CSRFToken': window.csrfToken || ''
+                'X-CSRFToken': window.csrfToken || '',
+                'Accept': 'application/json'
             },
             body: formData,
             signal: controller.signal
         });
         
-        clearTimeout(timeoutId);
+        clearTimeout(timeoutId);  // the timeout only covers queuing the job
         
         if (!response.ok) {
             const errorData = await response.json().catch(() => ({ 
@@ -159,26 +160,114 @@ async function submitOptimizationRequest(formData) {
             throw new APIError(apiError.message, response.status, apiError);
         }
         
-        const result = await response.json();
+        const job = await response.json();
         
         // Validate response structure
-        if (!result || typeof result !== 'object') {
+        if (!job || typeof job !== 'object' || !job.status_url) {
             throw new Error('Invalid response format from optimization service');
         }
         
-        return result;
+        // The optimization runs in a background job; follow its real
+        // progress over SSE (or poll when EventSource is unavailable).
+        // Leaving the page while it runs cancels the job.
+        const cancelOnLeave = () => cancelOptimizationJob(job.cancel_url);
+        window.addEventListener('pagehide', cancelOnLeave);
+        try {
+            if (job.events_url && window.EventSource) {
+                return await streamOptimizationJob(job.events_url, job.status_url);
+            }
+            return await pollOptimizationJob(job.status_url);
+        } finally {
+            window.removeEventListener('pagehide', cancelOnLeave);
+        }
         
     } catch (error) {
         clearTimeout(timeoutId);
         
         if (error.name === 'AbortError') {
-            throw new Error('Request timed out after 2 minutes. Please try again with a shorter resume.');
+            throw new Error('Request timed out after 2 minutes. Please try again.');
         }
         
         throw error;
     }
 }
 
+/**
+ * Ask the server to stop a running job (sendBeacon survives page unload;
+ * it cannot set headers, so the CSRF token goes in the body)
+ */
+function cancelOptimizationJob(cancelUrl) {
+    if (!cancelUrl || !navigator.sendBeacon) return;
+    const body = new FormData();
+    body.append('csrf_token', window.csrfToken || '');
+    navigator.sendBeacon(cancelUrl, body);
+}
+
+/**
+ * Follow a queued optimization job over Server-Sent Events, updating the
+ * progress steps as the pipeline reports them
+ */
+function streamOptimizationJob(eventsUrl, statusUrl) {
+    return new Promise((resolve, reject) => {
+        const source = new EventSource(eventsUrl);
+        let receivedEvents = false;
+        
+        source.addEventListener('stage', (e) => {
+            receivedEvents = true;
+            const event = JSON.parse(e.data);
+            (PIPELINE_STAGE_STEPS[event.stage] || []).forEach(step => {
+                updateProgressStep(step, event.progress, event.message);
+            });
+        });
+        
+        source.addEventListener('status', (e) => {
+            receivedEvents = true;
+            const event = JSON.parse(e.data);
+            if (event.status === 'completed') {
+                source.close();
+                resolve({ ...event.result, results_url: event.results_url });
+            } else if (event.status === 'failed' || event.status === 'cancelled') {
+                source.close();
+                reject(new Error(event.error || 'Optimization failed. Please try again.'));
+            }
+        });
+        
+        source.onerror = () => {
+            // EventSource reconnects on its own once streaming; if the
+            // stream never opened, fall back to polling
+            if (!receivedEvents) {
+                source.close();
+                pollOptimizationJob(statusUrl).then(resolve, reject);
+            }
+        };
+    });
+}
+
+/**
+ * Poll a queued optimization job until it completes or fails
+ */
+async function pollOptimizationJob(statusUrl) {
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, 2000));
+        
+        const response = await fetch(statusUrl, {
+            headers: { 'Accept': 'application/json' }
+        });
+        const job = await response.json().catch(() => ({}));
+        
+        if (!response.ok) {
+            const apiError = handleAPIError(response, job);
+            throw new APIError(apiError.message, response.status, apiError);
+        }
+        if (job.status === 'completed') {
+            return { ...job.result, results_url: job.results_url };
+        }
+        if (job.status === 'failed' || job.status === 'cancelled') {
+            throw new Error(job.error || 'Optimization failed. Please try again.');
+        }
+    }
+}
+
 /**
  * Show loading state during API processing
  * Updated to work with dashboard.html elements
@@ -225,12 +314,6 @@ function hideLoadingState() {
     }
     
     if (overlay) overlay.remove();
-    
-    // Clear progress timers
-    if (window.progressTimers) {
-        window.progressTimers.forEach(id => clearTimeout(id));
-        window.progressTimers = [];
-    }
 }
 
 function addEnhancedLoadingOverlay() {
@@ -387,34 +470,18 @@ function showEnhancedProgressIndicator() {
         </div>
     `;
     
-    // Start progress simulation
-    simulateProgressUpdates();
+    // Steps are marked complete by streamOptimizationJob as the server reports them
 }
 
 /**
- * Simulate progress updates based on typical processing times
+ * Progress indicator steps completed by each pipeline stage event
  */
-function simulateProgressUpdates() {
-    const steps = [
-        { step: 1, delay: 2000, progress: 15, text: "Resume parsed successfully" },
-        { step: 2, delay: 8000, progress: 35, text: "Gap analysis complete" },
-        { step: 3, delay: 25000, progress: 70, text: "AI optimization in progress" },
-        { step: 4, delay: 35000, progress: 85, text: "Generating explanations" },
-        { step: 5, delay: 40000, progress: 95, text: "Applying final checks" },
-        { step: 6, delay: 45000, progress: 100, text: "Documents ready" }
-    ];
-    
-    // Clear existing timers
-    if (window.progressTimers) {
-        window.progressTimers.forEach(id => clearTimeout(id));
-    }
-    window.progressTimers = [];
-    
-    steps.forEach(({ step, delay, progress, text }) => {
-        const id = setTimeout(() => updateProgressStep(step, progress, text), delay);
-        window.progressTimers.push(id);
-    });
-}
+const PIPELINE_STAGE_STEPS = {
+    extract: [1],
+    normalize: [2],
+    analyze: [3, 4, 5],
+    persist: [6]
+};
 
 /**
  * Update individual progress step
@@ -588,11 +655,9 @@ function redirectToResults() {
         clearInterval(window.redirectInterval);
     }
     
-    // Generate a simple result ID for URL (timestamp-based)
-    const resultId = Date.now().toString(36);
-    
-    // Redirect to results page
-    window.location.href = '/optimizer/results';
+    // Redirect to the results page of the completed job
+    const results = window.optimizationState.results;
+    window.location.href = (results && results.results_url) || '/api/v1/optimizer/results';
 }
 
 /**
@@ -18,6 +18,11 @@
     let elements = {};
     let statusElement = null;
 
+    const JOB_POLL_INTERVAL_MS = 2000;
+
+    // Cancel URL of the job being followed, so leaving the page stops it
+    let activeJobCancelUrl = null;
+
     // =============================================================================
     // INITIALIZATION
     // =============================================================================
@@ -369,11 +374,11 @@
                 return false;
             }
 
-            // Show loading state but let form submit naturally
+            // Submit in the background and poll the queued job
+            e.preventDefault();
             showSubmissionLoading();
-            
-            // Don't prevent default - let the form submit to the server
             announce('Starting optimization...');
+            submitOptimizationJob(form);
         });
 
         // Handle button click for additional validation
@@ -394,6 +399,148 @@
         }
     }
 
+    async function submitOptimizationJob(form) {
+        try {
+            const response = await fetch(form.action, {
+                method: 'POST',
+                headers: { 'Accept': 'application/json' },
+                body: new FormData(form)
+            });
+            const data = await response.json().catch(() => ({}));
+
+            if (!response.ok || !data.status_url) {
+                throw new Error(data.error || `Request failed (HTTP ${response.status})`);
+            }
+
+            activeJobCancelUrl = data.cancel_url || null;
+            const job = data.events_url && window.EventSource
+                ? await streamOptimizationJob(data.events_url, data.status_url)
+                : await pollOptimizationJob(data.status_url);
+            activeJobCancelUrl = null;
+            updateSubmissionProgress(4, 100, 'Optimization complete');
+            window.location.href = job.results_url;
+        } catch (error) {
+            activeJobCancelUrl = null;
+            console.error('Optimization failed:', error);
+            resetSubmissionState();
+            announce(`Optimization failed: ${error.message}`);
+        }
+    }
+
+    /**
+     * Stop the server-side job when the user leaves mid-optimization.
+     * sendBeacon cannot set headers, so the CSRF token goes in the body.
+     */
+    function cancelActiveJob() {
+        if (!activeJobCancelUrl || !navigator.sendBeacon) return;
+        const body = new FormData();
+        const csrfInput = elements.form && elements.form.querySelector('input[name="csrf_token"]');
+        if (csrfInput) body.append('csrf_token', csrfInput.value);
+        navigator.sendBeacon(activeJobCancelUrl, body);
+        activeJobCancelUrl = null;
+    }
+
+    window.addEventListener('pagehide', cancelActiveJob);
+
+    /**
+     * Follow real pipeline progress over Server-Sent Events.
+     * Falls back to polling if the stream cannot be opened.
+     */
+    function streamOptimizationJob(eventsUrl, statusUrl) {
+        return new Promise((resolve, reject) => {
+            const source = new EventSource(eventsUrl);
+            let receivedEvents = false;
+
+            source.addEventListener('stage', (e) => {
+                receivedEvents = true;
+                const event = JSON.parse(e.data);
+                updateSubmissionProgress(event.step, event.progress, event.message);
+            });
+
+            source.addEventListener('status', (e) => {
+                receivedEvents = true;
+                const event = JSON.parse(e.data);
+                if (event.status === 'running') {
+                    updateSubmissionProgress(1, 10, 'Reading your resume...');
+                } else if (event.status === 'completed') {
+                    source.close();
+                    resolve(event);
+                } else if (event.status === 'failed' || event.status === 'cancelled') {
+                    source.close();
+                    reject(new Error(event.error || `Optimization ${event.status}`));
+                }
+            });
+
+            source.onerror = () => {
+                // EventSource reconnects on its own once it has a stream;
+                // if it never connected, poll instead.
+                if (!receivedEvents) {
+                    source.close();
+                    pollOptimizationJob(statusUrl).then(resolve, reject);
+                }
+            };
+        });
+    }
+
+    async function pollOptimizationJob(statusUrl) {
+        while (true) {
+            await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+
+            const response = await fetch(statusUrl, { headers: { 'Accept': 'application/json' } });
+            const job = await response.json().catch(() => ({}));
+
+            if (!response.ok) {
+                throw new Error(job.error || `Status check failed (HTTP ${response.status})`);
+            }
+            if (job.status === 'completed') {
+                return job;
+            }
+            if (job.status === 'failed' || job.status === 'cancelled') {
+                throw new Error(job.error || `Optimization ${job.status}`);
+            }
+            if (job.status === 'running') {
+                updateSubmissionProgress(2, 40, 'Analyzing and optimizing your resume...');
+            }
+        }
+    }
+
+    function showSubmissionLoading() {
+        showSimpleLoading();
+        if (elements.progressSection) {
+            elements.progressSection.style.display = 'flex';
+        }
+        updateSubmissionProgress(1, 10, 'Queued for optimization...');
+    }
+
+    function updateSubmissionProgress(stepNumber, percent, message) {
+        for (let i = 1; i <= stepNumber; i++) {
+            const step = document.getElementById(`progressStep${i}`);
+            if (step) step.classList.add('active');
+        }
+
+        const bar = document.getElementById('progressBar');
+        const percentage = document.getElementById('progressPercentage');
+        const progressMessage = document.getElementById('progressMessage');
+
+        if (bar) bar.style.width = `${percent}%`;
+        if (percentage) percentage.textContent = `${percent}%`;
+        if (progressMessage) progressMessage.innerHTML = `<span>${message}</span>`;
+    }
+
+    function resetSubmissionState() {
+        state.isSubmitting = false;
+
+        const optimizeBtn = elements.optimizeBtn;
+        const btnContent = optimizeBtn.querySelector('.btn-content');
+        const btnLoader = optimizeBtn.querySelector('.btn-loader');
+
+        optimizeBtn.disabled = false;
+        optimizeBtn.classList.remove('is-loading');
+        if (btnContent) btnContent.style.display = 'flex';
+        if (btnLoader) btnLoader.style.display = 'none';
+        if (elements.progressSection) elements.progressSection.style.display = 'none';
+    }
+
     function showSimpleLoading() {
         state.isSubmitting = true;
         
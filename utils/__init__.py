@@ -1,6 +1,9 @@
-from .prompts import get_normalization_prompt,get_json_prompt,get_optimization_prompt
+from .prompts import get_normalization_prompt,get_section_normalization_prompt,get_json_prompt,get_optimization_prompt
 from .date import format_job_posted_date
 from .json_utils import extract_json_from_response,parse_and_validate_normalized_resume
 from .types import  _to_safe_string,_to_safe_list,_to_safe_dict,_to_safe_float
+from .async_runner import run_sync,get_event_loop_runner
+from .deadline import Deadline,DeadlineExceeded,current_deadline,deadline_scope,with_deadline,stop_before_deadline
 
-__all__ = ["parse_and_validate_normalized_resume","get_normalization_prompt","get_json_prompt","json_utils", "date","get_optimization_prompt","extract_json_from_response"]
\ No newline at end of file
+__all__ = ["parse_and_validate_normalized_resume","get_normalization_prompt","get_section_normalization_prompt","get_json_prompt","json_utils", "date","get_optimization_prompt","extract_json_from_response","run_sync","get_event_loop_runner",
+           "Deadline","DeadlineExceeded","current_deadline","deadline_scope","with_deadline","stop_before_deadline"]
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Persistent event loop for calling async code from synchronous entry points.
+One loop thread per worker process replaces per-call asyncio.run(), so Redis
+connection pools and HTTP keep-alive connections survive between requests.
+"""
+
+import os
+import asyncio
+import threading
+import concurrent.futures
+from typing import Any, Coroutine, Optional
+
+
+class EventLoopRunner:
+    """Runs a single asyncio event loop in a daemon thread of this process."""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running loop, started lazily (and restarted after a fork)."""
+        if self._is_running():
+            return self._loop
+
+        with self._lock:
+            if not self._is_running():
+                self._start()
+        return self._loop
+
+    def _is_running(self) -> bool:
+        return (
+            self._loop is not None
+            and self._pid == os.getpid()
+            and self._thread is not None
+            and self._thread.is_alive()
+        )
+
+    def _start(self) -> None:
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def _run_forever():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        thread = threading.Thread(target=_run_forever, name="async-runner", daemon=True)
+        thread.start()
+        ready.wait()
+
+        self._loop = loop
+        self._thread = thread
+        self._pid = os.getpid()
+
+    def in_loop_thread(self) -> bool:
+        """True when called from the runner's own loop thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the loop without waiting for it.
+
+        The caller's context variables (e.g. the Flask app context) are
+        copied into the task, as with asyncio.run().
+
+        Returns:
+            concurrent.futures.Future for the coroutine result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the loop and block until it finishes.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Optional seconds to wait before cancelling it
+
+        Returns:
+            The coroutine result
+
+        Raises:
+            RuntimeError: If called from the loop thread (would deadlock)
+            TimeoutError: If the coroutine did not finish within timeout
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("run_sync() called from the event loop thread; await the coroutine instead")
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Coroutine did not finish within {timeout}s")
+
+
+# Global runner instance (one loop per worker process)
+_runner = EventLoopRunner()
+
+def get_event_loop_runner() -> EventLoopRunner:
+    """Get the process-wide event loop runner."""
+    return _runner
+
+
+def run_sync(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the persistent loop from synchronous code."""
+    return _runner.run(coro, timeout)
@@ -0,0 +1,155 @@
+"""
+Request deadlines for the optimization pipeline.
+A Deadline is created once per request/job and made current with a context
+variable, so DocumentProcessor, the providers and JSON repair can all see the
+remaining budget without it being passed through every call. Tasks and
+asyncio.to_thread calls inherit the current deadline.
+"""
+
+import time
+import asyncio
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Awaitable, Iterator, Optional
+
+from tenacity.stop import stop_base
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request runs out of its time budget."""
+
+
+class Deadline:
+    """A fixed point in (monotonic) time by which a request must finish."""
+
+    def __init__(self, seconds: float):
+        self.budget = float(seconds)
+        self.expires_at = time.monotonic() + self.budget
+
+    def remaining(self) -> float:
+        """Seconds left (negative once expired)."""
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def can_fit(self, seconds: float) -> bool:
+        """True when at least `seconds` of budget are left."""
+        return self.remaining() >= seconds
+
+    def timeout(self, default: Optional[float] = None) -> float:
+        """Timeout for a single call: the remaining budget, capped at default."""
+        remaining = max(0.0, self.remaining())
+        return min(default, remaining) if default is not None else remaining
+
+    def check(self, stage: str = "request") -> None:
+        """
+        Raise DeadlineExceeded if the budget is spent.
+
+        Args:
+            stage: Name of the stage about to start (for the error message)
+        """
+        if self.expired:
+            raise DeadlineExceeded(
+                f"Deadline of {self.budget:.0f}s exceeded before {stage} "
+                f"({-self.remaining():.1f}s over)"
+            )
+
+    def __repr__(self) -> str:
+        return f"Deadline(budget={self.budget:.1f}s, remaining={self.remaining():.1f}s)"
+
+
+_current_deadline: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar(
+    'current_deadline', default=None
+)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """The deadline of the request being processed, if any."""
+    return _current_deadline.get()
+
+
+def set_current_deadline(deadline: Optional[Deadline]) -> contextvars.Token:
+    """Make deadline current; pass the returned token to reset_current_deadline."""
+    return _current_deadline.set(deadline)
+
+
+def reset_current_deadline(token: contextvars.Token) -> None:
+    _current_deadline.reset(token)
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """
+    Make deadline current for the enclosed block.
+
+    Passing None keeps whatever deadline is already current, so callees can
+    accept an optional explicit deadline and fall back to the ambient one.
+    """
+    if deadline is None:
+        yield current_deadline()
+        return
+
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+async def with_deadline(
+    awaitable: Awaitable[Any],
+    stage: str = "request",
+    deadline: Optional[Deadline] = None
+) -> Any:
+    """
+    Await with the remaining budget as timeout.
+
+    Args:
+        awaitable: Coroutine or future to await
+        stage: Name of the work (for the error message)
+        deadline: Deadline to apply (defaults to the current one)
+
+    Returns:
+        The awaitable's result
+
+    Raises:
+        DeadlineExceeded: If the budget is spent before or while awaiting
+    """
+    deadline = deadline or current_deadline()
+    if deadline is None:
+        return await awaitable
+
+    try:
+        deadline.check(stage)
+    except DeadlineExceeded:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise
+
+    try:
+        return await asyncio.wait_for(awaitable, timeout=deadline.timeout())
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(f"Deadline of {deadline.budget:.0f}s exceeded during {stage}")
+
+
+class stop_before_deadline(stop_base):
+    """
+    Tenacity stop condition: give up when the next attempt cannot finish
+    within the current deadline (the upcoming backoff sleep plus
+    min_attempt_seconds for the call itself).
+    """
+
+    def __init__(self, min_attempt_seconds: float = 5.0):
+        self.min_attempt_seconds = min_attempt_seconds
+
+    def __call__(self, retry_state) -> bool:
+        deadline = current_deadline()
+        if deadline is None:
+            return False
+        needed = (retry_state.upcoming_sleep or 0.0) + self.min_attempt_seconds
+        if not deadline.can_fit(needed):
+            print(f"⏱️  Skipping retry: {deadline.remaining():.1f}s left, next attempt needs ~{needed:.1f}s")
+            return True
+        return False
@@ -1,3 +1,3 @@
-from .resume_prompt import get_normalization_prompt,get_json_prompt
-from .optimization_prompt import get_optimization_prompt
-__all__ = ["get_normalization_prompt","get_optimization_prompt","get_json_prompt"]
\ No newline at end of file
+from .resume_prompt import get_normalization_prompt,get_section_normalization_prompt,get_json_prompt,NORMALIZATION_PROMPT_VERSION
+from .optimization_prompt import get_optimization_prompt,OPTIMIZATION_PROMPT_VERSION
+__all__ = ["get_normalization_prompt","get_section_normalization_prompt","get_optimization_prompt","get_json_prompt","NORMALIZATION_PROMPT_VERSION","OPTIMIZATION_PROMPT_VERSION"]
\ No newline at end of file
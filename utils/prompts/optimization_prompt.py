@@ -1,6 +1,10 @@
 import json
 from typing import Dict, Any, Tuple
 from schemas import NormalizedResumeSchema
+
+# Bump when the optimization prompt changes so cached results are not reused
+OPTIMIZATION_PROMPT_VERSION = "v1"
+
 def get_optimization_prompt(
     normalized_resume: Dict[str, Any],
     jd_text: str,
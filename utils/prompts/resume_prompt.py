@@ -1,9 +1,29 @@
 
 from schemas import NormalizedResumeSchema
 import json
-from typing import List,Dict
-def get_normalization_prompt(raw_text: str, file_type: str):
-    import json
+from typing import Any, List, Dict, Optional
+
+# Bump when the normalization prompt (or the rule-based parser feeding it) changes
+# so cached parses are not reused
+NORMALIZATION_PROMPT_VERSION = "v2"
+
+def get_normalization_prompt(raw_text: str, file_type: str, hint: Optional[Dict[str, Any]] = None):
+    """
+    Build the resume normalization prompt.
+
+    Args:
+        raw_text: Extracted resume text
+        file_type: Source file type
+        hint: Draft parse from the rule-based parser; when given, the LLM
+            corrects the draft against a compact field outline instead of
+            parsing from scratch against the full JSON schema
+
+    Returns:
+        Tuple of (system_message, user_message)
+    """
+    if hint is not None:
+        return _get_hinted_normalization_prompt(raw_text, file_type, hint)
+
     # Schema extraction (v2 then v1)
     try:
         schema_obj = NormalizedResumeSchema.model_json_schema()  # Pydantic v2
@@ -40,6 +60,114 @@ def get_normalization_prompt(raw_text: str, file_type: str):
     return system_message, user_message
 
 
+def _get_hinted_normalization_prompt(raw_text: str, file_type: str, hint: Dict[str, Any]):
+    """Normalization prompt that asks the LLM to correct and complete a draft parse."""
+    outline = _schema_outline(NormalizedResumeSchema.model_json_schema())
+    draft = {key: value for key, value in hint.items() if key not in ("parsed_date", "source_format")}
+
+    system_message = (
+        "You are an expert resume parser. A rule-based parser produced DRAFT_JSON from the resume; "
+        "it may be incomplete or wrong. Output MUST be a single valid JSON object following FIELD_OUTLINE. "
+        "No prose/markdown/comments.\n\n"
+        "Rules:\n"
+        "- Fix mistakes in the draft and add anything it missed, using only RAW_RESUME_TEXT.\n"
+        "- Dates: use 'YYYY', 'YYYY-MM', or 'MM/YYYY'; use 'Present' for ongoing roles; if unclear, use null.\n"
+        "- Reverse-chronological work_experience.\n"
+        "- Deduplicate skills; keep canonical casing (Node.js, AWS).\n"
+        "- If data is missing, emit null or []; never invent.\n"
+        "- One JSON object only."
+    )
+
+    user_message = (
+        f"FIELD_OUTLINE:\n{json.dumps(outline, separators=(',', ':'))}\n\n"
+        f"DRAFT_JSON:\n{json.dumps(_prune_empty(draft), separators=(',', ':'))}\n\n"
+        f"SOURCE_FILE_TYPE:\n{file_type}\n\n"
+        "RAW_RESUME_TEXT (verbatim):\n<<<RESUME_START>>>\n"
+        f"{raw_text}\n"
+        "<<<RESUME_END>>>\n\n"
+        "Task: Return the corrected, complete resume JSON."
+    )
+    return system_message, user_message
+
+
+def get_section_normalization_prompt(
+    section_text: str,
+    section_schema: Dict[str, Any],
+    file_type: str,
+    draft: Optional[Dict[str, Any]] = None
+):
+    """
+    Build the prompt normalizing one part of a long resume.
+
+    Args:
+        section_text: The part's sections of the raw resume text
+        section_schema: JSON schema of the fields this part fills
+        file_type: Source file type
+        draft: The rule-based parser's draft of these fields, if any
+
+    Returns:
+        Tuple of (system_message, user_message)
+    """
+    system_message = (
+        "You are an expert resume parser. You receive ONE PART of a resume. Output MUST be a single "
+        "valid JSON object that conforms to the provided JSON Schema, filled only from this part. "
+        "No prose/markdown/comments.\n\n"
+        "Rules:\n"
+        "- Extract all available info in this part.\n"
+        "- Dates: use 'YYYY', 'YYYY-MM', or 'MM/YYYY'; use 'Present' for ongoing roles; if unclear, use null.\n"
+        "- Keep list items in reverse-chronological order.\n"
+        "- Deduplicate skills; keep canonical casing (Node.js, AWS).\n"
+        "- If data is missing, emit null or [] per schema; never invent.\n"
+        "- One JSON object only."
+    )
+
+    draft_block = ""
+    if draft:
+        draft_block = (
+            "DRAFT_JSON (rule-based, may be incomplete or wrong):\n"
+            f"{json.dumps(_prune_empty(draft), separators=(',', ':'))}\n\n"
+        )
+
+    user_message = (
+        "JSON_SCHEMA:\n<<<SCHEMA_START>>>\n"
+        f"{json.dumps(section_schema, separators=(',', ':'))}\n"
+        "<<<SCHEMA_END>>>\n\n"
+        f"{draft_block}"
+        f"SOURCE_FILE_TYPE:\n{file_type}\n\n"
+        "RESUME_PART (verbatim):\n<<<RESUME_START>>>\n"
+        f"{section_text}\n"
+        "<<<RESUME_END>>>\n\n"
+        "Task: Parse this part into a JSON object that VALIDATES against JSON_SCHEMA."
+    )
+    return system_message, user_message
+
+
+def _schema_outline(schema: Dict[str, Any], node: Optional[Dict[str, Any]] = None) -> Any:
+    """Field names and types of a JSON schema, without descriptions ({"name": "str", "items": [{...}]})."""
+    node = schema if node is None else node
+    if "$ref" in node:
+        return _schema_outline(schema, schema["$defs"][node["$ref"].split("/")[-1]])
+    if "anyOf" in node:
+        options = [option for option in node["anyOf"] if option.get("type") != "null"]
+        return _schema_outline(schema, options[0]) if options else "null"
+    if node.get("type") == "object" and "properties" in node:
+        return {name: _schema_outline(schema, prop) for name, prop in node["properties"].items()}
+    if node.get("type") == "array":
+        return [_schema_outline(schema, node.get("items", {}))]
+    if node.get("type") == "object":
+        return "object"
+    return {"string": "str", "integer": "int", "number": "float", "boolean": "bool"}.get(node.get("type"), "any")
+
+
+def _prune_empty(value: Any) -> Any:
+    """Drop None/empty values so the draft costs as few tokens as possible."""
+    if isinstance(value, dict):
+        pruned = {key: _prune_empty(item) for key, item in value.items()}
+        return {key: item for key, item in pruned.items() if item not in (None, "", [], {})}
+    if isinstance(value, list):
+        return [item for item in (_prune_empty(item) for item in value) if item not in (None, "", [], {})]
+    return value
+
 
 def get_json_prompt(system_message: str, user_content: str) -> List[Dict[str, str]]:
     """